@@ -1 +1,52 @@
-from .pytris import *
\ No newline at end of file
+"""
+A little terminal tetris game.\\
+The package's names are imported from their submodules on first access, so the engine can be used without loading the terminal frontend, pynput or asyncio.
+"""
+import importlib
+
+_EXPORTS = {
+    "pytris": ("Block", "Block_Type", "Board", "DEFAULT_BOARD_HEIGHT", "DEFAULT_BOARD_WIDTH", "Direction", "INITIAL_SPEED", "MAX_BOARD_HEIGHT",
+               "MAX_BOARD_WIDTH", "MAX_SPEED", "MIN_BOARD_DIMENSION", "PIECES", "Piece", "SEED_BITS", "Score",
+               "find_orientation", "get_random_block_type", "validate_board_dimensions", "validate_seed"),
+    "renderer": ("CELL_CHARS", "DiffRenderer", "GHOST_CELL", "TerminalRenderer", "console_clear", "console_overwrite", "format_cells"),
+    "metrics": ("COLLISIONS", "DEFAULT_RATE_WINDOW", "DRIFT", "LINES", "Metrics", "RENDER", "TimerStats"),
+    "scheduler": ("AsyncRenderScheduler", "DEFAULT_MAX_FPS", "RenderScheduler"),
+    "bitboard": ("BitBoard",),
+    "chunked": ("CHUNK_SIZE", "ChunkedBoard", "DEFAULT_VIEWPORT", "MAX_CHUNKED_BOARD_DIMENSION"),
+    "engine": ("Action", "Engine", "TICK_RATE"),
+    "batch": ("BATCH_ACTIONS", "BatchEngine", "CELLS_X", "CELLS_Y", "DOWN", "LEFT", "NOOP", "PIECE_NAMES", "PIECE_WIDTHS", "RIGHT", "ROTATE"),
+    "commands": ("Command", "DEFAULT_LATENCY_CAPACITY", "LatencyTracker", "percentile"),
+    "loop": ("GameLoop", "MAX_CATCH_UP"),
+    "replay": ("ACTION_BITS", "REPLAY_ACTIONS", "REPLAY_FOOTER", "REPLAY_HEADER", "REPLAY_MAGIC", "REPLAY_VERSION", "Replay", "decode_varint",
+               "encode_varint", "state_checksum"),
+    "snapshot": ("ARCHIVE_HEADER", "ARCHIVE_MAGIC", "ARCHIVE_MIN_CAPACITY", "ARCHIVE_VERSION", "MAX_SNAPSHOT_HEIGHT", "MAX_SNAPSHOT_WIDTH",
+                 "SNAPSHOT_PIECES", "SnapshotArchive", "block_array", "block_orientation", "restore_snapshot", "snapshot_dtype",
+                 "snapshot_from_bytes", "take_snapshot"),
+    "movegen": ("Placement", "enumerate_placements"),
+    "features": ("PLACEMENT_FEATURES", "drop_orientations", "evaluate_drops", "place_stacks", "stack_features"),
+    "terminal": ("main",),
+    "RepeatedTimer": ("RepeatedTimer",), # exported by the package before the game loop replaced it
+}
+""" The names exported by the package, by the submodule defining them """
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module("." + module, __name__), name)
+        globals()[name] = value # later lookups do not pass through __getattr__
+        return value
+    try:
+        return importlib.import_module("." + name, __name__) # submodules, e.g. pytris.server
+    except ModuleNotFoundError as error:
+        if error.name != __name__ + "." + name:
+            raise
+    core = importlib.import_module(".pytris", __name__)
+    if not name.startswith("_") and hasattr(core, name):
+        return getattr(core, name) # names the package used to re-export from its core module, e.g. np
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
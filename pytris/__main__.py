@@ -1,2 +1,2 @@
-from pytris.pytris import main
+from pytris.terminal import main
 main()
\ No newline at end of file
@@ -0,0 +1,243 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+import numpy as np
+from .bitboard import BitBoard
+from .engine import Action, Engine
+from .features import evaluate_drops
+from .pytris import Block, Block_Type, Board, Direction
+from .renderer import TerminalRenderer
+from .runner import parse_size
+
+BENCHMARK_SIZES = [(10, 20), (25, 40), (50, 50)]
+""" Default board sizes every benchmark is run on """
+DEFAULT_REPEAT = 5
+""" Default amount of timed runs per benchmark, the fastest one is reported """
+DEFAULT_MIN_TIME = 0.1
+""" Default minimum duration of a timed run in seconds. Fast benchmarks are called repeatedly until it is reached. """
+DEFAULT_THRESHOLD = 0.1
+""" Default relative slowdown beyond which a benchmark is flagged as a regression """
+BASELINE_VERSION = 1
+
+GAME_ACTIONS = (None, Direction.LEFT, Direction.RIGHT, Direction.DOWN, Action.ROTATE)
+""" The actions randomly chosen by simulated games """
+
+class NullStream:
+    """
+    A text stream discarding everything written to it
+    """
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self):
+        pass
+
+def filled_board(width: int, height: int, board_type: type[Board] = Board, seed = 0) -> Board:
+    """
+    Returns a board whose lower half is randomly filled. Column 0 is left empty, so no row is complete.
+    """
+    board = board_type(width, height, seed)
+    array = np.zeros((height, width))
+    array[height // 2:] = np.random.default_rng(seed).integers(0, 2, (height - height // 2, width))
+    array[:, 0] = 0
+    board.array = array
+    return board
+
+def bench_detect_collision(width: int, height: int):
+    block = filled_board(width, height).block
+    return lambda: block.detect_collision(Direction.DOWN)
+
+def bench_move(width: int, height: int):
+    block = filled_board(width, height).block
+    def run():
+        block.move(Direction.LEFT)
+        block.move(Direction.RIGHT)
+    return run
+
+def bench_rotate(width: int, height: int):
+    block = filled_board(width, height).block
+    def run():
+        for _ in range(4):
+            block.rotate()
+    return run
+
+def bench_drop_distance(width: int, height: int):
+    board = filled_board(width, height)
+    block = board.block
+    return lambda: board.drop_distance(block.array, block.pos[0], block.pos[1])
+
+def bench_evaluate_drops(width: int, height: int):
+    board = filled_board(width, height)
+    return lambda: evaluate_drops(board, "T")
+
+def bench_finalize(width: int, height: int):
+    board = filled_board(width, height)
+    array = board.array
+    def run():
+        board.array = array
+        block = Block(Block_Type["T"], board)
+        block.pos = [1, height // 2 - 2]
+        block.finalize()
+    return run
+
+def bench_finish_completed_rows(width: int, height: int):
+    board = filled_board(width, height)
+    array = board.array.copy()
+    array[-4:] = 1
+    def run():
+        board.array = array
+        board.finish_completed_rows(height - 4, height)
+    return run
+
+def bench_render(width: int, height: int):
+    board = filled_board(width, height)
+    board.renderer = TerminalRenderer(NullStream())
+    board.pause_renderer = False
+    return board.render
+
+def simulate_game(width: int, height: int, board_type: type[Board] = Board, seed = 0) -> Engine:
+    """
+    Plays a game with random actions at one row per tick of gravity until gameover
+
+    Returns the engine in the game's final state
+    """
+    rng = random.Random(seed)
+    engine = Engine(width, height, board_type=board_type, gravity=60, seed=seed)
+    while not engine.gameover:
+        engine.step(rng.choice(GAME_ACTIONS))
+    return engine
+
+def bench_game(width: int, height: int):
+    return lambda: simulate_game(width, height)
+
+def bench_game_bitboard(width: int, height: int):
+    return lambda: simulate_game(width, height, BitBoard)
+
+BENCHMARKS = {
+    "detect_collision": bench_detect_collision,
+    "move": bench_move,
+    "rotate": bench_rotate,
+    "drop_distance": bench_drop_distance,
+    "evaluate_drops": bench_evaluate_drops,
+    "finalize": bench_finalize,
+    "finish_completed_rows": bench_finish_completed_rows,
+    "render": bench_render,
+    "game": bench_game,
+    "game_bitboard": bench_game_bitboard,
+}
+"""
+The benchmarks by name. Each is called with a board size and returns the function to be timed.\\
+finalize and finish_completed_rows include restoring the board, a game is played with random actions until gameover.
+"""
+
+def measure(function, repeat = DEFAULT_REPEAT, min_time = DEFAULT_MIN_TIME) -> float:
+    """
+    Returns the fastest time per call of the given function in seconds
+
+    * repeat: The amount of timed runs
+    * min_time: The minimum duration of a timed run in seconds, the amount of calls per run is doubled until it is reached
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number
+
+def run_benchmarks(names: list[str] = None, sizes: list[tuple[int, int]] = BENCHMARK_SIZES, repeat = DEFAULT_REPEAT, min_time = DEFAULT_MIN_TIME, progress = None) -> dict[str, float]:
+    """
+    Runs the given benchmarks on every given board size
+
+    * names: The names of the benchmarks to run, see BENCHMARKS. Default is None, which runs all of them.
+    * progress: If given, called with the key and the result of every finished benchmark. Default is None.
+
+    Returns the seconds per call of every benchmark, keyed by its name and board size, e.g. "move[10x20]"
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise ValueError("Unknown benchmark: {}".format(name))
+        for width, height in sizes:
+            key = "{}[{}x{}]".format(name, width, height)
+            results[key] = measure(BENCHMARKS[name](width, height), repeat, min_time)
+            if progress is not None:
+                progress(key, results[key])
+    return results
+
+def save_baseline(path: str, results: dict[str, float]):
+    """
+    Writes the given benchmark results to a JSON baseline file, along with the versions they were measured with
+    """
+    baseline = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=4)
+
+def load_baseline(path: str) -> dict[str, float]:
+    """
+    Returns the benchmark results of a JSON baseline file
+    """
+    with open(path) as file:
+        baseline = json.load(file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError("Unsupported baseline version: {}".format(baseline.get("version")))
+    return baseline["results"]
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold = DEFAULT_THRESHOLD) -> list[tuple[str, float, float, bool]]:
+    """
+    Compares benchmark results to a baseline. Benchmarks missing in either are skipped.
+
+    * threshold: The relative slowdown beyond which a benchmark is a regression, e.g. 0.1 for 10%
+
+    Returns the key, the baseline and current seconds per call and whether it regressed, for every benchmark
+    """
+    return [(key, baseline[key], results[key], results[key] > baseline[key] * (1 + threshold))
+            for key in results if key in baseline]
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "%.2f %s" % (seconds / scale, unit)
+    return "%.0f ns" % (seconds / 1e-9)
+
+def main(args: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pytris.benchmark", description="Benchmarks the game's hot paths and full simulated games")
+    parser.add_argument("names", nargs="*", metavar="BENCHMARK", help="benchmarks to run, default is all of: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--size", type=parse_size, action="append", dest="sizes", metavar="WIDTHxHEIGHT",
+                        help="board size to benchmark, repeatable, default is " + ", ".join("{}x{}".format(*size) for size in BENCHMARK_SIZES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per benchmark")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="minimum seconds per timed run")
+    parser.add_argument("--save", metavar="PATH", help="save the results as JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results to a JSON baseline, exits with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="relative slowdown flagged as regression")
+    args = parser.parse_args(args)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error("unknown benchmark: {}".format(name))
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    def report(key, seconds):
+        print("{:<36}{:>12}".format(key, format_time(seconds)), flush=True)
+    results = run_benchmarks(args.names, args.sizes or BENCHMARK_SIZES, args.repeat, args.min_time, None if baseline else report)
+    if args.save:
+        save_baseline(args.save, results)
+
+    if baseline is None:
+        return 0
+    regressions = 0
+    for key, before, after, regressed in compare(results, baseline, args.threshold):
+        regressions += regressed
+        print("{:<36}{:>12}{:>12}{:>+9.1f}%{}".format(key, format_time(before), format_time(after), (after / before - 1) * 100,
+                                                     "  REGRESSION" if regressed else ""))
+    print("{} regression(s) beyond {:.0f}%".format(regressions, args.threshold * 100))
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
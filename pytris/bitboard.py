@@ -0,0 +1,111 @@
+import numpy as np
+from .pytris import Board, find_orientation
+
+class BitBoard(Board):
+    """
+    A play board storing each row as an integer bitmask, where bit x is set if column x of the row has been written on.\\
+    Collision, placement and row completion are a handful of bitwise operations on pre-shifted block row masks.
+    The game semantics are identical to the numpy based Board.
+    """
+
+    @property
+    def height(self):
+        return len(self.rows)
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def array(self) -> np.ndarray:
+        """ A read-only numpy array representation of the board, as used by the numpy based Board. Assigning an array replaces the board's contents. """
+        array = np.zeros((self.height, self.width), dtype=np.uint8)
+        for y in range(self.height):
+            row, overlap = self.rows[y], self.overlap[y]
+            for x in range(self.width):
+                array[y][x] = (row >> x & 1) + (overlap >> x & 1)
+        array.flags.writeable = False
+        return array
+
+    @array.setter
+    def array(self, array: np.ndarray):
+        self._width = array.shape[1]
+        self.full_row = (1 << self._width) - 1
+        """ The bitmask of a completed row """
+        self.rows = [0] * array.shape[0]
+        """ The board's rows, top to bottom, as bitmasks of fields written on """
+        self.overlap = [0] * array.shape[0]
+        """ The board's rows, top to bottom, as bitmasks of fields written on more than once. Only occurs on gameover. """
+        self._masks = {}
+        for y in range(array.shape[0]):
+            for x in range(array.shape[1]):
+                if array[y][x] >= 1:
+                    self.rows[y] |= 1 << x
+                if array[y][x] >= 2:
+                    self.overlap[y] |= 1 << x
+        self.heights = [self.column_height(x) for x in range(self._width)]
+        """ The height of every column, see Board.heights """
+
+    def region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        region = np.zeros((height, width), dtype=np.uint8)
+        for i in range(height):
+            row, overlap = self.rows[y + i] >> x, self.overlap[y + i] >> x
+            for j in range(width):
+                region[i][j] = (row >> j & 1) + (overlap >> j & 1)
+        return region
+
+    def block_masks(self, array: np.ndarray) -> list[tuple[int, ...]]:
+        """
+        Returns the row bitmasks of the given block array, pre-shifted to every column the block fits into.\\
+        The masks are shifted once per block form and board, the row masks of block types are taken from the piece catalogue.
+
+        * array: A numpy array representing a block. 0s are empty, 1s filled.
+        """
+        orientation = find_orientation(array)
+        key = orientation or (array.shape, array.tobytes())
+        masks = self._masks.get(key)
+        if masks is None:
+            if orientation is not None:
+                row_masks = orientation[0].row_masks[orientation[1]]
+            else:
+                row_masks = [sum(1 << x for x in range(array.shape[1]) if array[i][x]) for i in range(array.shape[0])]
+            masks = [tuple(mask << x for mask in row_masks) for x in range(self.width - array.shape[1] + 1)]
+            self._masks[key] = masks
+        return masks
+
+    def collides(self, array: np.ndarray, x: int, y: int) -> bool:
+        height, width = array.shape
+        if x < 0 or y < 0 or x + width > self.width or y + height > self.height:
+            return True
+        rows = self.rows
+        for mask in self.block_masks(array)[x]:
+            if rows[y] & mask:
+                return True
+            y += 1
+        return False
+
+    def place(self, array: np.ndarray, x: int, y: int):
+        for row, mask in enumerate(self.block_masks(array)[x], y):
+            self.overlap[row] |= self.rows[row] & mask
+            self.rows[row] |= mask
+        self.raise_heights(array, x, y)
+
+    def is_row_complete(self, idx: int) -> bool:
+        return self.rows[idx] == self.full_row and not self.overlap[idx]
+
+    def bitmasks(self) -> list[int]:
+        return list(self.rows)
+
+    def clear_rows(self, indices: list[int]):
+        rows = range(self.height)
+        cleared = {rows[idx] for idx in indices}
+        self.rows = [0] * len(cleared) + [row for y, row in enumerate(self.rows) if y not in cleared]
+        self.overlap = [0] * len(cleared) + [row for y, row in enumerate(self.overlap) if y not in cleared]
+        self.lower_heights(sorted(cleared))
+
+    def column_height(self, x: int) -> int:
+        bit = 1 << x
+        for y, row in enumerate(self.rows):
+            if row & bit:
+                return self.height - y
+        return 0
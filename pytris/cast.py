@@ -0,0 +1,138 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from .engine import Engine
+from .pytris import Board
+from .renderer import DiffRenderer
+from .replay import Replay
+
+CAST_VERSION = 2
+""" Version of the asciicast format written, see https://docs.asciinema.org/manual/asciicast/v2/ """
+DEFAULT_BUFFER_SIZE = 1 << 16
+""" Default size of the cast file's write buffer in bytes """
+MIN_CAST_COLUMNS = 80
+""" Minimum terminal width of a cast, enough to display the HUD line """
+
+def cast_size(board: Board) -> tuple[int, int]:
+    """
+    Returns the terminal columns and rows needed to display the frames of the given board, see Board.viewport
+    """
+    _, _, width, height = board.viewport_area()
+    # +2 for borders, gameover, score, speed and HUD lines plus the upcoming block's display
+    return max(width + 2, MIN_CAST_COLUMNS), height + 10
+
+class CastRecorder:
+    """
+    A text stream recording everything written to it to an asciicast v2 file, e.g. as the stream of a renderer.\\
+    Every write is stamped with the time and handed to a background thread, which encodes and writes it through a buffered file.
+    The caller never waits for the disk and the session is never held in memory.
+
+    * path: The .cast file to write, replaced if it exists
+    * columns, rows: The terminal size of the recording, see cast_size()
+    * clock: Returns the current time in seconds, e.g. the virtual time of an Engine. Default is None, which uses time.monotonic().
+    * tee: If given, every write is passed on to this stream as well, e.g. sys.stdout during a live game. Default is None.
+    * title: The title stored in the cast's header. Default is None.
+    """
+    def __init__(self, path: str, columns: int, rows: int, clock = None, tee = None, title: str = None, buffer_size = DEFAULT_BUFFER_SIZE):
+        self.path = path
+        self.clock = clock or time.monotonic
+        self.tee = tee
+        self.events = 0
+        """ The amount of output events recorded """
+        self._start = self.clock()
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, "w", encoding="utf-8", buffering=buffer_size)
+        header = {"version": CAST_VERSION, "width": columns, "height": rows, "timestamp": int(time.time())}
+        if title is not None:
+            header["title"] = title
+        self._file.write(json.dumps(header) + "\n")
+        self._thread = threading.Thread(target=self._write, name="CastRecorder", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    def _write(self):
+        """
+        Writes the queued events to the file until the recorder is closed
+        """
+        while True:
+            event = self._queue.get()
+            if event is None:
+                break
+            self._file.write(json.dumps([round(event[0], 6), "o", event[1]]) + "\n")
+        self._file.close()
+
+    def write(self, text: str) -> int:
+        if self._closed:
+            raise ValueError("write to closed cast recorder")
+        if text:
+            self._queue.put((self.clock() - self._start, text))
+            self.events += 1
+        if self.tee is not None:
+            self.tee.write(text)
+        return len(text)
+
+    def flush(self):
+        if self.tee is not None:
+            self.tee.flush()
+
+    def close(self):
+        """
+        Waits for the remaining events to be written and closes the file
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def record_replay(replay: Replay, path: str, board_type: type[Board] = Board, title: str = None) -> Engine:
+    """
+    Replays the game headless and records its frames to a cast file, timed by the replay's virtual clock.\\
+    The conversion runs as fast as the CPU allows, the cast plays back in realtime.
+    Frames are only drawn after actions and after ticks that moved the block, so the cast does not grow with idle ticks.
+
+    Returns the engine in the game's final state
+    """
+    recorder: CastRecorder = None
+    state = None
+
+    def on_update(engine: Engine):
+        nonlocal recorder, state
+        board = engine.board
+        if recorder is None:
+            recorder = CastRecorder(path, *cast_size(board), clock=lambda: engine.time, title=title)
+            board.renderer = DiffRenderer(recorder)
+        current = (board.block, tuple(board.block.pos), board.block.array.shape, board.score.points, board.gameover)
+        if current != state:
+            state = current
+            board.draw()
+
+    try:
+        engine = replay.play(board_type, on_update=on_update)
+        engine.board.renderer.close()
+    finally:
+        if recorder is not None:
+            recorder.close()
+    return engine
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(prog="python -m pytris.cast", description="Converts a pytris replay to an asciicast file")
+    parser.add_argument("replay", help="replay file recorded with pytris --record")
+    parser.add_argument("cast", help="asciicast file to write")
+    parser.add_argument("--title", help="title of the cast")
+    args = parser.parse_args(args)
+    start = time.perf_counter()
+    engine = record_replay(Replay.load(args.replay), args.cast, title=args.title)
+    elapsed = time.perf_counter() - start
+    print("Recorded %.1f s of play in %.2f s (%.0fx realtime)" % (engine.time, elapsed, engine.time / elapsed if elapsed else float("inf")))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import numpy as np
+from .pytris import Board, DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT
+
+CHUNK_SIZE = 64
+""" The amount of columns of a row stored together in a chunk """
+MAX_CHUNKED_BOARD_DIMENSION = (1 << 16) - 1
+""" The maximum amount of columns and rows of a ChunkedBoard, the largest size replays can store """
+DEFAULT_VIEWPORT = (40, 30)
+""" The default amount of columns and rows of a ChunkedBoard displayed around the current block """
+
+def _segments(x: int, width: int):
+    """
+    Yields the chunk column, first and last column (exclusive) of every chunk covered by the given columns
+    """
+    for chunk in range(x // CHUNK_SIZE, (x + width - 1) // CHUNK_SIZE + 1):
+        yield chunk, max(x, chunk * CHUNK_SIZE), min(x + width, (chunk + 1) * CHUNK_SIZE)
+
+class ChunkedBoard(Board):
+    """
+    A play board for very large dimensions, storing every row as chunks of CHUNK_SIZE columns. Only chunks that have been written on are stored, so empty regions take no memory.\\
+    Collision, placement and row completion only touch the chunks under the block, so their cost does not grow with the board.
+    Removed rows are recycled by reordering the rows like the numpy based Board. Only the parts of the board within the viewport are displayed.
+    The game semantics are identical to the numpy based Board.
+    """
+    max_width = MAX_CHUNKED_BOARD_DIMENSION
+    max_height = MAX_CHUNKED_BOARD_DIMENSION
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def array(self) -> np.ndarray:
+        """ A dense, read-only numpy array representation of the board, as used by the numpy based Board. Assigning an array replaces the board's contents. """
+        array = self.region(0, 0, self.width, self.height)
+        array.flags.writeable = False
+        return array
+
+    @array.setter
+    def array(self, array: np.ndarray):
+        array = np.asarray(array)
+        self.empty(array.shape[1], array.shape[0])
+        for y in np.flatnonzero(array.any(axis=1)).tolist():
+            self.place(array[y:y + 1], 0, y)
+
+    def __init__(self, width = DEFAULT_BOARD_WIDTH, height = DEFAULT_BOARD_HEIGHT, seed: int = None):
+        super().__init__(width, height, seed)
+        self.viewport = DEFAULT_VIEWPORT
+
+    @property
+    def chunk_count(self) -> int:
+        """ The amount of chunks currently stored """
+        return sum(len(chunks) for chunks in self.chunks.values())
+
+    def empty(self, width: int, height: int):
+        self._width = width
+        self._height = height
+        self.chunks: dict[int, dict[int, np.ndarray]] = {}
+        """ The chunks of every stored row that has been written on, keyed by the row's storage index and the chunk's column index """
+        self.row_order = list(range(height))
+        """ The storage index of every board row, top to bottom. Cleared rows are recycled by reordering it instead of moving the rows. """
+        self.row_fill: dict[int, int] = {}
+        """ The amount of fields written on of every stored row that has been written on """
+        self.row_overlap: dict[int, int] = {}
+        """ The amount of fields written on more than once of every stored row. Only occurs on gameover. """
+        self.heights = [0] * width
+        """ The height of every column, see Board.heights """
+
+    def region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        region = np.zeros((height, width), dtype=np.uint8)
+        for i, row in enumerate(self.row_order[y:y + height]):
+            chunks = self.chunks.get(row)
+            if chunks is None:
+                continue
+            for chunk, start, stop in _segments(x, width):
+                fields = chunks.get(chunk)
+                if fields is not None:
+                    offset = chunk * CHUNK_SIZE
+                    region[i, start - x:stop - x] = fields[start - offset:stop - offset]
+        return region
+
+    def collides(self, array: np.ndarray, x: int, y: int) -> bool:
+        height, width = array.shape
+        if x < 0 or y < 0 or x + width > self.width or y + height > self.height:
+            return True
+        return bool(np.any(array + self.region(x, y, width, height) > 1))
+
+    def place(self, array: np.ndarray, x: int, y: int):
+        for i, row in enumerate(self.row_order[y:y + array.shape[0]]):
+            chunks = self.chunks.setdefault(row, {})
+            for chunk, start, stop in _segments(x, array.shape[1]):
+                values = array[i, start - x:stop - x]
+                if not values.any():
+                    continue
+                fields = chunks.get(chunk)
+                if fields is None:
+                    fields = chunks[chunk] = np.zeros(CHUNK_SIZE, dtype=np.uint8)
+                offset = chunk * CHUNK_SIZE
+                region = fields[start - offset:stop - offset]
+                placed = region + values
+                self.row_fill[row] = self.row_fill.get(row, 0) + int(np.count_nonzero(placed) - np.count_nonzero(region))
+                self.row_overlap[row] = self.row_overlap.get(row, 0) + int(np.count_nonzero(placed > 1) - np.count_nonzero(region > 1))
+                region[:] = placed
+            if not chunks:
+                del self.chunks[row]
+        self.raise_heights(array, x, y)
+
+    def is_row_complete(self, idx: int) -> bool:
+        row = self.row_order[idx]
+        return self.row_fill.get(row, 0) == self.width and not self.row_overlap.get(row, 0)
+
+    def bitmasks(self) -> list[int]:
+        masks = []
+        for row in self.row_order:
+            mask = 0
+            for chunk, fields in self.chunks.get(row, {}).items():
+                mask |= int.from_bytes(np.packbits(fields != 0, bitorder="little").tobytes(), "little") << chunk * CHUNK_SIZE
+            masks.append(mask)
+        return masks
+
+    def clear_rows(self, indices: list[int]):
+        rows = range(self.height)
+        cleared = sorted({rows[idx] for idx in indices})
+        recycled = [self.row_order[y] for y in cleared]
+        for y in reversed(cleared):
+            del self.row_order[y]
+        self.row_order[0:0] = recycled
+        for row in recycled:
+            self.chunks.pop(row, None)
+            self.row_fill.pop(row, None)
+            self.row_overlap.pop(row, None)
+        self.lower_heights(cleared)
+
+    def column_height(self, x: int) -> int:
+        chunk, offset = divmod(x, CHUNK_SIZE)
+        for y, row in enumerate(self.row_order):
+            fields = self.chunks.get(row, {}).get(chunk)
+            if fields is not None and fields[offset]:
+                return self.height - y
+        return 0
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+from .engine import Action
+from .keyboard import open_keyboard
+from .pytris import Board, Direction
+from .renderer import DiffRenderer, console_clear
+from .replay import REPLAY_ACTIONS
+from .server import DEFAULT_HOST, DEFAULT_PORT, StateUpdate, read_update
+from .terminal import KEY_BINDINGS, QUIT_KEYS, REPEATING_KEYS
+
+class MatchClient:
+    """
+    Connects to a MatchServer and mirrors a match's board from the streamed updates
+    """
+    def __init__(self):
+        self.board: Board = None
+        """ The mirrored board, created with the first update """
+        self.match: int = None
+        """ The id of the connected match """
+        self.tick = 0
+        """ The match's tick of the most recent update """
+        self._reader: asyncio.StreamReader = None
+        self._writer: asyncio.StreamWriter = None
+
+    async def connect(self, host = DEFAULT_HOST, port = DEFAULT_PORT, command = "NEW", match: int = None) -> int:
+        """
+        Connects to the server and joins a match. Raises a ConnectionError if the server refuses.
+
+        * command: "NEW" to start a new match, "PLAY" to play or "WATCH" to spectate an existing one
+        * match: The id of the match to join. Default is None, for "NEW".
+
+        Returns the id of the joined match
+        """
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._writer.write("{} {}\n".format(command, "" if match is None else match).encode("ascii"))
+        response = (await self._reader.readline()).decode("ascii").split()
+        if len(response) != 2 or response[0] != "OK":
+            await self.close()
+            raise ConnectionError("Server refused: {}".format(" ".join(response)))
+        self.match = int(response[1])
+        return self.match
+
+    def send(self, action: Direction | Action):
+        """
+        Sends a player action to the match
+        """
+        self._writer.write(bytes((REPLAY_ACTIONS.index(action),)))
+
+    async def receive(self) -> StateUpdate:
+        """
+        Waits for the next update and applies it to the mirrored board. Raises an IncompleteReadError once the server closed the connection.
+        """
+        update = await read_update(self._reader)
+        if self.board is None:
+            self.board = Board(update.width, update.height)
+        update.apply(self.board)
+        self.tick = update.tick
+        return update
+
+    async def close(self):
+        """
+        Closes the connection
+        """
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(prog="python -m pytris.client", description="Plays or watches a match hosted by a pytris server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--play", type=int, metavar="MATCH", help="play an existing match, default is starting a new one")
+    group.add_argument("--watch", type=int, metavar="MATCH", help="spectate a match")
+    args = parser.parse_args(args)
+
+    async def run():
+        client = MatchClient()
+        command, match = ("WATCH", args.watch) if args.watch is not None else ("PLAY", args.play) if args.play is not None else ("NEW", None)
+        await client.connect(args.host, args.port, command, match)
+        console_clear()
+        renderer = DiffRenderer()
+        keyboard = None
+        if command != "WATCH":
+            task = asyncio.current_task()
+
+            def on_key(key: str, created: float):
+                if key in QUIT_KEYS:
+                    task.cancel()
+                elif key in KEY_BINDINGS:
+                    client.send(KEY_BINDINGS[key])
+            keyboard = open_keyboard(on_key, REPEATING_KEYS)
+            keyboard.start()
+        try:
+            while True:
+                await client.receive()
+                client.board.renderer = renderer
+                client.board.draw()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if keyboard is not None:
+                keyboard.stop()
+            renderer.close()
+            await client.close()
+
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+if __name__ == "__main__":
+    main()
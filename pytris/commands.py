@@ -0,0 +1,82 @@
+import time
+from collections import deque
+from .engine import Action
+from .pytris import Direction
+
+DEFAULT_LATENCY_CAPACITY = 10000
+""" Default amount of most recent latencies kept for percentile calculation """
+
+class Command:
+    """
+    A player action, timestamped when the input was received.\\
+    All timestamps are time.perf_counter() values in seconds.
+    """
+    def __init__(self, action: Direction | Action, created: float = None):
+        self.action = action
+        """ The action to apply, see Engine.apply() """
+        self.created = time.perf_counter() if created is None else created
+        """ When the input was received """
+        self.applied: float = None
+        """ When the action was applied to the game, or None if it has not been applied yet """
+        self.rendered: float = None
+        """ When the first frame including the action was drawn, or None if it has not been drawn yet """
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    Returns the p-th percentile of the given sorted values, using the nearest-rank method
+
+    * values: The values, sorted ascending. Must not be empty.
+    * p: The percentile, between 0 and 100
+    """
+    rank = max(1, -(-len(values) * p // 100))   # ceil without float rounding
+    return values[int(rank) - 1]
+
+class LatencyTracker:
+    """
+    Measures input-to-applied and input-to-rendered latencies of Commands
+
+    * capacity: The amount of most recent latencies kept. Default is DEFAULT_LATENCY_CAPACITY.
+    """
+    def __init__(self, capacity: int = DEFAULT_LATENCY_CAPACITY):
+        self.applied_latencies = deque(maxlen=capacity)
+        """ The most recent input-to-applied latencies, in seconds """
+        self.rendered_latencies = deque(maxlen=capacity)
+        """ The most recent input-to-rendered latencies, in seconds """
+
+    def applied(self, command: Command):
+        """
+        Records that the given command has just been applied
+        """
+        command.applied = time.perf_counter()
+        self.applied_latencies.append(command.applied - command.created)
+
+    def rendered(self, commands: list[Command]):
+        """
+        Records that a frame including the given commands has just been drawn
+        """
+        now = time.perf_counter()
+        for command in commands:
+            command.rendered = now
+            self.rendered_latencies.append(now - command.created)
+
+    def percentiles(self, percentiles: tuple[float, ...] = (50, 90, 99, 100)) -> dict[str, dict[float, float]]:
+        """
+        Returns the given percentiles of the recorded latencies in milliseconds, keyed by "applied" and "rendered".\\
+        Latencies without any recordings map to an empty dict.
+
+        * percentiles: The percentiles to calculate. Default is (50, 90, 99, 100).
+        """
+        result = {}
+        for name, latencies in (("applied", self.applied_latencies), ("rendered", self.rendered_latencies)):
+            values = sorted(latencies)
+            result[name] = {p: percentile(values, p) * 1000 for p in percentiles} if values else {}
+        return result
+
+    def summary(self) -> str:
+        """
+        Returns a human readable line per latency kind listing its percentiles
+        """
+        lines = []
+        for name, values in self.percentiles().items():
+            lines.append("Input-to-" + name + " latency: " + (", ".join("p%g %.2f ms" % (p, ms) for p, ms in values.items()) or "no samples"))
+        return "\n".join(lines)
@@ -0,0 +1,107 @@
+from enum import Enum
+from .pytris import Board, Direction, DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT
+
+TICK_RATE = 60
+""" Default amount of engine ticks per second of virtual time """
+
+class Action(Enum):
+    """
+    Player actions besides moving the block into a Direction
+    """
+    NOOP = 0
+    ROTATE = 1
+    HARD_DROP = 2
+
+class Engine:
+    """
+    Headless game engine. Advances a Board by explicit ticks and actions on a virtual clock. \\
+    The engine does not use any threads and does not render, so games can be simulated as fast as the CPU allows.
+
+    * board_type: The Board implementation to play on, e.g. BitBoard. Default is the numpy based Board.
+    * gravity: A fixed gravity in rows per second, see Board.fixed_gravity. 20G is 20 * tick_rate. Default is None, which uses the score weighted gravity.
+    * seed: The seed of the board's random generator, see Board.seed. Default is None, which picks a random seed.
+    """
+
+    @property
+    def time(self) -> float:
+        """ The virtual time passed since the game started, in seconds """
+        return self.ticks / self.tick_rate
+
+    @property
+    def gameover(self) -> bool:
+        """ True once the game on the board has ended """
+        return self.board.gameover
+
+    def __init__(self, width = DEFAULT_BOARD_WIDTH, height = DEFAULT_BOARD_HEIGHT, tick_rate = TICK_RATE, board_type: type[Board] = Board, gravity: float = None, seed: int = None):
+        if not tick_rate > 0:
+            raise ValueError("Invalid tick rate: {}".format(tick_rate))
+
+        self.board = board_type(width, height, seed)
+        """ The Board driven by this engine """
+        if gravity is not None:
+            self.board.fixed_gravity = gravity
+            self.board.apply_gravity()
+        self.tick_rate = tick_rate
+        """ The amount of ticks per second of virtual time """
+        self.ticks = 0
+        """ The amount of ticks passed since the game started """
+        self.recorder: 'Replay' = None
+        """ If set, every applied action is recorded by this replay """
+        self._block = self.board.block
+        self._gravity_progress = 0.0
+        self.board.block.unfreeze()
+
+    def apply(self, action: Direction | Action | None):
+        """
+        Applies a player action to the current block without advancing the clock.
+
+        * action: A Direction to move the block into, Action.ROTATE to rotate it, Action.HARD_DROP to drop it or None/Action.NOOP to do nothing
+        """
+        if self.recorder is not None and action is not None and action is not Action.NOOP:
+            self.recorder.on_action(self.ticks, action)
+        match action:
+            case None | Action.NOOP:
+                pass
+            case Action.ROTATE:
+                self.board.block.rotate()
+            case Action.HARD_DROP:
+                self.board.block.hard_drop()
+            case Direction():
+                self.board.block.move(action)
+            case _:
+                raise ValueError("Unexpected action {}".format(action))
+
+    def tick(self):
+        """
+        Advances the virtual clock by one tick and applies the gravity accumulated during it.\\
+        A freshly spawned block starts accumulating gravity from zero, just like a newly started gravity timer would.
+        """
+        self.ticks += 1
+        block = self.board.block
+        if block is not self._block:
+            self._block = block
+            self._gravity_progress = 0.0
+        if self.board.gameover or block.frozen or block.gravity == 0:
+            return
+
+        direction = Direction.DOWN if block.gravity > 0 else Direction.UP
+        # progress is kept in rows * tick_rate, so whole rows are not lost to float rounding
+        self._gravity_progress += abs(block.gravity)
+        while self._gravity_progress >= self.tick_rate and not self.board.gameover:
+            self._gravity_progress -= self.tick_rate
+            block.move(direction)
+            if self.board.block is not block:
+                break # block got finalized, the next one starts with fresh gravity on the next tick
+
+    def step(self, action: Direction | Action | None = None) -> int:
+        """
+        Applies the given action and advances the virtual clock by one tick.
+
+        * action: See apply(). Default is None.
+
+        Returns the amount of points rewarded during this step
+        """
+        points = self.board.score.points
+        self.apply(action)
+        self.tick()
+        return self.board.score.points - points
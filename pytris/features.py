@@ -0,0 +1,104 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .pytris import Block_Type, Board, find_orientation
+
+PLACEMENT_FEATURES = ("aggregate_height", "holes", "bumpiness", "wells", "lines")
+""" The columns of the feature matrices returned by stack_features() and evaluate_drops(), in order """
+
+# the distinct orientations of every block orientation, keyed by piece id and rotation, see drop_orientations()
+_DROP_ORIENTATIONS: dict[tuple[int, int], list[tuple[int, np.ndarray, np.ndarray, np.ndarray]]] = {}
+
+def drop_orientations(array: np.ndarray) -> list[tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Returns every distinct orientation of the given block array reachable by rotating,
+    as the amount of rotations, the rows and columns of its fields and the lowest row of every column.\\
+    The orientations are taken from the piece catalogue and cached per orientation. Raises a ValueError if the array is not an orientation of a block type.
+    """
+    orientation = find_orientation(array)
+    if orientation is None:
+        raise ValueError("Not a block type: {}".format(np.asarray(array).tolist()))
+    piece, start = orientation
+    key = (piece.id, start)
+    result = _DROP_ORIENTATIONS.get(key)
+    if result is None:
+        result = []
+        seen = set()
+        for rotation in range(4):
+            index = (start + rotation) % 4
+            rotated = piece.arrays[index]
+            form = (rotated.shape, rotated.tobytes())
+            if form in seen:
+                continue
+            seen.add(form)
+            rows, columns = np.nonzero(rotated)
+            result.append((rotation, rows, columns, np.array(piece.skirts[index])))
+        _DROP_ORIENTATIONS[key] = result
+    return result
+
+def stack_features(stacks: np.ndarray) -> np.ndarray:
+    """
+    Computes the features of many boards at once, after removing their completed rows
+
+    * stacks: A (n, height, width) numpy array of boards, fields written on are nonzero
+
+    Returns a (n, len(PLACEMENT_FEATURES)) integer matrix:
+    * aggregate_height: The sum of the column heights
+    * holes: The amount of empty fields below the top of their column
+    * bumpiness: The sum of the height differences of neighbouring columns
+    * wells: The sum of the depths of columns lower than both neighbours, the borders count as walls of the board's height
+    * lines: The amount of completed rows
+    """
+    stacks = stacks != 0
+    n, height, width = stacks.shape
+    full = stacks.all(axis=2)
+    kept = stacks & ~full[:, :, None]
+    # the height of every row after the completed rows are removed, i.e. the amount of remaining rows at or below it
+    levels = np.cumsum(~full[:, ::-1], axis=1)[:, ::-1]
+    tops = np.argmax(kept, axis=1)
+    heights = np.where(np.take_along_axis(kept, tops[:, None], axis=1)[:, 0], np.take_along_axis(levels, tops, axis=1), 0)
+    # every remaining field at or below the top of its column is either written on or a hole
+    holes = heights.sum(axis=1) - np.count_nonzero(kept.reshape(n, height * width), axis=1)
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+    walls = np.full((n, 1), height)
+    padded = np.concatenate((walls, heights, walls), axis=1)
+    wells = np.maximum(np.minimum(padded[:, :-2], padded[:, 2:]) - heights, 0).sum(axis=1)
+    return np.stack((heights.sum(axis=1), holes, bumpiness, wells, np.count_nonzero(full, axis=1)), axis=1)
+
+def place_stacks(board: Board, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """
+    Returns a stack of copies of the board, each with the given fields written on
+
+    * rows, columns: (n, fields) numpy arrays of the fields of every candidate placement
+    """
+    stacks = np.repeat((board.array != 0)[None], len(rows), axis=0)
+    stacks[np.arange(len(rows))[:, None], rows, columns] = True
+    return stacks
+
+def evaluate_drops(board: Board, piece) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the features of dropping the given piece in every distinct rotation into every column of the board, as a single batch of array operations.\\
+    The landing row of every candidate is looked up from the board's column heights, so candidates are the placements reachable by rotating and moving above the stack, then dropping.
+    Candidates whose piece does not fit below the top of the board are omitted.
+
+    * piece: A block array or name of Block_Type, e.g. "T"
+
+    Returns a (n, 3) integer matrix of the rotation, column and row of every candidate's top left corner and its (n, len(PLACEMENT_FEATURES)) feature matrix, see stack_features()
+    """
+    array = Block_Type[piece] if isinstance(piece, str) else np.asarray(piece)
+    surface = board.height - np.asarray(board.heights)
+    candidates = []
+    rows = []
+    columns = []
+    for rotation, piece_rows, piece_columns, bottom in drop_orientations(array):
+        if len(bottom) > board.width:
+            continue
+        xs = np.arange(board.width - len(bottom) + 1)
+        ys = (sliding_window_view(surface, len(bottom)) - bottom).min(axis=1) - 1
+        fits = ys >= 0
+        xs, ys = xs[fits], ys[fits]
+        candidates.append(np.stack((np.full(len(xs), rotation), xs, ys), axis=1))
+        rows.append(ys[:, None] + piece_rows)
+        columns.append(xs[:, None] + piece_columns)
+    if not candidates:
+        return np.zeros((0, 3), dtype=int), np.zeros((0, len(PLACEMENT_FEATURES)), dtype=int)
+    return np.concatenate(candidates), stack_features(place_stacks(board, np.concatenate(rows), np.concatenate(columns)))
@@ -0,0 +1,405 @@
+import asyncio
+import codecs
+import os
+import re
+import sys
+import time
+
+DEFAULT_DAS = 0.167
+""" Default delayed auto shift, how long a repeating key is held in seconds before it auto-repeats """
+DEFAULT_ARR = 0.033
+""" Default auto repeat rate, the seconds between the auto-repeats of a held key """
+DEFAULT_RELEASE_TIMEOUT = 0.075
+""" Default seconds without input after which a key is considered released, if the terminal does not report key releases. Longer than a terminal's key repeat interval. """
+MAX_REPEAT_DELAY = 1.0
+""" The longest key repeat delay of a terminal in seconds. A key pressed again within this time may have been held since its previous press. """
+ESCAPE_TIMEOUT = 0.05
+""" Seconds to wait for the rest of an escape sequence split across reads, e.g. over SSH, before a trailing ESC is read as the escape key """
+
+PRESS = 1
+""" Event type of a key being pressed, the event types are those of the kitty keyboard protocol """
+REPEAT = 2
+""" Event type of a held key being repeated by the terminal """
+RELEASE = 3
+""" Event type of a key being released """
+
+ENABLE_KEY_EVENTS = "\x1b[>11u\x1b[?u"
+""" Asks the terminal to report key presses, repeats and releases as escape codes and queries whether it does. Terminals without support ignore it. """
+DISABLE_KEY_EVENTS = "\x1b[<u"
+""" Restores the terminal's previous key reporting """
+
+_SEQUENCE = re.compile(r"\x1b\[([0-9;:?]*)([A-Za-z~])|\x1bO([A-D])|[\s\S]")
+_INCOMPLETE = re.compile(r"\x1b(\[[0-9;:?]*|O)?\Z") # the start of an escape sequence at the end of the input
+_ARROWS = {"A": "up", "B": "down", "C": "right", "D": "left"}
+_NAMES = {"\x1b": "escape", " ": "space", "\r": "enter", "\n": "enter", "\t": "tab", "\x7f": "backspace"}
+
+def _key_name(char: str) -> str:
+    if char in _NAMES:
+        return _NAMES[char]
+    if ord(char) < 32:
+        return "ctrl+" + chr(ord(char) + 96)
+    return char.lower()
+
+def parse_keys(text: str) -> tuple[list[tuple[str, int]], bool]:
+    """
+    Decodes terminal input into key events. Supports plain characters, arrow keys and the kitty keyboard protocol's escape codes.
+
+    Returns a list of the name and event type of every key event, e.g. ("a", PRESS), ("left", RELEASE) or ("ctrl+c", PRESS),
+    and True if the input contains the terminal's confirmation that it reports key releases
+    """
+    events = []
+    releases = False
+    for match in _SEQUENCE.finditer(text):
+        params, final, arrow = match.groups()
+        if arrow is not None:
+            events.append((_ARROWS[arrow], PRESS))
+        elif final is None:
+            events.append((_key_name(match.group()), PRESS))
+        elif params.startswith("?"):
+            releases = releases or final == "u" # reply to the query of ENABLE_KEY_EVENTS
+        elif final == "u" or final in _ARROWS:
+            fields = params.split(";")
+            modifiers, _, event = (fields[1] if len(fields) > 1 else "").partition(":")
+            name = _key_name(chr(int(fields[0].split(":")[0] or 0))) if final == "u" else _ARROWS[final]
+            if (int(modifiers or 1) - 1) & 4 and not name.startswith("ctrl+"):
+                name = "ctrl+" + name
+            events.append((name, int(event or PRESS)))
+    return events, releases
+
+def split_incomplete(text: str) -> tuple[str, str]:
+    """
+    Splits terminal input into the part that can be decoded and a trailing ESC or escape sequence prefix, whose rest may arrive with the next read
+
+    Returns the complete input and the incomplete rest, which is empty if the input ends with a complete key
+    """
+    match = _INCOMPLETE.search(text)
+    if match is None:
+        return text, ""
+    return text[:match.start()], text[match.start():]
+
+class _Hold:
+    """
+    A key currently held down
+    """
+    def __init__(self, start: float, now: float, confirmed: bool):
+        self.start = start
+        """ When the key was pressed, the delayed auto shift is measured from here """
+        self.seen = now
+        """ When input of the key was last received """
+        self.confirmed = confirmed
+        """ If true, the key is known to be held rather than tapped """
+        self.next: float = None
+        """ When the key auto-repeats next, or None if it does not repeat """
+
+class KeyRepeat:
+    """
+    Tracks held keys and times the auto-repeat of the most recently pressed repeating key, independent of where the key events come from.\\
+    All times are time.perf_counter() values in seconds.
+
+    Terminals supporting the kitty keyboard protocol report key releases, then a key is held until it is released.
+    Other terminals only repeat the input of a held key at their own key repeat rate, so a key counts as held while its input keeps repeating,
+    and auto-repeat starts once the terminal repeats the key, at the earliest das after it was pressed.
+
+    * repeating: The names of the keys that auto-repeat while held
+    * das: The delayed auto shift, how long a key is held before it auto-repeats. Default is DEFAULT_DAS.
+    * arr: The auto repeat rate, the time between auto-repeats. Default is DEFAULT_ARR.
+    * release_timeout: How long a key's input pauses before the key counts as released, if releases are not reported. Default is DEFAULT_RELEASE_TIMEOUT.
+    """
+    def __init__(self, repeating = (), das = DEFAULT_DAS, arr = DEFAULT_ARR, release_timeout = DEFAULT_RELEASE_TIMEOUT):
+        if das < 0 or arr <= 0:
+            raise ValueError("Expected das >= 0 and arr > 0, got das {} and arr {}".format(das, arr))
+        self.repeating = set(repeating)
+        self.das = das
+        self.arr = arr
+        self.release_timeout = release_timeout
+        self.releases = False
+        """ If true, key releases are reported and keys are held until released """
+        self.held: dict[str, _Hold] = {}
+        """ The keys currently held, in the order they were pressed """
+        self._pressed: dict[str, float] = {}
+
+    def press(self, key: str, now: float) -> bool:
+        """
+        Records input of a key
+
+        Returns True if it is a new key press, which triggers the key's action, or False if it is the repeated input of a held key
+        """
+        if not self.releases:
+            # terminals only repeat the most recently pressed key, input of a key ends the repetition of all others
+            for other in [other for other in self.held if other != key]:
+                del self.held[other]
+        hold = self.held.get(key)
+        if hold is not None and (self.releases or now - hold.seen <= self.release_timeout):
+            self.repeat(key, now)
+            return False
+        previous = self._pressed.get(key)
+        self._pressed[key] = now
+        if self.releases:
+            hold = _Hold(now, now, True)
+        else:
+            # the first repeat of a held key arrives after the terminal's repeat delay and is indistinguishable from a new press
+            hold = _Hold(previous if previous is not None and now - previous <= MAX_REPEAT_DELAY else now, now, False)
+        self.held.pop(key, None)
+        self.held[key] = hold
+        self._activate(hold, now)
+        return True
+
+    def repeat(self, key: str, now: float):
+        """
+        Records the terminal repeating the input of a held key
+        """
+        hold = self.held.get(key)
+        if hold is None:
+            return
+        hold.seen = now
+        if not hold.confirmed:
+            hold.confirmed = True
+            self._activate(hold, now)
+
+    def release(self, key: str, now: float):
+        """
+        Records the release of a key
+        """
+        self.held.pop(key, None)
+
+    def _activate(self, hold: _Hold, now: float):
+        if hold.confirmed and hold.next is None:
+            hold.next = max(hold.start + self.das, now)
+
+    def _active(self) -> tuple[str, _Hold]:
+        """
+        Returns the most recently pressed held repeating key, if it auto-repeats
+        """
+        for key in reversed(self.held):
+            if key in self.repeating:
+                hold = self.held[key]
+                return (key, hold) if hold.next is not None else (None, None)
+        return None, None
+
+    def poll(self, now: float) -> list[str]:
+        """
+        Releases the keys whose input stopped and returns the keys auto-repeating by now
+        """
+        if not self.releases:
+            for key in [key for key, hold in self.held.items() if now - hold.seen > self.release_timeout]:
+                del self.held[key]
+        key, hold = self._active()
+        if key is None or hold.next > now:
+            return []
+        hold.next += self.arr
+        if hold.next <= now: # fell behind, e.g. after the process was suspended
+            hold.next = now + self.arr
+        return [key]
+
+    def deadline(self) -> float:
+        """
+        Returns when poll() is due next, or None if no key is held
+        """
+        deadlines = []
+        _, hold = self._active()
+        if hold is not None:
+            deadlines.append(hold.next)
+        if not self.releases:
+            deadlines.extend(hold.seen + self.release_timeout for hold in self.held.values())
+        return min(deadlines, default=None)
+
+class Keyboard:
+    """
+    Delivers key presses and auto-repeats of held keys to a callback on the running asyncio event loop.\\
+    Start and stop it with start() and stop(), or use it as a context manager within the event loop.
+
+    * on_key: Called with the name of the key, see parse_keys(), and the time.perf_counter() time the input was received
+    * repeating, das, arr, release_timeout: See KeyRepeat
+    """
+    def __init__(self, on_key, repeating = (), das = DEFAULT_DAS, arr = DEFAULT_ARR, release_timeout = DEFAULT_RELEASE_TIMEOUT):
+        self.on_key = on_key
+        self.repeat = KeyRepeat(repeating, das, arr, release_timeout)
+        """ Tracks the held keys """
+        self._loop: asyncio.AbstractEventLoop = None
+        self._timer: asyncio.TimerHandle = None
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _event(self, key: str, event: int, now: float):
+        """
+        Handles a key event on the event loop
+        """
+        if event == RELEASE:
+            self.repeat.release(key, now)
+        elif event == REPEAT:
+            self.repeat.repeat(key, now)
+        elif self.repeat.press(key, now):
+            self.on_key(key, now)
+
+    def _schedule(self):
+        """
+        Schedules the next auto-repeat or release check
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        deadline = self.repeat.deadline()
+        if deadline is not None and self._loop is not None:
+            self._timer = self._loop.call_later(max(deadline - time.perf_counter(), 0), self._poll)
+
+    def _poll(self):
+        self._timer = None
+        now = time.perf_counter()
+        for key in self.repeat.poll(now):
+            self.on_key(key, now)
+        self._schedule()
+
+class TerminalKeyboard(Keyboard):
+    """
+    Reads keys straight from a terminal, e.g. over SSH, without an input backend or display server.\\
+    The terminal's input is switched to raw mode and read without blocking when the event loop's selector reports it readable, so keys act when pressed.
+    Output processing is left enabled, so the renderer's output is unaffected. POSIX only.
+    An escape sequence split across reads is decoded once its rest arrives, a trailing ESC without a follow-up within ESCAPE_TIMEOUT is the escape key.
+
+    * fd: The terminal's file descriptor. Default is None, which uses stdin.
+    * output: The stream the terminal's control sequences are written to. Default is None, which uses sys.stdout.
+    """
+    def __init__(self, on_key, repeating = (), das = DEFAULT_DAS, arr = DEFAULT_ARR, release_timeout = DEFAULT_RELEASE_TIMEOUT, fd: int = None, output = None):
+        super().__init__(on_key, repeating, das, arr, release_timeout)
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        self.output = output
+        self._attributes: list = None
+        self._blocking: bool = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._pending = ""
+        """ The start of an escape sequence whose rest has not been read yet """
+        self._pending_time: float = None
+        self._escape_timer: asyncio.TimerHandle = None
+
+    def start(self):
+        import termios # imported here, so the module can be imported on any platform
+        super().start()
+        self._attributes = termios.tcgetattr(self.fd)
+        mode = termios.tcgetattr(self.fd)
+        mode[0] &= ~(termios.BRKINT | termios.ICRNL | termios.INPCK | termios.ISTRIP | termios.IXON)
+        mode[3] &= ~(termios.ECHO | termios.ICANON | termios.IEXTEN | termios.ISIG) # ctrl+c is read as a key
+        mode[6][termios.VMIN] = 1
+        mode[6][termios.VTIME] = 0
+        termios.tcsetattr(self.fd, termios.TCSANOW, mode)
+        self._blocking = os.get_blocking(self.fd)
+        os.set_blocking(self.fd, False)
+        self._write(ENABLE_KEY_EVENTS)
+        self._loop.add_reader(self.fd, self._read)
+
+    def stop(self):
+        import termios
+        super().stop()
+        if self._escape_timer is not None:
+            self._escape_timer.cancel()
+            self._escape_timer = None
+        self._pending = ""
+        if self._attributes is None:
+            return
+        self._loop.remove_reader(self.fd)
+        self._write(DISABLE_KEY_EVENTS)
+        os.set_blocking(self.fd, self._blocking)
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self._attributes)
+        self._attributes = None
+
+    def _write(self, text: str):
+        output = sys.stdout if self.output is None else self.output
+        output.write(text)
+        output.flush()
+
+    def _read(self):
+        """
+        Handles the input available on the terminal
+        """
+        try:
+            data = os.read(self.fd, 1024)
+        except BlockingIOError:
+            return
+        now = time.perf_counter()
+        if not data: # the terminal was closed
+            self._loop.remove_reader(self.fd)
+            return
+        if self._escape_timer is not None:
+            self._escape_timer.cancel()
+            self._escape_timer = None
+        if not self._pending:
+            self._pending_time = now
+        text, self._pending = split_incomplete(self._pending + self._decoder.decode(data))
+        if text:
+            self._handle_text(text, now)
+        if self._pending:
+            self._escape_timer = self._loop.call_later(ESCAPE_TIMEOUT, self._flush_pending)
+
+    def _flush_pending(self):
+        """
+        Decodes an escape sequence prefix whose rest did not arrive in time, e.g. a lone ESC
+        """
+        self._escape_timer = None
+        text, self._pending = self._pending, ""
+        self._handle_text(text, self._pending_time)
+
+    def _handle_text(self, text: str, now: float):
+        events, releases = parse_keys(text)
+        if releases:
+            self.repeat.releases = True
+        for key, event in events:
+            self._event(key, event, now)
+        self._schedule()
+
+class PynputKeyboard(Keyboard):
+    """
+    Reads keys through pynput, for platforms without POSIX terminals. pynput reports key releases.
+    """
+    _NAMES = {"esc": "escape", "space": "space", "enter": "enter", "up": "up", "down": "down", "left": "left", "right": "right"}
+
+    def __init__(self, on_key, repeating = (), das = DEFAULT_DAS, arr = DEFAULT_ARR, release_timeout = DEFAULT_RELEASE_TIMEOUT):
+        super().__init__(on_key, repeating, das, arr, release_timeout)
+        self.repeat.releases = True
+        self._listener = None
+
+    def start(self):
+        from pynput.keyboard import KeyCode, Listener # imported here, so the package works on headless machines without an input backend
+        super().start()
+
+        def handler(event: int):
+            def handle(key):
+                name = key.char.lower() if isinstance(key, KeyCode) and key.char else self._NAMES.get(getattr(key, "name", None))
+                if name is not None:
+                    self._loop.call_soon_threadsafe(self._handle, name, event, time.perf_counter())
+            return handle
+        self._listener = Listener(on_press=handler(PRESS), on_release=handler(RELEASE))
+        self._listener.start()
+
+    def stop(self):
+        super().stop()
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def _handle(self, key: str, event: int, now: float):
+        self._event(key, event, now)
+        self._schedule()
+
+def open_keyboard(on_key, repeating = (), das = DEFAULT_DAS, arr = DEFAULT_ARR) -> Keyboard:
+    """
+    Returns a TerminalKeyboard if stdin is a POSIX terminal, else a PynputKeyboard. See Keyboard.
+    """
+    try:
+        import termios
+    except ImportError:
+        termios = None
+    if termios is not None and sys.stdin.isatty():
+        return TerminalKeyboard(on_key, repeating, das, arr)
+    return PynputKeyboard(on_key, repeating, das, arr)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from .commands import Command, LatencyTracker
+from .engine import Action, Engine
+from .metrics import DRIFT
+from .pytris import Direction
+from .scheduler import AsyncRenderScheduler, DEFAULT_MAX_FPS
+
+MAX_CATCH_UP = 1.0
+""" If the clock falls behind by more than this many seconds, e.g. after the process was suspended, it resynchronizes instead of replaying every missed tick """
+
+class GameLoop:
+    """
+    Plays an Engine in real time on a single asyncio event loop.\\
+    Gravity ticks, input and rendering are tasks on the same loop, so the game state is only ever changed from one thread and the amount of threads stays constant however long the game runs.
+
+    * engine: The engine to play
+    * max_fps: The maximum amount of frames drawn per second. Default is DEFAULT_MAX_FPS.
+    """
+    def __init__(self, engine: Engine, max_fps: float = DEFAULT_MAX_FPS):
+        self.engine = engine
+        """ The engine played by this loop """
+        self.render_scheduler = AsyncRenderScheduler(self._draw, max_fps)
+        """ Coalesces the board's render requests into frames """
+        engine.board.render_scheduler = self.render_scheduler
+        self.drift = 0.0
+        """ How late the most recent tick was executed compared to its scheduled time, in seconds """
+        self.max_drift = 0.0
+        """ The largest drift of any tick so far, in seconds """
+        self.latency = LatencyTracker()
+        """ Measures the latencies of the commands sent to this loop """
+        self._unrendered: list[Command] = []
+        self._commands: asyncio.Queue = asyncio.Queue()
+        self._stopped = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop = None
+
+    def send(self, action: Direction | Action, created: float = None):
+        """
+        Queues a player action to be applied on the event loop. May be called from any thread.\\
+        Actions sent before the loop is running are dropped.
+
+        * action: See Engine.apply()
+        * created: The time.perf_counter() time the input was received. Default is None, which uses the current time.
+        """
+        self.call(self._commands.put_nowait, Command(action, created))
+
+    def call(self, function, *args):
+        """
+        Schedules a function call on the event loop, e.g. to redraw the board. May be called from any thread.\\
+        Calls scheduled before the loop is running are dropped.
+        """
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(function, *args)
+
+    def stop(self):
+        """
+        Ends run(). May be called from any thread.
+        """
+        self.call(self._stopped.set)
+
+    async def run(self):
+        """
+        Starts the game and plays it until stop() is called
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stopped.clear()
+        board = self.engine.board
+        board.start()
+        tasks = [
+            asyncio.create_task(self._clock()),
+            asyncio.create_task(self._input()),
+            asyncio.create_task(self.render_scheduler.run())
+        ]
+        try:
+            await self._stopped.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._loop = None
+            board.pause()
+            self.render_scheduler.stop() # draw a pending frame
+
+    async def _clock(self):
+        """
+        Ticks the engine at its tick rate. Every tick is scheduled relative to the start of the clock rather than the previous tick, so sleep inaccuracies do not add up.
+        """
+        interval = 1 / self.engine.tick_rate
+        start = time.monotonic()
+        ticks = 0
+        while True:
+            ticks += 1
+            deadline = start + ticks * interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif -delay > MAX_CATCH_UP:
+                start = time.monotonic() - ticks * interval
+                deadline = start + ticks * interval
+            else:
+                await asyncio.sleep(0) # catching up, but let input and rendering run in between
+            self.drift = time.monotonic() - deadline
+            self.max_drift = max(self.max_drift, self.drift)
+            if self.engine.board.metrics is not None:
+                self.engine.board.metrics.record(DRIFT, self.drift)
+            self.engine.tick()
+
+    async def _input(self):
+        """
+        Applies queued player commands in the order they were received
+        """
+        while True:
+            command = await self._commands.get()
+            self.engine.apply(command.action)
+            self.latency.applied(command)
+            self._unrendered.append(command)
+
+    def _draw(self):
+        """
+        Draws the board and records the commands applied since the previous frame as rendered
+        """
+        self.engine.board.draw()
+        if self._unrendered:
+            self.latency.rendered(self._unrendered)
+            self._unrendered = []
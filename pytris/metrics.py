@@ -0,0 +1,160 @@
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_RATE_WINDOW = 1.0
+""" Default duration in seconds over which rates like renders per second are averaged """
+
+COLLISIONS = "collisions"
+""" Counter of collision checks, see Block.detect_collision() """
+LINES = "lines"
+""" Counter of completed rows cleared from the board """
+RENDER = "render"
+""" Timer of drawn frames, in seconds """
+DRIFT = "drift"
+""" Timer of how late gravity ticks were executed compared to their scheduled time, in seconds """
+
+class TimerStats:
+    """
+    Aggregated samples of a timer
+    """
+    def __init__(self):
+        self.count = 0
+        """ The amount of samples recorded """
+        self.total = 0.0
+        """ The sum of all samples """
+        self.max = 0.0
+        """ The largest sample """
+        self.last = 0.0
+        """ The most recent sample """
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.max:
+            self.max = value
+
+class Metrics:
+    """
+    Counters and timers describing the game's performance. Assign an instance to Board.metrics to instrument a game.\\
+    Every recorded sample is passed to the registered hooks, so metrics can be streamed or logged while the game runs.
+
+    * window: The duration in seconds over which rates are averaged. Default is DEFAULT_RATE_WINDOW.
+    """
+    def __init__(self, window: float = DEFAULT_RATE_WINDOW):
+        self.window = window
+        self.counters: dict[str, int] = {}
+        """ The counters by name, e.g. COLLISIONS """
+        self.timers: dict[str, TimerStats] = {}
+        """ The timers by name, e.g. RENDER """
+        self.hooks = []
+        """ Called with the name and value of every recorded sample. Counters pass the amount added. """
+        self.start = time.perf_counter()
+        """ When the metrics were created, a time.perf_counter() value """
+        self._rates: dict[str, tuple[float, int, float]] = {}
+
+    def add_hook(self, hook):
+        """
+        Registers a function called with the name and value of every recorded sample
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Unregisters a function previously passed to add_hook()
+        """
+        self.hooks.remove(hook)
+
+    def count(self, name: str, amount = 1):
+        """
+        Adds the given amount to a counter
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+        for hook in self.hooks:
+            hook(name, amount)
+
+    def record(self, name: str, value: float):
+        """
+        Adds a sample to a timer
+
+        * value: The sample, in seconds
+        """
+        stats = self.timers.get(name)
+        if stats is None:
+            stats = self.timers[name] = TimerStats()
+        stats.add(value)
+        for hook in self.hooks:
+            hook(name, value)
+
+    @contextmanager
+    def time(self, name: str):
+        """
+        Returns a context manager recording the duration of its block to a timer
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def total(self, name: str) -> int:
+        """
+        Returns the value of a counter, or the amount of samples of a timer
+        """
+        if name in self.timers:
+            return self.timers[name].count
+        return self.counters.get(name, 0)
+
+    def rate(self, name: str) -> float:
+        """
+        Returns the amount of counts or timer samples per second, averaged over the last complete window.\\
+        Before the first window has passed, the average since the metrics were created is returned.
+        """
+        now = time.perf_counter()
+        total = self.total(name)
+        since, base, rate = self._rates.get(name, (self.start, 0, None))
+        elapsed = now - since
+        if elapsed >= self.window:
+            rate = (total - base) / elapsed
+            self._rates[name] = (now, total, rate)
+        elif rate is None:
+            rate = total / elapsed if elapsed > 0 else 0.0
+        return rate
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current counters, timers and the amount of active threads as a dict
+        """
+        return {
+            "uptime": time.perf_counter() - self.start,
+            "threads": threading.active_count(),
+            "counters": dict(self.counters),
+            "timers": {name: {"count": stats.count, "mean": stats.mean, "max": stats.max, "last": stats.last} for name, stats in self.timers.items()},
+        }
+
+    def hud(self) -> str:
+        """
+        Returns a single short line of the most important live metrics, to be displayed next to the score
+        """
+        render = self.timers.get(RENDER) or TimerStats()
+        drift = self.timers.get(DRIFT) or TimerStats()
+        return "FPS %.0f %.1fms | Col/s %.0f | Drift %.1fms | Thr %d | Lines %d" % (
+            self.rate(RENDER), render.last * 1000, self.rate(COLLISIONS), drift.last * 1000, threading.active_count(), self.counters.get(LINES, 0))
+
+    def summary(self) -> str:
+        """
+        Returns a human readable line per counter and timer, e.g. to be printed on exit
+        """
+        elapsed = time.perf_counter() - self.start
+        lines = ["Uptime: %.1f s, %d active threads" % (elapsed, threading.active_count())]
+        for name, value in self.counters.items():
+            lines.append("%s: %d (%.1f/s)" % (name, value, value / elapsed if elapsed > 0 else 0.0))
+        for name, stats in self.timers.items():
+            lines.append("%s: %d samples (%.1f/s), mean %.3f ms, max %.3f ms" % (
+                name, stats.count, stats.count / elapsed if elapsed > 0 else 0.0, stats.mean * 1000, stats.max * 1000))
+        return "\n".join(lines)
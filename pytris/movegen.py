@@ -0,0 +1,143 @@
+from collections import deque
+import numpy as np
+from .engine import Action
+from .pytris import Block, Board, Direction, find_orientation
+
+# every orientation of every block orientation, keyed by piece id, rotation and the board size, see orientations()
+_ORIENTATIONS: dict[tuple, tuple[list[np.ndarray], list[int], list[int], list[int]]] = {}
+
+class Placement:
+    """
+    A legal final position of a block, and the shortest input path moving the block there from its current position.\\
+    Applying the path's actions to the block in order locks it at this position, as the last action moves it down into an obstacle.
+    """
+    def __init__(self, x: int, y: int, rotation: int, array: np.ndarray, cells: int, path: list[Direction | Action]):
+        self.x = x
+        """ The column of the block's top left corner """
+        self.y = y
+        """ The row of the block's top left corner """
+        self.rotation = rotation
+        """ The amount of 90 degree rotations relative to the block's current orientation """
+        self.array = array
+        """ A numpy array representing the block in this placement's orientation """
+        self.cells = cells
+        """ The fields occupied by the placed block as a bitmask of the whole board, bit y * board width + x for row y and column x """
+        self.path = path
+        """ The actions leading to this placement, see Engine.apply() """
+
+    def __repr__(self):
+        return "Placement(x={}, y={}, rotation={}, path={})".format(self.x, self.y, self.rotation, len(self.path))
+
+def enumerate_placements(board: Board, block: Block = None) -> list[Placement]:
+    """
+    Returns every distinct final placement of the block reachable by moving left, right, down and rotating, including placements under overhangs.\\
+    Runs a breadth-first search over (x, y, rotation) states. The whole board and every block orientation are encoded as a single integer bitmask, so each collision test is one bitwise AND.
+    Placements occupying the same fields, e.g. rotations of the O block, are reported once with the shortest path.
+
+    * board: The board to place the block on
+    * block: The block to place from its current position. Default is None, which uses the board's current block.
+    """
+    if block is None:
+        block = board.block
+    board_bits = 0
+    for y, row in enumerate(board.bitmasks()):
+        board_bits |= row << (y * board.width)
+    arrays = orientations(block.array, board.width, board.height)[0]
+    placements, parents, actions = search_placements(board_bits, board.width, board.height, block.array, *block.pos)
+
+    result = []
+    for cells, state in placements.items():
+        result.append(placement_path(state, parents, actions, arrays, cells, board.width, block.pos))
+    return result
+
+def orientations(array: np.ndarray, width: int, height: int) -> tuple[list[np.ndarray], list[int], list[int], list[int]]:
+    """
+    Returns every orientation of the given block array reachable by rotating, as arrays and as whole board bitmasks anchored at x = y = 0,
+    and the maximum column and row of the block's top left corner in every orientation.\\
+    The orientations are taken from the piece catalogue and cached per orientation and board size. Raises a ValueError if the array is not an orientation of a block type.
+    """
+    orientation = find_orientation(array)
+    if orientation is None:
+        raise ValueError("Not a block type: {}".format(np.asarray(array).tolist()))
+    piece, start = orientation
+    key = (piece.id, start, width, height)
+    result = _ORIENTATIONS.get(key)
+    if result is None:
+        rotations = [(start + rotation) % 4 for rotation in range(4)]
+        bits = [sum(mask << (i * width) for i, mask in enumerate(piece.row_masks[r])) for r in rotations]
+        result = _ORIENTATIONS[key] = ([piece.arrays[r] for r in rotations], bits,
+                                       [width - piece.widths[r] for r in rotations], [height - piece.heights[r] for r in rotations])
+    return result
+
+def search_placements(board_bits: int, width: int, height: int, array: np.ndarray, x: int, y: int) -> tuple[dict[int, int], list[int], list]:
+    """
+    Runs the breadth-first search of enumerate_placements() on a board encoded as a single bitmask, bit y * width + x for row y and column x.\\
+    A state (x, y, r) is encoded as ((y * width + x) << 2) | r.
+
+    * array: The block array to place, starting from column x and row y
+
+    Returns the final state of every distinct placement keyed by the fields it occupies as a board bitmask, and the parent state and action of every visited state, for placement_path()
+    """
+    _, bits, max_x, max_y = orientations(array, width, height)
+    start = (y * width + x) << 2
+    if not (0 <= x <= max_x[0] and 0 <= y <= max_y[0]) or board_bits & bits[0] << (start >> 2):
+        return {}, [], []
+
+    # parent state and action of every visited state, indexed by state
+    parents = [-1] * (height * width << 2)
+    actions: list[Direction | Action] = [None] * len(parents)
+    parents[start] = start
+    queue = deque((start,))
+    placements = {}
+    down = width << 2
+    while queue:
+        state = queue.popleft()
+        r = state & 3
+        offset = state >> 2
+        y, x = divmod(offset, width)
+        orientation = bits[r]
+
+        if y < max_y[r] and not board_bits & orientation << (offset + width):
+            if parents[state + down] < 0:
+                parents[state + down] = state
+                actions[state + down] = Direction.DOWN
+                queue.append(state + down)
+        else:
+            cells = orientation << offset
+            if cells not in placements:
+                placements[cells] = state
+
+        if x > 0 and parents[state - 4] < 0 and not board_bits & orientation << (offset - 1):
+            parents[state - 4] = state
+            actions[state - 4] = Direction.LEFT
+            queue.append(state - 4)
+        if x < max_x[r] and parents[state + 4] < 0 and not board_bits & orientation << (offset + 1):
+            parents[state + 4] = state
+            actions[state + 4] = Direction.RIGHT
+            queue.append(state + 4)
+
+        rotated = (r + 1) & 3
+        orientation = bits[rotated]
+        for dx in (0, 1, -1):  # rotate in place, else kick right, else kick left, like Block.rotate()
+            if 0 <= x + dx <= max_x[rotated] and y <= max_y[rotated] and not board_bits & orientation << (offset + dx):
+                successor = ((offset + dx) << 2) | rotated
+                if parents[successor] < 0:
+                    parents[successor] = state
+                    actions[successor] = Action.ROTATE
+                    queue.append(successor)
+                break
+    return placements, parents, actions
+
+def placement_path(state: int, parents: list[int], actions: list, arrays: list[np.ndarray], cells: int, width: int, start: list[int]) -> Placement:
+    """
+    Returns the Placement of a final state found by search_placements(), with the path leading to it from the start position
+    """
+    y, x = divmod(state >> 2, width)
+    r = state & 3
+    origin = (start[1] * width + start[0]) << 2
+    path = [Direction.DOWN]
+    while state != origin:
+        path.append(actions[state])
+        state = parents[state]
+    path.reverse()
+    return Placement(x, y, r, arrays[r], cells, path)
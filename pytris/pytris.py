@@ -2,35 +2,19 @@
 from math import ceil, floor
 import numpy as np
 from enum import Enum
-from pynput.keyboard import Key, KeyCode, Listener
-import os
-from .RepeatedTimer import RepeatedTimer
-from random import choice
+import random
+from .metrics import COLLISIONS, LINES, RENDER
+from .renderer import GHOST_CELL, TerminalRenderer, format_cells
 
 MAX_BOARD_WIDTH = 50
 MAX_BOARD_HEIGHT = 50
-MIN_BOARD_DIMENSION: int # defined dynamically using Block_Type dict values
+MIN_BOARD_DIMENSION: int # defined by the bounding boxes of the piece catalogue
 DEFAULT_BOARD_WIDTH = 10
 DEFAULT_BOARD_HEIGHT = 20
 INITIAL_SPEED = 1
 MAX_SPEED = 3
-
-def console_clear():
-    """
-    Clears the console
-    """
-    if os.name == 'nt': # windows
-        os.system('cls')
-    elif os.name == 'posix': # unix
-        os.system('clear')
-
-def console_overwrite(lines: int):
-    """
-    Shifts the console cursor up the given amount of lines
-
-    * lines: the amount of lines to shift up
-    """
-    print("\x1B[" + str(lines) + "F")
+SEED_BITS = 64
+""" The size of board seeds in bits, as stored by replays and snapshots """
 
 class Direction(Enum):
     """
@@ -51,16 +35,118 @@ Block_Type = {
     "T": np.array([[0, 1, 0], [1, 1, 1]]),
     "Z": np.array([[1, 1, 0], [0, 1, 1]])
 }
-# calculate minimum board dimension by determining the largest block dimension
-MIN_BOARD_DIMENSION = max([max(x.shape[0], x.shape[1]) for x in Block_Type.values()])
+
+class Piece:
+    """
+    The shared data of a block type, computed once for all four orientations and referenced by every Block of the type.\\
+    Orientation r is the block type's array rotated by 90 degrees r times, see np.rot90(). Every table is indexed by the orientation.
+
+    * id: The index of the block type in Block_Type
+    * name: The key of the block type in Block_Type, e.g. "T"
+    * array: The block type's array
+    """
+    def __init__(self, id: int, name: str, array: np.ndarray):
+        self.id = id
+        """ The index of the block type in Block_Type """
+        self.name = name
+        """ The key of the block type in Block_Type """
+        arrays = []
+        for rotation in range(4):
+            rotated = np.rot90(array, rotation).copy()
+            rotated.flags.writeable = False
+            arrays.append(rotated)
+        self.arrays = tuple(arrays)
+        """ The read-only block array of every orientation """
+        self.heights = tuple(rotated.shape[0] for rotated in arrays)
+        """ The bounding box height of every orientation """
+        self.widths = tuple(rotated.shape[1] for rotated in arrays)
+        """ The bounding box width of every orientation """
+        self.row_masks = tuple(tuple(sum(1 << x for x, field in enumerate(row) if field) for row in rotated.tolist()) for rotated in arrays)
+        """ The rows of every orientation, top to bottom, as integer bitmasks where bit x is set if column x is filled """
+        self.skirts = tuple(_column_ends(rotated, bottom=True) for rotated in arrays)
+        """ The lowest filled row of every column of every orientation """
+        self.tops = tuple(_column_ends(rotated, bottom=False) for rotated in arrays)
+        """ The highest filled row of every column of every orientation """
+        self.spawn_offsets = tuple(width // 2 for width in self.widths)
+        """ The columns between every orientation's left edge and the column a block spawns centered on """
+
+def _column_ends(array: np.ndarray, bottom: bool) -> tuple[int, ...]:
+    """
+    Returns the lowest or highest filled row of every column of the given block array, None for empty columns
+    """
+    ends = []
+    for column in zip(*array.tolist()):
+        rows = [i for i, field in enumerate(column) if field]
+        ends.append((rows[-1] if bottom else rows[0]) if rows else None)
+    return tuple(ends)
+
+PIECES = tuple(Piece(id, name, array) for id, (name, array) in enumerate(Block_Type.items()))
+""" The piece catalogue, the Piece of every block type in the order of Block_Type """
+
+# every orientation of every piece, as (piece, rotation) keyed by the id() of the catalogue's arrays, which are never freed,
+# and by the orientation's shape and contents for any other array
+_ORIENTATION_IDS: dict[int, tuple[Piece, int]] = {}
+_ORIENTATION_FORMS: dict[tuple, tuple[Piece, int]] = {}
+for _piece in PIECES:
+    for _rotation, _array in enumerate(_piece.arrays):
+        _ORIENTATION_IDS[id(_array)] = (_piece, _rotation)
+        _ORIENTATION_FORMS.setdefault((_array.shape, np.ascontiguousarray(_array, dtype=np.uint8).tobytes()), (_piece, _rotation))
+
+def find_orientation(array: np.ndarray) -> tuple[Piece, int]:
+    """
+    Returns the Piece and rotation of the given block array, or None if it is not an orientation of a block type.\\
+    Arrays of the catalogue are found by identity, others by their contents.
+    """
+    orientation = _ORIENTATION_IDS.get(id(array))
+    if orientation is None:
+        orientation = _ORIENTATION_FORMS.get((array.shape, np.ascontiguousarray(array, dtype=np.uint8).tobytes()))
+    return orientation
+
+# the minimum board dimension is the largest bounding box dimension of any block
+MIN_BOARD_DIMENSION = max(max(piece.widths + piece.heights) for piece in PIECES)
 if MIN_BOARD_DIMENSION > MAX_BOARD_WIDTH or MIN_BOARD_DIMENSION > MAX_BOARD_HEIGHT:
     raise ValueError("Failed to determine valid game board sizes. Make sure your terminal can display the estimated minimum character dimensions of {0}x{0}".format(MIN_BOARD_DIMENSION))
 
-def get_random_block_type():
+def get_random_block_type(random_generator: random.Random = None):
     """
-    Returns a randomly chosen numpy array representing the form of a Tetris block
+    Returns the read-only numpy array of a randomly chosen Tetris block type, in its spawn orientation
+
+    * random_generator: The random generator to choose with. Default is None, which uses the global generator of the random module.
     """
-    return choice(list(Block_Type.values()))
+    return (random_generator or random).choice(PIECES).arrays[0]
+
+def validate_board_dimensions(width: int, height: int, max_width = MAX_BOARD_WIDTH, max_height = MAX_BOARD_HEIGHT):
+    """
+    Raises a TypeError or ValueError if the given play board dimensions are not supported
+
+    * width: The amount of columns of the board
+    * height: The amount of rows of the board
+    * max_width, max_height: The maximum dimensions supported by the board implementation. Default is MAX_BOARD_WIDTH and MAX_BOARD_HEIGHT.
+    """
+    if not (type(width) is int and type(height) is int):
+        raise TypeError("Invalid Board dimensions: {} {}".format(width, height))
+    if width < MIN_BOARD_DIMENSION or height < MIN_BOARD_DIMENSION:
+        raise ValueError("Invalid Board dimensions: {0}, {1}\nMinimum values are: {2}, {2}".format(width, height, MIN_BOARD_DIMENSION))
+    if width > max_width or height > max_height:
+        raise ValueError("Invalid Board dimensions: {}, {}\nMaximum values are: {}, {}".format(width, height, max_width, max_height))
+
+def validate_seed(seed: int):
+    """
+    Raises a TypeError or ValueError if the given seed cannot be used as a board seed.\\
+    Seeds are integers from 0 to 2 ** SEED_BITS - 1, so they can be stored in replays and snapshots.
+    """
+    if type(seed) is not int:
+        raise TypeError("Invalid seed: {}".format(seed))
+    if not 0 <= seed < 1 << SEED_BITS:
+        raise ValueError("Invalid seed: {}\nSeeds range from 0 to {}".format(seed, (1 << SEED_BITS) - 1))
+
+def _clip(display: np.ndarray, array: np.ndarray, x: int, y: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the part of the display array covered by the given array at the given location, and the matching part of the given array
+    """
+    top, left = max(y, 0), max(x, 0)
+    bottom, right = max(min(y + array.shape[0], display.shape[0]), top), max(min(x + array.shape[1], display.shape[1]), left)
+    return display[top:bottom, left:right], array[top - y:bottom - y, left - x:right - x]
 
 class Score():
     """
@@ -69,6 +155,8 @@ class Score():
     def __init__(self):
         self.points = 0
         """ The current amount of points scored """
+        self.rows = 0
+        """ The amount of rows completed so far """
         self.scoring = {
             1: 40,
             2: 100,
@@ -85,6 +173,7 @@ class Score():
 
         Returns the amount of points rewarded
         """
+        self.rows += amount
         if amount in self.scoring: # TODO: implement higher amount of rows (currently impossible to occur due to biggest block height being 4)
             self.points += self.scoring[amount]
             return self.scoring[amount]
@@ -94,14 +183,43 @@ class Board():
     """
     Represents the play board. Tracks the game's metadata.
     """
+    max_width = MAX_BOARD_WIDTH
+    """ The maximum amount of columns supported by the board implementation """
+    max_height = MAX_BOARD_HEIGHT
+    """ The maximum amount of rows supported by the board implementation """
 
     @property
     def height(self):
-        return self.array.shape[0]
+        return self.cells.shape[0]
 
     @property
     def width(self):
-        return self.array.shape[1]
+        return self.cells.shape[1]
+
+    @property
+    def array(self) -> np.ndarray:
+        """ A numpy uint8 array representing the play board itself. 0s are empty blocks, 1s are permanent blocks. Any other value is invalid and result in a gameover.\\
+        Reading the board returns a read-only array in display order, which is shared by all reads until the board changes, so writing to it raises a ValueError.
+        To change fields, write to a copy and assign it, or use place(). Assigning an array replaces the board's contents. """
+        if self._array is None:
+            self._array = self.cells[self.row_order]
+            self._array.flags.writeable = False
+        return self._array
+
+    @array.setter
+    def array(self, array: np.ndarray):
+        self.cells = np.array(array, dtype=np.uint8)
+        """ The storage of the board's rows. Row y of the board is stored at cells[row_order[y]]. """
+        self._array: np.ndarray = None # the board in display order, built on the first read after a change
+        self.row_order = np.arange(self.cells.shape[0])
+        """ The index into cells of every board row, top to bottom. Cleared rows are recycled by reordering it instead of moving the rows. """
+        self.row_fill = np.count_nonzero(self.cells, axis=1)
+        """ The amount of fields written on of every row, indexed like cells """
+        self.row_overlap = np.count_nonzero(self.cells > 1, axis=1)
+        """ The amount of fields written on more than once of every row, indexed like cells. Only occurs on gameover. """
+        filled = self.cells != 0
+        self.heights = np.where(filled.any(axis=0), self.height - np.argmax(filled, axis=0), 0).tolist()
+        """ The height of every column, i.e. the distance of its topmost field written on to the bottom of the board, or 0 if the column is empty """
 
     @property
     def block(self):
@@ -120,26 +238,46 @@ class Board():
 
     @gameover.setter
     def gameover(self, gameover: bool):
+        if gameover and not self._gameover and self.telemetry is not None:
+            self.telemetry.on_gameover(self)
         self._gameover = gameover
         self.render() # makes sure the renderer is executed at least one more time when gameover is updated
 
-    def __init__(self, width = DEFAULT_BOARD_WIDTH, height = DEFAULT_BOARD_HEIGHT):
-        if not (type(width) is int and type(height) is int):
-            raise TypeError("Invalid Board dimensions: {} {}".format(width, height))
-        if width < MIN_BOARD_DIMENSION or height < MIN_BOARD_DIMENSION:
-            raise ValueError("Invalid Board dimensions: {0}, {1}\nMinimum values are: {2}, {2}".format(width, height, MIN_BOARD_DIMENSION))
-        if width > MAX_BOARD_WIDTH or height > MAX_BOARD_HEIGHT:
-            raise ValueError("Invalid Board dimensions: {}, {}\nMaximum values are: {}, {}".format(width, height, MAX_BOARD_WIDTH, MAX_BOARD_HEIGHT))
-            
-        self.array = np.zeros((height, width))
-        """ A numpy array representing the play board itself. 0s are empty blocks, 1s are permanent blocks. Any other value is invalid and result in a gameover. """
+    def __init__(self, width = DEFAULT_BOARD_WIDTH, height = DEFAULT_BOARD_HEIGHT, seed: int = None):
+        validate_board_dimensions(width, height, self.max_width, self.max_height)
+        if seed is not None:
+            validate_seed(seed)
+
+        self.empty(width, height)
         self.score = Score()
         """ The current score """
-        self.block = Block(get_random_block_type(), self)
-        self.block_next = Block(get_random_block_type(), self)
+        self.fixed_gravity: float = None
+        """ If set, this gravity is applied to every block instead of the score weighted gravity. May exceed MAX_SPEED. """
+        self.seed = random.getrandbits(SEED_BITS) if seed is None else seed
+        """ The seed of the board's random generator. Boards with the same seed receive the same sequence of blocks. """
+        self.random = random.Random(self.seed)
+        """ The random generator choosing the board's upcoming blocks """
+        self.blocks_drawn = 0
+        """ The amount of block types drawn from the random generator so far. Together with the seed it determines the generator's state. """
+        self.block = self.next_block()
+        self.block_next = self.next_block()
         """ The upcoming and currently inactive block """
         self.pause_renderer = True
         """ If true, the renderer will not execute """
+        self.renderer = TerminalRenderer()
+        """ Draws the frames of the board to the console """
+        self.render_scheduler: 'RenderScheduler' = None
+        """ If set, renders are coalesced by this scheduler instead of being drawn immediately """
+        self.metrics: 'Metrics' = None
+        """ If set, the game's performance is recorded to these metrics """
+        self.telemetry: 'TelemetryLog' = None
+        """ If set, the game's events are appended to this telemetry log, see TelemetryLog.attach() """
+        self.show_hud = False
+        """ If true and metrics are set, a line of live metrics is displayed below the speed """
+        self.show_ghost = False
+        """ If true, the location the current block would land at is displayed """
+        self.viewport: tuple[int, int] = None
+        """ If set, only this many columns and rows of the board are displayed, following the current block. Default is None, which displays the whole board. """
         self.gameover = False
 
     def start(self):
@@ -163,26 +301,194 @@ class Board():
         """
         self.start()
 
+    def next_block(self) -> 'Block':
+        """
+        Returns a new Block on this board, its type drawn from the board's random generator
+        """
+        self.blocks_drawn += 1
+        return Block(get_random_block_type(self.random), self)
+
     def apply_gravity(self) -> float:
         """
-        Applies gravity to the current block. The gravity is weighted by the current score points.
+        Applies gravity to the current block. The gravity is weighted by the current score points, unless a fixed gravity is set.
 
         Returns the applied gravity.
         """
-        g = INITIAL_SPEED + self.score.points * 0.00033
-        if g > MAX_SPEED:
-            g = MAX_SPEED
+        if self.fixed_gravity is not None:
+            g = self.fixed_gravity
+        else:
+            g = INITIAL_SPEED + self.score.points * 0.00033
+            if g > MAX_SPEED:
+                g = MAX_SPEED
         self.block.gravity = g
         return g
 
+    def empty(self, width: int, height: int):
+        """
+        Replaces the board's contents with empty fields of the given size
+        """
+        self.array = np.zeros((height, width), dtype=np.uint8)
+
+    def region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """
+        Returns a copy of the given area of the board, like array[y:y + height, x:x + width] without copying the whole board
+
+        * x, y: The column and row of the area's top left corner
+        * width, height: The size of the area, it must lie within the board
+        """
+        return self.cells[self.row_order[y:y + height], x:x + width]
+
+    def viewport_area(self) -> tuple[int, int, int, int]:
+        """
+        Returns the column, row, width and height of the displayed area of the board.\\
+        The viewport is centered on the current block as far as the board's borders allow.
+        """
+        if self.viewport is None:
+            return 0, 0, self.width, self.height
+        width, height = min(self.viewport[0], self.width), min(self.viewport[1], self.height)
+        x = self.block.pos[0] + self.block.width // 2 - width // 2
+        y = self.block.pos[1] + self.block.height // 2 - height // 2
+        return min(max(x, 0), self.width - width), min(max(y, 0), self.height - height), width, height
+
+    def collides(self, array: np.ndarray, x: int, y: int) -> bool:
+        """
+        Returns True, if the given block array overlaps with an area of the board that may not be written on.\\
+        This includes fields that have already been written on and areas that are out of bounds.
+
+        * array: A numpy array representing a block. 0s are empty, 1s filled.
+        * x: The column of the block's top left corner
+        * y: The row of the block's top left corner
+        """
+        height, width = array.shape
+        if x < 0 or y < 0 or x + width > self.width or y + height > self.height:
+            return True
+        return bool(np.any(array + self.cells[self.row_order[y:y + height], x:x + width] > 1))
+
+    def place(self, array: np.ndarray, x: int, y: int):
+        """
+        Writes the given block array onto the board. Overlapping fields are kept and indicate a gameover cause.
+
+        * array: A numpy array representing a block. 0s are empty, 1s filled.
+        * x: The column of the block's top left corner
+        * y: The row of the block's top left corner
+        """
+        rows = self.row_order[y:y + array.shape[0]]
+        region = self.cells[rows, x:x + array.shape[1]]
+        placed = region + array
+        self.cells[rows, x:x + array.shape[1]] = placed
+        self._array = None
+        self.row_fill[rows] += np.count_nonzero(placed, axis=1) - np.count_nonzero(region, axis=1)
+        self.row_overlap[rows] += np.count_nonzero(placed > 1, axis=1) - np.count_nonzero(region > 1, axis=1)
+        self.raise_heights(array, x, y)
+
+    def is_row_complete(self, idx: int) -> bool:
+        """
+        Returns True, if every field of the given row has been written on exactly once
+
+        * idx: The index of the row, top to bottom
+        """
+        row = self.row_order[idx]
+        return self.row_fill[row] == self.width and not self.row_overlap[row]
+
+    def bitmasks(self) -> list[int]:
+        """
+        Returns the board's rows, top to bottom, as integer bitmasks where bit x is set if column x has been written on
+        """
+        return ((self.cells != 0) @ (1 << np.arange(self.width, dtype=np.int64)))[self.row_order].tolist()
+
     def drop_row(self, idx: int):
         """
         Removes the given row from the board while maintaining the board's dimensions
 
         * idx: The index of the row, top to bottom
         """
-        self.array = np.delete(self.array, idx, 0) # remove row
-        self.array = np.insert(self.array, 0, 0, 0) # add empty row at the top
+        self.clear_rows([idx])
+
+    def clear_rows(self, indices: list[int]):
+        """
+        Removes the given rows from the board in a single pass while maintaining the board's dimensions.\\
+        The rows above the removed ones are "pulled down". The removed rows are emptied and reused as the top rows, so no row is moved or allocated.
+
+        * indices: The indices of the rows, top to bottom
+        """
+        kept = np.ones(self.height, dtype=bool)
+        kept[indices] = False
+        cleared = self.row_order[~kept]
+        self.cells[cleared] = 0
+        self.row_fill[cleared] = 0
+        self.row_overlap[cleared] = 0
+        self.row_order = np.concatenate((cleared, self.row_order[kept]))
+        self._array = None
+        self.lower_heights(np.flatnonzero(~kept).tolist())
+
+    def column_height(self, x: int) -> int:
+        """
+        Returns the height of the given column by scanning it from the top, see heights
+
+        * x: The index of the column
+        """
+        column = self.cells[self.row_order, x]
+        top = int(np.argmax(column != 0))
+        return self.height - top if column[top] else 0
+
+    def raise_heights(self, array: np.ndarray, x: int, y: int):
+        """
+        Updates the column heights after the given block array has been written onto the board
+
+        * array: A numpy array representing a block. 0s are empty, 1s filled.
+        * x: The column of the block's top left corner
+        * y: The row of the block's top left corner
+        """
+        heights = self.heights
+        orientation = find_orientation(array)
+        tops = orientation[0].tops[orientation[1]] if orientation is not None else _column_ends(array, bottom=False)
+        for j, top in enumerate(tops):
+            if top is not None:
+                heights[x + j] = max(heights[x + j], self.height - y - top)
+
+    def lower_heights(self, cleared: list[int]):
+        """
+        Updates the column heights after rows have been removed from the board.\\
+        A column loses one height per removed row below its top. Only columns whose topmost field was removed are scanned again.
+
+        * cleared: The indices the removed rows had before their removal, top to bottom
+        """
+        if not cleared:
+            return
+        heights = self.heights
+        for x, height in enumerate(heights):
+            top = self.height - height
+            if height == 0 or top > cleared[-1]:
+                continue
+            if top in cleared:
+                heights[x] = self.column_height(x)
+            else:
+                heights[x] = height - sum(1 for idx in cleared if idx > top)
+
+    def drop_distance(self, array: np.ndarray, x: int, y: int) -> int:
+        """
+        Returns the amount of rows the given block array can move down from the given position before colliding.\\
+        Uses the column heights, so the distance is found in O(width), unless the block is below the top of a column, e.g. under an overhang.
+
+        * array: A numpy array representing a block. 0s are empty, 1s filled.
+        * x: The column of the block's top left corner
+        * y: The row of the block's top left corner
+        """
+        distance = self.height - y - array.shape[0]
+        orientation = find_orientation(array)
+        skirt = orientation[0].skirts[orientation[1]] if orientation is not None else _column_ends(array, bottom=True)
+        for j, bottom in enumerate(skirt):
+            if bottom is None:
+                continue
+            surface = self.height - self.heights[x + j]
+            if y + bottom >= surface:
+                # below the column's top, fields further down may be free
+                distance = 0
+                while not self.collides(array, x, y + distance + 1):
+                    distance += 1
+                return distance
+            distance = min(distance, surface - y - bottom - 1)
+        return distance
 
     def finish_completed_rows(self, start: int, stop: int) -> int:
         """
@@ -193,90 +499,120 @@ class Board():
 
         Returns the amount of completed rows found
         """
-        rows_completed = 0
-        for i in range(start, stop):
-            if not self.gameover and np.all(self.array[i] == 1):
-                self.drop_row(i)
-                rows_completed += 1
+        if self.gameover:
+            return 0
+        completed = [i for i in range(start, stop) if self.is_row_complete(i)]
+        rows_completed = len(completed)
         if rows_completed > 0:
-            self.score.rows_completed(rows_completed)
+            self.clear_rows(completed)
+            if self.metrics is not None:
+                self.metrics.count(LINES, rows_completed)
+            points = self.score.rows_completed(rows_completed)
+            if self.telemetry is not None:
+                self.telemetry.on_clear(self, rows_completed, points)
             self.apply_gravity()
         return rows_completed
 
-    def render(self):
+    def frame(self) -> list[str]:
         """
-        Prints the current state of the board to the console, including the current play block and its metadata.
+        Returns the lines of text displaying the current state of the board, including the current play block and its metadata.\\
+        If a viewport is set, only the area of the board around the current block is displayed.
         """
-        if self.pause_renderer:
-            return
-
-        def format_array_str(array: np.ndarray) -> str:
-            """
-            Builds and returns a stylized string of a numpy array.
-            """
-            char_replacements = {
-                ".": "",
-                " ": "",
-                "0": " ",
-                "1": "X",
-                "[": "|",
-                "]": "|",
-                "2": "#",
-                "3": "#",
-                "4": "#"
-            }
-            result = str(array)
-            for key in char_replacements:
-                result = result.replace(key, char_replacements[key])
-            return result
-            
         CURRENT_BLOCK_DISPLAY_HEIGHT = 6
-        BOARD_DISPLAY_WIDTH = format_array_str(self.array[0]).__len__()
 
-        result = ""
+        lines = []
 
         # add player's block to displayed board
-        display_array = np.copy(self.array)
-        x0 = self.block.pos[0]
-        y0 = self.block.pos[1]
-        for i in range(self.block.height):
-            for j in range(self.block.width):
-                display_array[y0 + i][x0 + j] += self.block.array[i][j]
+        if self.viewport is None:
+            vx = vy = 0
+            display_array = self.array.astype(np.int8)
+        else:
+            vx, vy, width, height = self.viewport_area()
+            display_array = self.region(vx, vy, width, height).astype(np.int8)
+        BOARD_DISPLAY_WIDTH = display_array.shape[1] + 2    # +2 for borders
+        region, block = _clip(display_array, self.block.array, self.block.pos[0] - vx, self.block.pos[1] - vy)
+        region += block
+        if self.show_ghost and not self.gameover:
+            x0, y0 = self.block.ghost_position()
+            ghost, block = _clip(display_array, self.block.array, x0 - vx, y0 - vy)
+            ghost[(block != 0) & (ghost == 0)] = GHOST_CELL
 
         # render game info
         if self.gameover:
-            result += "### GAME OVER ###\n"
-        result += "Score: " + str(self.score.points) + "\n"
-        result += "Speed: " + "%.2f" % self.block.gravity + " bps\n"
+            lines.append("### GAME OVER ###")
+        lines.append("Score: " + str(self.score.points))
+        lines.append("Speed: " + "%.2f" % self.block.gravity + " bps")
+        if self.show_hud and self.metrics is not None:
+            lines.append(self.metrics.hud())
 
         # render upcoming block
         block_display_vpadding = CURRENT_BLOCK_DISPLAY_HEIGHT - self.block_next.height
         block_display_hpadding = ceil(BOARD_DISPLAY_WIDTH/2) - self.block_next.width
         for i in range( floor(block_display_vpadding/2) ):
-            result += " "*BOARD_DISPLAY_WIDTH + "\n"
-        for i in range(self.block_next.height):
-            result += " "*block_display_hpadding + format_array_str(self.block_next.array[i]) + " "*block_display_hpadding + "\n"
+            lines.append(" "*BOARD_DISPLAY_WIDTH)
+        for row in self.block_next.array.tolist():
+            lines.append(" "*block_display_hpadding + format_cells(row) + " "*block_display_hpadding)
         for i in range( ceil(block_display_vpadding/2) ):
-            result += " "*BOARD_DISPLAY_WIDTH + "\n"
+            lines.append(" "*BOARD_DISPLAY_WIDTH)
 
         # render current board
-        for i in range(display_array.shape[0]):
-            result += format_array_str(display_array[i]) + "\n"
+        for row in display_array.tolist():
+            lines.append(format_cells(row))
+        return lines
+
+    def render(self):
+        """
+        Draws the current state of the board to the console, including the current play block and its metadata.\\
+        If the board has a render scheduler, the frame is only requested and drawn by the scheduler.
+        """
+        if self.pause_renderer:
+            return
+        if self.render_scheduler is not None:
+            self.render_scheduler.request()
+        else:
+            self.draw()
+
+    def draw(self):
+        """
+        Immediately draws the current frame using the board's renderer
+        """
+        if self.metrics is None:
+            self.renderer.draw(self.frame())
+        else:
+            with self.metrics.time(RENDER):
+                self.renderer.draw(self.frame())
 
-        # reposition cursor
-        console_overwrite(result.count('\n') + 2)   # +2 for initial empty line and console input line
-        print(result)
-        
 class Block:
+    """
+    A Tetris block on a board. The block only stores its Piece, orientation and location, everything else is looked up from the piece catalogue.
+
+    * piece: The block's Piece, or a block array of any orientation of a block type
+    * board: The Board the block spawns on
+    * rotation: The orientation of the Piece, see Piece. Default is 0, or the array's orientation.
+    """
+    __slots__ = ("piece", "rotation", "pos", "gravity", "frozen", "_board")
+
+    @property
+    def array(self) -> np.ndarray:
+        """ A read-only numpy array representing the block itself. 0s are empty, 1s filled. Assigning an orientation of a block type turns the block into it. """
+        return self.piece.arrays[self.rotation]
+
+    @array.setter
+    def array(self, array: np.ndarray):
+        orientation = find_orientation(array)
+        if orientation is None:
+            raise ValueError("Not a block type: {}".format(np.asarray(array).tolist()))
+        self.piece, self.rotation = orientation
+
     @property
     def height(self):
         """ The height of the block """
-        return self.array.shape[0]
+        return self.piece.heights[self.rotation]
 
     @property
     def width(self):
         """ The width of the block """
-        return self.array.shape[1]
+        return self.piece.widths[self.rotation]
 
     @property
     def board(self):
@@ -289,38 +625,27 @@ class Block:
 
         # move block to starting position of board
         if self.board is not None:
-            self.pos = [self.board.width//2 - self.width//2, 0]    # x,y
+            self.pos = [self.board.width//2 - self.piece.spawn_offsets[self.rotation], 0]    # x,y
         else:
             self.pos = None
 
-    @property
-    def gravity(self) -> float:
+    def __init__(self, piece: Piece | np.ndarray, board: Board, rotation: int = None):
+        if isinstance(piece, Piece):
+            self.piece = piece
+            """ The block type, shared with every block of the type """
+            self.rotation = 0
+            """ The current orientation of the piece, see Piece """
+        else:
+            self.array = piece
+        if rotation is not None:
+            self.rotation = rotation % 4
+        self.gravity: float = 0
         """
         The amount of gravity applied to the block. \\
         The block will move down (gravity) rows per second. Negative gravity moves the block up.
         """
-        if self._gravity is None or self._gravity.interval <= 0:
-            return 0
-
-        if self._gravity.args[0] is Direction.DOWN:
-            return (1 / self._gravity.interval)
-        elif self._gravity.args[0] is Direction.UP:
-            return (-1 / self._gravity.interval)
-        else:
-            raise ValueError("Unexpected gravity direction {}".format(self._gravity.args[0]))
-
-    @gravity.setter
-    def gravity(self, g: float):
-        if g > 0:
-            self._gravity = RepeatedTimer(1 / g, self.move, Direction.DOWN)
-        elif g < 0:
-            self._gravity = RepeatedTimer(-1 / g, self.move, Direction.UP)
-        else:
-            self._gravity = None
-
-    def __init__(self, array: np.ndarray, board: Board):
-        self.array = array
-        """ A numpy array representing the block itself. 0s are empty, 1s filled. """
+        self.frozen = True
+        """ If true, gravity is not applied to the block """
         self.board = board
         """ A numpy array representing the play board itself. 0s are empty blocks, 1s are permanent blocks. Any other value is invalid and result in a gameover. """
         self.pos: list[int, int]
@@ -328,17 +653,11 @@ class Block:
 
     def freeze(self):
         """ Freezes the block by disabling its gravity """
-        try:
-            self._gravity.pause()
-        except AttributeError:
-            pass # no need to freeze if there is no gravity
+        self.frozen = True
 
     def unfreeze(self):
         """ Unfreezes the block by reenabling its gravity """
-        try:
-            self._gravity.resume()
-        except AttributeError:
-            pass # no need to unfreeze if there is no gravity
+        self.frozen = False
 
     def rotate(self):
         """ 
@@ -350,20 +669,20 @@ class Block:
         if self.board.gameover:
             return
 
+        rotation = (self.rotation + 1) % 4
         # no need to check for collision if there is no board
         if self.board is None:
-            self.array = np.rot90(self.array)
+            self.rotation = rotation
             return
 
         if not self.detect_collision(rotate = True):
-            self.array = np.rot90(self.array)
+            self.rotation = rotation
         else:
             for direction in (Direction.RIGHT, Direction.LEFT):
                 if not self.detect_collision(direction, True):
-                    self.board.pause()  # don't progress the game while the block is rotated at an illegal location
-                    self.array = np.rot90(self.array) # rotate block into illegal location
-                    self.move(direction) # move block into legal location
-                    self.board.resume()
+                    # rotate and shift in one go, so the block never rests at an illegal location
+                    self.rotation = rotation
+                    self.pos[0] += 1 if direction is Direction.RIGHT else -1
                     break
         self.board.render() # immediately display the updated rotation
 
@@ -394,6 +713,25 @@ class Block:
                     self.pos[0] = self.pos[0] - 1
         self.board.render()
 
+    def hard_drop(self):
+        """
+        Moves the block down as far as possible and finalizes it there.\\
+        The distance is looked up from the board's column heights instead of moving the block down row by row.
+
+        This method does not execute after gameover.
+        """
+        if self.board is None or self.board.gameover:
+            return
+        self.pos[1] += self.board.drop_distance(self.array, self.pos[0], self.pos[1])
+        self.finalize()
+        self.board.render()
+
+    def ghost_position(self) -> list[int]:
+        """
+        Returns the location the block would be finalized at by a hard drop, see hard_drop()
+        """
+        return [self.pos[0], self.pos[1] + self.board.drop_distance(self.array, self.pos[0], self.pos[1])]
+
     def finalize(self):
         """
         Writes the Block's data onto the board array at its current location.\\
@@ -409,9 +747,9 @@ class Block:
         x0 = self.pos[0]
         y0 = self.pos[1]
         # write block onto board
-        for i in range(self.height):
-            for j in range(self.width):
-                self.board.array[y0 + i][x0 + j] += self.array[i][j]
+        self.board.place(self.array, x0, y0)
+        if self.board.telemetry is not None and not self.board.gameover: # blocks written to show the gameover cause are not placements
+            self.board.telemetry.on_lock(self.board, self)
 
         # check for completed rows
         self.board.finish_completed_rows(y0, y0 + self.height)
@@ -420,8 +758,10 @@ class Block:
         if not self.board.gameover:
             if not self.board.block_next.detect_collision(None):
                 self.board.block = self.board.block_next
-                self.board.block_next = Block(get_random_block_type(), self.board)
+                self.board.block_next = self.board.next_block()
                 self.board.block.unfreeze()
+                if self.board.telemetry is not None:
+                    self.board.telemetry.on_spawn(self.board, self.board.block)
             else: # next block is stuck already
                 self.board.gameover = True
                 self.board.block_next.finalize()
@@ -436,79 +776,24 @@ class Block:
         """
         if self.board is None:
             raise AttributeError("Cannot detect collision when no board is set.")
+        if self.board.metrics is not None:
+            self.board.metrics.count(COLLISIONS)
 
-        if rotate:
-            block_array = np.rot90(self.array)
-        else:
-            block_array = self.array
+        block_array = self.piece.arrays[(self.rotation + 1) % 4 if rotate else self.rotation]
 
         x0 = self.pos[0]
-        x1 = x0 + block_array.shape[1]
         y0 = self.pos[1]
-        y1 = y0 + block_array.shape[0]
 
         match move_direction:
             case Direction.UP:
                 y0 -= 1
-                y1 -= 1
             case Direction.RIGHT:
                 x0 += 1
-                x1 += 1
             case Direction.DOWN:
                 y0 += 1
-                y1 += 1
             case Direction.LEFT:
                 x0 -= 1
-                x1 -= 1
             case _:
                 pass
 
-        if x0 < 0 or y0 < 0 or x1 > self.board.width or y1 > self.board.height:
-            return True
-
-        try:
-            overlap = block_array + self.board.array[y0:y1, x0:x1]
-            if np.any(overlap[:, :] > 1):
-                return True
-            else:
-                return False
-        except ValueError:
-            return True
-
-def main():
-    #os.system('')      # any call to os.system() is necessary for the renderer to work correctly
-    console_clear()             # includes os.system() call
-
-    board = Board()
-
-    def on_press(key):
-        None
-
-    def on_release(key: Key | KeyCode):
-        if isinstance(key, Key):
-            if key == Key.esc:
-                board.pause()
-                return False
-        if isinstance(key, KeyCode):
-            match key.char:
-                case 'w':
-                    pass
-                case 'a':
-                    board.block.move(Direction.LEFT)
-                case 's':
-                    board.block.move(Direction.DOWN)
-                case 'd':
-                    board.block.move(Direction.RIGHT)
-                case 'r':
-                    board.block.rotate()
-                case 'c':
-                    console_clear()
-                    board.render()
-                case _:
-                    None
-
-    board.start()
-
-    # Collect events until released
-    with Listener( on_press=on_press, on_release=on_release ) as listener:
-        listener.join()
+        return self.board.collides(block_array, x0, y0)
@@ -0,0 +1,127 @@
+import os
+import sys
+
+CELL_CHARS = {
+    0: " ",
+    1: "X",
+    2: "#",
+    3: "#",
+    4: "#",
+    -1: "."
+}
+""" Maps board field values to the characters displaying them. Values above 1 mark the fields causing a gameover, GHOST_CELL marks the ghost piece. """
+GHOST_CELL = -1
+""" The field value displaying the ghost piece, i.e. where the current block would land """
+
+def console_clear():
+    """
+    Clears the console
+    """
+    if os.name == 'nt': # windows
+        os.system('cls')
+    elif os.name == 'posix': # unix
+        os.system('clear')
+
+def console_overwrite(lines: int):
+    """
+    Shifts the console cursor up the given amount of lines
+
+    * lines: the amount of lines to shift up
+    """
+    print("\x1B[" + str(lines) + "F")
+
+def format_cells(row) -> str:
+    """
+    Builds and returns a stylized string of a row of board fields, enclosed in borders.
+
+    * row: An iterable of field values, e.g. a row of a numpy array
+    """
+    return "|" + "".join([CELL_CHARS.get(value, "#") for value in row]) + "|"
+
+class TerminalRenderer:
+    """
+    Draws frames by reprinting every line of the frame over the previous one
+    """
+    def __init__(self, stream = None):
+        self.stream = stream
+        """ The text stream to draw to. Default is None, which draws to sys.stdout. """
+
+    def draw(self, lines: list[str]):
+        """
+        Draws the given frame
+
+        * lines: The lines of text making up the frame
+        """
+        stream = self.stream or sys.stdout
+        # reposition cursor, +2 for initial empty line and console input line
+        stream.write("\x1B[" + str(len(lines) + 2) + "F\n" + "".join(line + "\n" for line in lines) + "\n")
+        stream.flush()
+
+    def invalidate(self):
+        """
+        Forgets any previously drawn content, e.g. after the console has been cleared
+        """
+        pass
+
+    def close(self):
+        """
+        Restores the console after the last frame has been drawn
+        """
+        pass
+
+class DiffRenderer(TerminalRenderer):
+    """
+    Draws frames incrementally. Only the characters that changed since the previous frame are written, using ANSI cursor addressing, in a single buffered write per frame.
+    """
+    MERGE_GAP = 6
+    """ Changed characters separated by at most this many unchanged ones are written as one run, which is cheaper than another cursor escape sequence """
+
+    def __init__(self, stream = None):
+        super().__init__(stream)
+        self.previous: list[str] = None
+        """ The lines of the frame currently on screen, or None if the screen has to be redrawn completely """
+        self.bytes_written = 0
+        """ The amount of characters written by this renderer """
+
+    def draw(self, lines: list[str]):
+        if self.previous is None:
+            # hide cursor, clear screen and draw the complete frame from the top left corner
+            output = "\x1B[?25l\x1B[2J\x1B[H" + "\n".join(lines)
+        else:
+            output = "".join([self._diff_line(row, self.previous[row] if row < len(self.previous) else "", line) for row, line in enumerate(lines)])
+            for row in range(len(lines), len(self.previous)):
+                output += "\x1B[" + str(row + 1) + ";1H\x1B[2K" # erase lines the new frame does not cover anymore
+        self.previous = lines
+        if output:
+            stream = self.stream or sys.stdout
+            stream.write(output)
+            stream.flush()
+            self.bytes_written += len(output)
+
+    def _diff_line(self, row: int, old: str, new: str) -> str:
+        """
+        Returns the escape sequences and characters turning the old line into the new one
+        """
+        if old == new:
+            return ""
+        width = max(len(old), len(new))
+        old = old.ljust(width)
+        new = new.ljust(width)
+        changed = [col for col in range(width) if old[col] != new[col]]
+        output = ""
+        start = end = changed[0]
+        for col in changed[1:]:
+            if col - end > self.MERGE_GAP:
+                output += "\x1B[" + str(row + 1) + ";" + str(start + 1) + "H" + new[start:end + 1]
+                start = col
+            end = col
+        return output + "\x1B[" + str(row + 1) + ";" + str(start + 1) + "H" + new[start:end + 1]
+
+    def invalidate(self):
+        self.previous = None
+
+    def close(self):
+        # move the cursor below the frame and show it again
+        stream = self.stream or sys.stdout
+        stream.write("\x1B[" + str(len(self.previous or []) + 1) + ";1H\x1B[?25h\n")
+        stream.flush()
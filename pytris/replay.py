@@ -0,0 +1,207 @@
+import math
+import struct
+import zlib
+import numpy as np
+from .engine import Action, Engine
+from .pytris import Board, Direction
+
+REPLAY_MAGIC = b"PTRP"
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct("<4sBHHHdQ")
+""" magic, version, board width, board height, tick rate, fixed gravity (NaN if none), seed """
+REPLAY_FOOTER = struct.Struct("<I")
+""" checksum of the final game state """
+
+REPLAY_ACTIONS = (None, Direction.LEFT, Direction.RIGHT, Direction.DOWN, Action.ROTATE, Direction.UP, Action.HARD_DROP)
+""" Maps action codes of the replay format to actions. Code 0 marks the end of the action log. """
+ACTION_BITS = 3
+""" Amount of low bits of an action log entry holding the action code """
+
+def encode_varint(value: int) -> bytes:
+    """
+    Returns the given non-negative integer encoded as LEB128 varint, 7 bits per byte
+    """
+    result = bytearray()
+    while value > 0x7F:
+        result.append(value & 0x7F | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+def decode_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """
+    Decodes a LEB128 varint from the given data
+
+    Returns the decoded integer and the offset of the first byte after it
+    """
+    value = 0
+    shift = 0
+    while True:
+        try:
+            byte = data[offset]
+        except IndexError:
+            raise ValueError("Truncated replay")
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def state_checksum(engine: Engine) -> int:
+    """
+    Returns a CRC32 checksum of the engine's game state: its board, score, tick count, current and upcoming block
+    """
+    board = engine.board
+    checksum = 0
+    for y in range(board.height): # row by row, the same as a checksum of board.array without making a ChunkedBoard dense
+        checksum = zlib.crc32(np.ascontiguousarray(board.region(0, y, board.width, 1), dtype=np.uint8).tobytes(), checksum)
+    checksum = zlib.crc32(np.ascontiguousarray(board.block.array, dtype=np.uint8).tobytes(), checksum)
+    checksum = zlib.crc32(np.ascontiguousarray(board.block_next.array, dtype=np.uint8).tobytes(), checksum)
+    return zlib.crc32(struct.pack("<qqqq?", board.score.points, engine.ticks, board.block.pos[0], board.block.pos[1], board.gameover), checksum)
+
+class Replay:
+    """
+    A recorded game: the board's seed and size plus a log of the actions applied, each with the tick it was applied at.\\
+    Since the random generator is seeded and gravity runs on the engine's virtual clock, replaying the log reproduces the game exactly.
+
+    The binary format is a fixed header (see REPLAY_HEADER), the action log and a footer.
+    Each log entry is a single varint of the ticks passed since the previous entry shifted left by ACTION_BITS, combined with the action's code.
+    The log is terminated by a 0 byte, followed by a varint of the final tick count and the checksum of the final game state.
+    """
+    def __init__(self, width: int, height: int, tick_rate: int, seed: int, gravity: float = None):
+        if type(tick_rate) is not int:
+            raise TypeError("Replays require an integer tick rate: {}".format(tick_rate))
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.seed = seed
+        self.gravity = gravity
+        """ The fixed gravity of the game, or None if it used the score weighted gravity """
+        self.events: list[tuple[int, Direction | Action]] = []
+        """ The applied actions and the ticks they were applied at, in order """
+        self.ticks = 0
+        """ The final tick count of the game """
+        self.checksum: int = None
+        """ The checksum of the final game state, or None while recording """
+
+    @classmethod
+    def record(cls, engine: Engine) -> 'Replay':
+        """
+        Starts recording the actions applied to the given engine. The engine must not have been ticked yet.
+
+        Returns the recording replay. Call finish() once the game is over.
+        """
+        if engine.ticks != 0:
+            raise ValueError("Cannot record a game that has already started")
+        board = engine.board
+        replay = cls(board.width, board.height, engine.tick_rate, board.seed, board.fixed_gravity)
+        engine.recorder = replay
+        return replay
+
+    def on_action(self, tick: int, action: Direction | Action):
+        """
+        Records an action applied at the given tick
+        """
+        if action not in REPLAY_ACTIONS:
+            raise ValueError("Unexpected action {}".format(action))
+        self.events.append((tick, action))
+
+    def finish(self, engine: Engine):
+        """
+        Stops recording the given engine and stores its final state
+        """
+        engine.recorder = None
+        self.ticks = engine.ticks
+        self.checksum = state_checksum(engine)
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the replay in its binary format
+        """
+        if self.checksum is None:
+            raise ValueError("Cannot encode a replay that is still recording")
+        gravity = math.nan if self.gravity is None else self.gravity
+        result = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.width, self.height, self.tick_rate, gravity, self.seed))
+        previous = 0
+        for tick, action in self.events:
+            result += encode_varint((tick - previous) << ACTION_BITS | REPLAY_ACTIONS.index(action))
+            previous = tick
+        result.append(0)
+        result += encode_varint(self.ticks)
+        result += REPLAY_FOOTER.pack(self.checksum)
+        return bytes(result)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        """
+        Returns the replay encoded in the given binary data. Raises a ValueError if the data is not a valid replay.
+        """
+        if len(data) < REPLAY_HEADER.size + 1 + REPLAY_FOOTER.size:
+            raise ValueError("Truncated replay")
+        magic, version, width, height, tick_rate, gravity, seed = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Not a replay")
+        if version != REPLAY_VERSION:
+            raise ValueError("Unsupported replay version: {}".format(version))
+        replay = cls(width, height, tick_rate, seed, None if math.isnan(gravity) else gravity)
+
+        offset = REPLAY_HEADER.size
+        tick = 0
+        while True:
+            value, offset = decode_varint(data, offset)
+            if value == 0:
+                break
+            code = value & ((1 << ACTION_BITS) - 1)
+            if code >= len(REPLAY_ACTIONS):
+                raise ValueError("Invalid action code in replay: {}".format(code))
+            tick += value >> ACTION_BITS
+            replay.events.append((tick, REPLAY_ACTIONS[code]))
+        replay.ticks, offset = decode_varint(data, offset)
+        if len(data) - offset != REPLAY_FOOTER.size:
+            raise ValueError("Invalid replay footer")
+        (replay.checksum,) = REPLAY_FOOTER.unpack_from(data, offset)
+        return replay
+
+    def save(self, path: str):
+        """
+        Writes the replay to the given file
+        """
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        """
+        Reads a replay from the given file
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def play(self, board_type: type[Board] = Board, verify = True, on_update = None) -> Engine:
+        """
+        Replays the game headless, as fast as the CPU allows
+
+        * board_type: The Board implementation to replay on. Default is the numpy based Board.
+        * verify: If True, a ValueError is raised if the final game state does not match the recorded checksum. Default is True.
+        * on_update: If given, called with the engine after every applied action and every tick, e.g. to record frames. Default is None.
+
+        Returns the engine in the game's final state
+        """
+        engine = Engine(self.width, self.height, self.tick_rate, board_type, self.gravity, self.seed)
+        if on_update is not None:
+            on_update(engine)
+        for tick, action in self.events:
+            while engine.ticks < tick:
+                engine.tick()
+                if on_update is not None:
+                    on_update(engine)
+            engine.apply(action)
+            if on_update is not None:
+                on_update(engine)
+        while engine.ticks < self.ticks:
+            engine.tick()
+            if on_update is not None:
+                on_update(engine)
+        if verify and state_checksum(engine) != self.checksum:
+            raise ValueError("Replayed game state does not match the recorded checksum")
+        return engine
@@ -0,0 +1,241 @@
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from .bitboard import BitBoard
+from .engine import Engine
+from .movegen import Placement, enumerate_placements
+from .pytris import Board, validate_board_dimensions, validate_seed, DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT
+
+FEATURES = ("aggregate_height", "holes", "bumpiness", "lines")
+""" The board features weighted by HeuristicPlayer, in order """
+DEFAULT_WEIGHTS = (-0.510066, -0.35663, -0.184483, 0.760666)
+""" Default weights of FEATURES """
+DEFAULT_MAX_PIECES = 1000
+""" Default amount of pieces after which a game is ended, so strong players do not play forever """
+DEFAULT_SIZES = [(DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT)]
+""" Default board sizes games are played on """
+
+def board_features(rows: list[int], width: int) -> tuple[int, int, int, int]:
+    """
+    Removes completed rows from the given board and returns its features, see FEATURES
+
+    * rows: The board's rows, top to bottom, as bitmasks, see Board.bitmasks()
+    * width: The width of the board
+    """
+    full = (1 << width) - 1
+    remaining = [row for row in rows if row != full]
+    lines = len(rows) - len(remaining)
+    height = len(rows)
+
+    heights = [0] * width
+    holes = 0
+    seen = 0
+    for y, row in enumerate(remaining, lines):
+        new = row & ~seen
+        while new:
+            column = (new & -new).bit_length() - 1
+            heights[column] = height - y
+            new &= new - 1
+        seen |= row
+        holes += (seen & ~row).bit_count()
+    bumpiness = sum(abs(heights[x] - heights[x + 1]) for x in range(width - 1))
+    return sum(heights), holes, bumpiness, lines
+
+class HeuristicPlayer:
+    """
+    Picks the placement whose resulting board scores best in a weighted sum of board features
+
+    * weights: A weight per entry of FEATURES. Default is DEFAULT_WEIGHTS.
+    """
+    def __init__(self, weights: tuple[float, ...] = DEFAULT_WEIGHTS):
+        if len(weights) != len(FEATURES):
+            raise ValueError("Expected {} weights, got {}".format(len(FEATURES), len(weights)))
+        self.weights = tuple(weights)
+
+    def evaluate(self, rows: list[int], width: int) -> float:
+        """
+        Returns the weighted features of the given board, see board_features()
+        """
+        return sum(weight * feature for weight, feature in zip(self.weights, board_features(rows, width)))
+
+    def choose(self, board: Board) -> Placement:
+        """
+        Returns the best placement of the board's current block, or None if there is none
+        """
+        rows = board.bitmasks()
+        width = board.width
+        full = (1 << width) - 1
+        best = None
+        best_value = None
+        for placement in enumerate_placements(board):
+            placed = list(rows)
+            for y in range(placement.y, placement.y + placement.array.shape[0]):
+                placed[y] |= placement.cells >> (y * width) & full
+            value = self.evaluate(placed, width)
+            if best is None or value > best_value:
+                best, best_value = placement, value
+        return best
+
+def play_game(seed: int, width = DEFAULT_BOARD_WIDTH, height = DEFAULT_BOARD_HEIGHT, weights: tuple[float, ...] = DEFAULT_WEIGHTS, max_pieces = DEFAULT_MAX_PIECES) -> tuple[int, int, int, int]:
+    """
+    Plays a headless game with a HeuristicPlayer until gameover or max_pieces pieces have been placed
+
+    Returns the seed, score points, completed rows and amount of pieces placed
+    """
+    engine = Engine(width, height, board_type=BitBoard, seed=seed)
+    player = HeuristicPlayer(weights)
+    pieces = 0
+    while not engine.gameover and pieces < max_pieces:
+        placement = player.choose(engine.board)
+        if placement is None:
+            break
+        for action in placement.path:
+            engine.apply(action)
+        pieces += 1
+    score = engine.board.score
+    return seed, score.points, score.rows, pieces
+
+def _play_game(args: tuple) -> tuple[int, int, int, int]:
+    return play_game(*args)
+
+class Statistics:
+    """
+    Aggregates the results of played games
+    """
+    def __init__(self):
+        self.games = 0
+        self.points = 0
+        self.rows = 0
+        self.pieces = 0
+        self.min_points: int = None
+        self.max_points: int = None
+        self.start = time.perf_counter()
+
+    def add(self, points: int, rows: int, pieces: int):
+        """
+        Adds the result of a game
+        """
+        self.games += 1
+        self.points += points
+        self.rows += rows
+        self.pieces += pieces
+        self.min_points = points if self.min_points is None else min(self.min_points, points)
+        self.max_points = points if self.max_points is None else max(self.max_points, points)
+
+    @property
+    def mean_points(self) -> float:
+        return self.points / self.games if self.games else 0.0
+
+    def summary(self) -> str:
+        """
+        Returns a single line describing the aggregated results
+        """
+        elapsed = time.perf_counter() - self.start
+        games = self.games or 1
+        return "games {} | score mean {:.1f} min {} max {} | lines {:.1f} | pieces {:.1f} | {:.1f} games/s, {:.0f} pieces/s".format(
+            self.games, self.mean_points, self.min_points, self.max_points, self.rows / games, self.pieces / games,
+            self.games / elapsed, self.pieces / elapsed)
+
+def run_games(games: int, workers: int = None, seed = 0, sizes: list[tuple[int, int]] = DEFAULT_SIZES, weights: tuple[float, ...] = DEFAULT_WEIGHTS,
+              max_pieces = DEFAULT_MAX_PIECES, progress = None) -> Statistics:
+    """
+    Plays the given amount of headless games distributed over a process pool. Game i uses seed + i.
+
+    * workers: The amount of worker processes. Default is None, which uses one per core.
+    * sizes: The (width, height) board sizes to play on. Game i uses size i modulo the amount of sizes. Default is DEFAULT_SIZES.
+    * progress: If given, called with the Statistics after every finished game. Default is None.
+
+    Returns the aggregated statistics
+    """
+    for width, height in sizes:
+        validate_board_dimensions(width, height)
+    # checked before the games are handed to the workers, which would only report them as a failed task
+    validate_seed(seed)
+    validate_seed(seed + max(games, 1) - 1)
+    if len(weights) != len(FEATURES):
+        raise ValueError("Expected {} weights, got {}".format(len(FEATURES), len(weights)))
+    statistics = Statistics()
+    tasks = [(seed + i, *sizes[i % len(sizes)], tuple(weights), max_pieces) for i in range(games)]
+    workers = workers or os.cpu_count() or 1
+    # small chunks keep all workers busy until the end, results are a few integers each
+    chunksize = max(1, games // (workers * 16))
+    with multiprocessing.Pool(workers) as pool:
+        for _, points, rows, pieces in pool.imap_unordered(_play_game, tasks, chunksize):
+            statistics.add(points, rows, pieces)
+            if progress is not None:
+                progress(statistics)
+    return statistics
+
+def tune(iterations: int, games: int, workers: int = None, seed = 0, sizes: list[tuple[int, int]] = DEFAULT_SIZES,
+         weights: tuple[float, ...] = DEFAULT_WEIGHTS, max_pieces = DEFAULT_MAX_PIECES, progress = None) -> tuple[tuple[float, ...], float]:
+    """
+    Tunes the player's weights by hill climbing: every iteration perturbs the best weights found so far and keeps the candidate if it scores a higher mean over the same games.
+
+    * iterations: The amount of candidates to evaluate
+    * games: The amount of games each candidate plays
+    * progress: If given, called with the iteration, the candidate weights and their statistics after every iteration. Default is None.
+
+    Returns the best weights and their mean score
+    """
+    rng = random.Random(seed)
+    best = tuple(weights)
+    best_points = run_games(games, workers, seed, sizes, best, max_pieces).mean_points
+    for iteration in range(iterations):
+        candidate = tuple(weight + rng.gauss(0, 0.1) for weight in best)
+        statistics = run_games(games, workers, seed, sizes, candidate, max_pieces)
+        if statistics.mean_points > best_points:
+            best, best_points = candidate, statistics.mean_points
+        if progress is not None:
+            progress(iteration, candidate, statistics)
+    return best, best_points
+
+def parse_size(value: str) -> tuple[int, int]:
+    """
+    Parses a board size given as WIDTHxHEIGHT, e.g. 10x20
+    """
+    try:
+        width, height = value.lower().split("x")
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid board size: {}".format(value))
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(prog="python -m pytris.runner", description="Plays headless pytris games with a heuristic player over a process pool")
+    parser.add_argument("--games", type=int, default=100, help="amount of games to play (per candidate when tuning)")
+    parser.add_argument("--workers", type=int, help="amount of worker processes, default is one per core")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, game i uses seed + i")
+    parser.add_argument("--size", type=parse_size, action="append", dest="sizes", metavar="WIDTHxHEIGHT",
+                        help="board size to play on, repeat to alternate games between sizes, default is {}x{}".format(DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT))
+    parser.add_argument("--max-pieces", type=int, default=DEFAULT_MAX_PIECES, help="end games after this many pieces")
+    parser.add_argument("--weights", type=lambda value: tuple(float(weight) for weight in value.split(",")), default=DEFAULT_WEIGHTS,
+                        help="comma separated weights of " + ", ".join(FEATURES))
+    parser.add_argument("--tune", type=int, metavar="ITERATIONS", help="tune the weights for this many iterations")
+    args = parser.parse_args(args)
+    sizes = args.sizes or DEFAULT_SIZES
+    try:
+        for width, height in sizes:
+            validate_board_dimensions(width, height)
+        validate_seed(args.seed)
+        validate_seed(args.seed + max(args.games, 1) - 1)
+    except ValueError as error:
+        parser.error(str(error))
+    if len(args.weights) != len(FEATURES):
+        parser.error("--weights expects {} values, one per feature: {}".format(len(FEATURES), ", ".join(FEATURES)))
+
+    if args.tune:
+        def report(iteration, candidate, statistics):
+            print("iteration {}: weights {} | {}".format(iteration, ",".join("%.4f" % weight for weight in candidate), statistics.summary()))
+        weights, points = tune(args.tune, args.games, args.workers, args.seed, sizes, args.weights, args.max_pieces, report)
+        print("best weights: {} | score mean {:.1f}".format(",".join("%.4f" % weight for weight in weights), points))
+    else:
+        last = [0.0]
+        def report(statistics):
+            if time.perf_counter() - last[0] > 1 or statistics.games == args.games:
+                last[0] = time.perf_counter()
+                print(statistics.summary(), flush=True)
+        run_games(args.games, args.workers, args.seed, sizes, args.weights, args.max_pieces, report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+DEFAULT_MAX_FPS = 60
+""" Default maximum amount of frames drawn per second """
+
+class RenderScheduler:
+    """
+    Coalesces render requests into frames. Requesting a render only marks the frame as dirty, a single render thread then draws at most once per frame interval.\\
+    Any amount of requests arriving while a frame is pending result in a single draw, so bursts of input never wait for terminal I/O.
+
+    * draw: Called without arguments on the render thread to draw a frame
+    * max_fps: The maximum amount of frames drawn per second. Default is DEFAULT_MAX_FPS.
+    * lock: If given, the lock is held while drawing, e.g. to keep the game state from changing mid-frame. Default is None.
+    """
+
+    def __init__(self, draw, max_fps: float = DEFAULT_MAX_FPS, lock: threading.Lock = None):
+        if not max_fps > 0:
+            raise ValueError("Invalid maximum frame rate: {}".format(max_fps))
+
+        self.draw = draw
+        self.max_fps = max_fps
+        self.lock = lock
+        self.frames_requested = 0
+        """ The amount of render requests received """
+        self.frames_rendered = 0
+        """ The amount of frames drawn """
+        self.frames_coalesced = 0
+        """ The amount of render requests that were merged into another request's frame instead of causing a frame of their own """
+        self._pending = 0
+        self._dirty = threading.Event()
+        self._counter_lock = threading.Lock()
+        self._thread: threading.Thread = None
+        self._running = False
+
+    def request(self):
+        """
+        Marks the frame as dirty, so it is drawn with the next frame. Returns immediately.
+        """
+        with self._counter_lock:
+            self.frames_requested += 1
+            self._pending += 1
+        self._dirty.set()
+
+    def start(self):
+        """
+        Starts the render thread
+        """
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="RenderScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush = True):
+        """
+        Stops the render thread
+
+        * flush: If True, a pending frame is drawn before returning. Default is True.
+        """
+        if self._running:
+            self._running = False
+            self._dirty.set() # wake up the render thread
+            self._thread.join()
+        if flush and self._pending > 0:
+            self._draw()
+
+    def _draw(self):
+        # counted before drawing, so requests arriving during the draw cause another frame
+        with self._counter_lock:
+            if self._pending == 0:
+                self._dirty.clear()
+                return
+            self.frames_coalesced += self._pending - 1
+            self.frames_rendered += 1
+            self._pending = 0
+            self._dirty.clear()
+        if self.lock is None:
+            self.draw()
+        else:
+            with self.lock:
+                self.draw()
+
+    def _run(self):
+        next_frame = time.monotonic()
+        while self._running:
+            self._dirty.wait()
+            if not self._running:
+                return
+            # wait for the frame interval to pass, requests arriving meanwhile are coalesced into this frame
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._draw()
+            next_frame = time.monotonic() + 1 / self.max_fps
+
+class AsyncRenderScheduler(RenderScheduler):
+    """
+    Coalesces render requests into frames like RenderScheduler, but draws from the run() coroutine on an asyncio event loop instead of a render thread.\\
+    request() must be called from the event loop's thread.
+    """
+    def __init__(self, draw, max_fps: float = DEFAULT_MAX_FPS):
+        super().__init__(draw, max_fps)
+        self._dirty = asyncio.Event()
+
+    def start(self):
+        raise RuntimeError("AsyncRenderScheduler is driven by awaiting run() on the event loop")
+
+    async def run(self):
+        """
+        Draws dirty frames, at most max_fps per second, until cancelled
+        """
+        next_frame = time.monotonic()
+        while True:
+            await self._dirty.wait()
+            # requests arriving while waiting for the frame interval are coalesced into this frame
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._draw()
+            next_frame = time.monotonic() + 1 / self.max_fps
@@ -0,0 +1,323 @@
+import argparse
+import asyncio
+import struct
+import time
+import numpy as np
+from .engine import Engine, TICK_RATE
+from .loop import MAX_CATCH_UP
+from .pytris import PIECES, Block, Board, DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT, validate_board_dimensions
+from .replay import REPLAY_ACTIONS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7473
+""" Default TCP port of the match server """
+MAX_CLIENT_BUFFER = 1 << 16
+""" Clients with more than this many bytes waiting to be sent skip updates and are resynchronized with a keyframe once they catch up """
+
+FRAME = struct.Struct("<H")
+""" Length of the following update """
+UPDATE_HEADER = struct.Struct("<BBIqBBbbBB?fB")
+""" width, height, tick, score points, piece, rotation, x, y, next piece, next rotation, gameover, gravity, amount of rows """
+UPDATE_ROW = struct.Struct("<BQ")
+""" row index, row bitmask, see Board.bitmasks() """
+
+class StateUpdate:
+    """
+    The state of a match's board at a tick: the changed rows as bitmasks, the current and upcoming block and the score.\\
+    An update containing every row is a keyframe, any other update only holds the rows changed since the previous update.
+
+    The wire format is a FRAME length prefix, an UPDATE_HEADER and an UPDATE_ROW per row. Blocks are encoded as piece id and rotation, see snapshot_dtype().
+    """
+    def __init__(self, width: int, height: int, tick: int, points: int, block: tuple[int, int, int, int], block_next: tuple[int, int], gameover: bool, gravity: float, rows: list[tuple[int, int]]):
+        self.width = width
+        self.height = height
+        self.tick = tick
+        self.points = points
+        self.block = block
+        """ The current block's piece id, rotation, column and row """
+        self.block_next = block_next
+        """ The upcoming block's piece id and rotation """
+        self.gameover = gameover
+        self.gravity = gravity
+        self.rows = rows
+        """ The changed rows as row index and bitmask """
+
+    @classmethod
+    def capture(cls, engine: Engine, previous: list[int] = None) -> tuple['StateUpdate', list[int]]:
+        """
+        Captures the state of the given engine's board
+
+        * previous: The board's rows of the previous update, see Board.bitmasks(). Default is None, which captures a keyframe.
+
+        Returns the update and the board's current rows
+        """
+        board = engine.board
+        rows = board.bitmasks()
+        if previous is None:
+            changed = list(enumerate(rows))
+        else:
+            changed = [(y, row) for y, (row, before) in enumerate(zip(rows, previous)) if row != before]
+        update = cls(board.width, board.height, engine.ticks, board.score.points,
+                     (board.block.piece.id, board.block.rotation, *board.block.pos), (board.block_next.piece.id, board.block_next.rotation),
+                     board.gameover, board.block.gravity, changed)
+        return update, rows
+
+    def same_pieces(self, other: 'StateUpdate') -> bool:
+        """
+        Returns True, if the given update has the same blocks, score and gameover state
+        """
+        return (other is not None and self.block == other.block and self.block_next == other.block_next
+                and self.points == other.points and self.gameover == other.gameover)
+
+    def encode(self) -> bytes:
+        """
+        Returns the update in its wire format, including the length prefix
+        """
+        data = bytearray(FRAME.size)
+        data += UPDATE_HEADER.pack(self.width, self.height, self.tick, self.points, *self.block, *self.block_next, self.gameover, self.gravity, len(self.rows))
+        for y, row in self.rows:
+            data += UPDATE_ROW.pack(y, row)
+        FRAME.pack_into(data, 0, len(data) - FRAME.size)
+        return bytes(data)
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'StateUpdate':
+        """
+        Returns the update encoded in the given data, without its length prefix
+        """
+        width, height, tick, points, piece, rotation, x, y, next_piece, next_rotation, gameover, gravity, count = UPDATE_HEADER.unpack_from(data)
+        if len(data) != UPDATE_HEADER.size + count * UPDATE_ROW.size:
+            raise ValueError("Invalid update size")
+        rows = [UPDATE_ROW.unpack_from(data, UPDATE_HEADER.size + i * UPDATE_ROW.size) for i in range(count)]
+        return cls(width, height, tick, points, (piece, rotation, x, y), (next_piece, next_rotation), gameover, gravity, rows)
+
+    def apply(self, board: Board):
+        """
+        Applies the update to a board mirroring the match, e.g. to render it. The board must have the match's size.
+        """
+        if self.rows:
+            array = board.array.copy()
+            columns = np.arange(board.width, dtype=np.uint64)
+            for y, row in self.rows:
+                array[y] = np.uint64(row) >> columns & np.uint64(1)
+            board.array = array
+        board.score.points = self.points
+        piece, rotation, x, y = self.block
+        block = Block(PIECES[piece], board, rotation)
+        block.pos = [x, y]
+        board.block_next = Block(PIECES[self.block_next[0]], board, self.block_next[1])
+        board.block = block
+        block.gravity = self.gravity
+        if board.gameover != self.gameover:
+            board.gameover = self.gameover
+
+class Client:
+    """
+    A connection to the match server, playing or spectating a match
+    """
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.synchronized = False
+        """ If False, the client is sent a keyframe with the next broadcast, e.g. after joining """
+
+    def send(self, update: bytes, keyframe: bytes):
+        """
+        Queues the given update, or the keyframe if the client is not synchronized. Clients too far behind skip updates until they caught up.
+
+        * update: The encoded update, or None if nothing changed
+        * keyframe: The encoded keyframe, or None if every client is synchronized
+        """
+        if self.writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            self.synchronized = False
+        elif not self.synchronized:
+            self.writer.write(keyframe)
+            self.synchronized = True
+        elif update is not None:
+            self.writer.write(update)
+
+class Match:
+    """
+    A game hosted by the match server. Every update is encoded once and the same bytes are sent to all of the match's clients.
+    """
+    def __init__(self, id: int, engine: Engine):
+        self.id = id
+        self.engine = engine
+        self.clients: set[Client] = set()
+        self.updates_sent = 0
+        """ The amount of updates encoded, regardless of the amount of clients they were sent to """
+        self._rows: list[int] = None
+        self._update: StateUpdate = None
+
+    def keyframe(self) -> bytes:
+        """
+        Returns an encoded update of the complete current state
+        """
+        return StateUpdate.capture(self.engine)[0].encode()
+
+    def broadcast(self):
+        """
+        Sends the changes since the previous broadcast to every client and a keyframe to clients that just joined or fell behind.\\
+        Nothing is sent to synchronized clients if nothing changed.
+        """
+        if not self.clients:
+            return
+        update, rows = StateUpdate.capture(self.engine, self._rows)
+        changed = bool(update.rows) or not update.same_pieces(self._update)
+        if changed:
+            self._rows = rows
+            self._update = update
+        keyframe = self.keyframe() if not all(client.synchronized for client in self.clients) else None
+        if not changed and keyframe is None:
+            return
+        data = update.encode() if changed else None
+        self.updates_sent += changed
+        for client in self.clients:
+            client.send(data, keyframe)
+
+class MatchServer:
+    """
+    Hosts any amount of matches on a single asyncio event loop. All matches are ticked by one clock and broadcast their changes after every tick.
+
+    A client starts with a line "NEW", "PLAY <match id>" or "WATCH <match id>", which the server answers with "OK <match id>" or "ERROR <reason>".\\
+    The server then streams StateUpdates, starting with a keyframe. Players send actions as single bytes, using the action codes of REPLAY_ACTIONS.
+
+    * width, height: The board size of new matches
+    * tick_rate: The amount of ticks per second. Default is TICK_RATE.
+    """
+    def __init__(self, width = DEFAULT_BOARD_WIDTH, height = DEFAULT_BOARD_HEIGHT, tick_rate: int = TICK_RATE):
+        validate_board_dimensions(width, height)
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.matches: dict[int, Match] = {}
+        self._server: asyncio.Server = None
+        self._clock_task: asyncio.Task = None
+        self._next_id = 1
+
+    def create_match(self, seed: int = None) -> Match:
+        """
+        Starts a new match. Matches are removed once their last client disconnects, or once they are over without any clients.
+        """
+        engine = Engine(self.width, self.height, self.tick_rate, seed=seed)
+        match = Match(self._next_id, engine)
+        self.matches[match.id] = match
+        self._next_id += 1
+        return match
+
+    async def start(self, host = DEFAULT_HOST, port = DEFAULT_PORT) -> asyncio.Server:
+        """
+        Starts accepting connections and ticking the matches
+
+        Returns the listening server, e.g. to look up the port if port 0 was given
+        """
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._clock_task = asyncio.create_task(self._clock())
+        return self._server
+
+    async def close(self):
+        """
+        Stops the clock and closes all connections
+        """
+        if self._clock_task is not None:
+            self._clock_task.cancel()
+            await asyncio.gather(self._clock_task, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+        for match in self.matches.values():
+            for client in match.clients:
+                client.writer.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def _clock(self):
+        """
+        Ticks every match at the tick rate, scheduled relative to the start of the clock like GameLoop
+        """
+        interval = 1 / self.tick_rate
+        start = time.monotonic()
+        ticks = 0
+        while True:
+            ticks += 1
+            delay = start + ticks * interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif -delay > MAX_CATCH_UP:
+                start = time.monotonic() - ticks * interval
+            else:
+                await asyncio.sleep(0)
+            for match in list(self.matches.values()):
+                if match.engine.gameover and not match.clients:
+                    del self.matches[match.id]
+                    continue
+                match.engine.tick()
+                match.broadcast()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves a single connection
+        """
+        try:
+            command, _, argument = (await reader.readline()).decode("ascii", "replace").strip().partition(" ")
+            match = None
+            if command == "NEW":
+                match = self.create_match()
+            elif command in ("PLAY", "WATCH") and argument.isdigit():
+                match = self.matches.get(int(argument))
+            if match is None:
+                writer.write(b"ERROR unknown command or match\n")
+                await writer.drain()
+                return
+            writer.write("OK {}\n".format(match.id).encode("ascii"))
+            client = Client(writer)
+            match.clients.add(client)
+            try:
+                while data := await reader.read(256):
+                    if command == "WATCH":
+                        continue
+                    for code in data:
+                        if 0 < code < len(REPLAY_ACTIONS):
+                            match.engine.apply(REPLAY_ACTIONS[code])
+            finally:
+                match.clients.discard(client)
+                if not match.clients:
+                    self.matches.pop(match.id, None)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def read_update(reader: asyncio.StreamReader) -> StateUpdate:
+    """
+    Reads the next StateUpdate sent by the match server
+    """
+    (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return StateUpdate.decode(await reader.readexactly(length))
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(prog="python -m pytris.server", description="Hosts pytris matches for players and spectators")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--width", type=int, default=DEFAULT_BOARD_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_BOARD_HEIGHT)
+    args = parser.parse_args(args)
+    try:
+        validate_board_dimensions(args.width, args.height)
+    except ValueError as error:
+        parser.error(str(error))
+
+    async def serve():
+        server = MatchServer(args.width, args.height)
+        listener = await server.start(args.host, args.port)
+        print("Serving on {}:{}".format(*listener.sockets[0].getsockname()[:2]), flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import math
+import os
+import random
+import struct
+import numpy as np
+from .pytris import PIECES, Block, Block_Type, Board, find_orientation, get_random_block_type, validate_board_dimensions
+
+SNAPSHOT_PIECES = tuple(Block_Type)
+""" Maps piece ids of the snapshot format to block types """
+
+MAX_SNAPSHOT_WIDTH = 64
+""" The maximum board width of a snapshot, whose rows are packed from 64 bit row bitmasks """
+MAX_SNAPSHOT_HEIGHT = 127
+""" The maximum board height of a snapshot, so every row index fits the snapshot's signed byte block position """
+
+ARCHIVE_MAGIC = b"PTSA"
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = struct.Struct("<4sBBBxQ")
+""" magic, version, board width, board height, amount of snapshots """
+ARCHIVE_MIN_CAPACITY = 1024
+""" Minimum amount of snapshots an archive file has room for. The file is grown by doubling its capacity. """
+
+def snapshot_dtype(width: int, height: int) -> np.dtype:
+    """
+    Returns the numpy structured dtype of a snapshot of a board of the given size.\\
+    The board is packed to one bit per field, so a 10x20 board takes 25 bytes and the whole snapshot 66 bytes.
+    The first two bytes of every snapshot are the board's width and height, so snapshots are self-describing.
+    """
+    return np.dtype([
+        ("width", "u1"),
+        ("height", "u1"),
+        ("board", "u1", ((width * height + 7) // 8,)),  # fields written on, row by row, see np.packbits()
+        ("piece", "u1"),
+        ("rotation", "u1"),
+        ("x", "i1"),
+        ("y", "i1"),
+        ("next_piece", "u1"),
+        ("next_rotation", "u1"),
+        ("gameover", "?"),
+        ("points", "<i8"),
+        ("rows", "<u4"),
+        ("gravity", "<f8"),     # fixed gravity, NaN if none
+        ("seed", "<u8"),
+        ("draws", "<u4"),       # block types drawn from the seeded generator, see Board.blocks_drawn
+    ])
+
+def block_orientation(array: np.ndarray) -> tuple[int, int]:
+    """
+    Returns the piece id and rotation of the given block array. Raises a ValueError if it is not a rotated block type.
+    """
+    orientation = find_orientation(array)
+    if orientation is None:
+        raise ValueError("Not a block type: {}".format(array.tolist()))
+    return orientation[0].id, orientation[1]
+
+def block_array(piece: int, rotation: int) -> np.ndarray:
+    """
+    Returns the read-only block array of the given piece id and rotation
+    """
+    return PIECES[piece].arrays[rotation % 4]
+
+def take_snapshot(board: Board, out: np.void = None) -> np.void:
+    """
+    Writes the state of the given board into a snapshot record.\\
+    Fields written on more than once, which only occur on gameover, are stored as written on once.
+    Raises a ValueError if the board is larger than MAX_SNAPSHOT_WIDTH and MAX_SNAPSHOT_HEIGHT, e.g. a large ChunkedBoard.
+
+    * out: The record to write to, e.g. a record of a SnapshotArchive. Default is None, which allocates a new one.
+
+    Returns the written record
+    """
+    width, height = board.width, board.height
+    validate_board_dimensions(width, height, MAX_SNAPSHOT_WIDTH, MAX_SNAPSHOT_HEIGHT)
+    if out is None:
+        out = np.zeros(1, snapshot_dtype(width, height))[0]
+    masks = np.array(board.bitmasks(), dtype="<u8").view(np.uint8).reshape(height, 8)
+    out["width"] = width
+    out["height"] = height
+    out["board"] = np.packbits(np.unpackbits(masks, axis=1, bitorder="little")[:, :width])
+    out["piece"], out["rotation"] = board.block.piece.id, board.block.rotation
+    out["x"], out["y"] = board.block.pos
+    out["next_piece"], out["next_rotation"] = board.block_next.piece.id, board.block_next.rotation
+    out["gameover"] = board.gameover
+    out["points"] = board.score.points
+    out["rows"] = board.score.rows
+    out["gravity"] = math.nan if board.fixed_gravity is None else board.fixed_gravity
+    out["seed"] = board.seed
+    out["draws"] = board.blocks_drawn
+    return out
+
+def restore_snapshot(record: np.void, board_type: type[Board] = Board) -> Board:
+    """
+    Returns a new, paused board in the state of the given snapshot record.\\
+    The board's random generator is restored by drawing the recorded amount of block types from the seeded generator.
+
+    * board_type: The Board implementation to restore to. Default is the numpy based Board.
+    """
+    width, height = int(record["width"]), int(record["height"])
+    board = board_type(width, height, int(record["seed"]))
+    board.array = np.unpackbits(record["board"], count=width * height).reshape(height, width)
+    board.random = random.Random(board.seed)
+    board.blocks_drawn = int(record["draws"])
+    for _ in range(board.blocks_drawn):
+        get_random_block_type(board.random)
+    board.score.points = int(record["points"])
+    board.score.rows = int(record["rows"])
+    gravity = float(record["gravity"])
+    board.fixed_gravity = None if math.isnan(gravity) else gravity
+    board.block_next = Block(PIECES[record["next_piece"]], board, int(record["next_rotation"]))
+    block = Block(PIECES[record["piece"]], board, int(record["rotation"]))
+    block.pos = [int(record["x"]), int(record["y"])]
+    board.block = block
+    board.gameover = bool(record["gameover"])
+    return board
+
+def snapshot_from_bytes(data) -> np.void:
+    """
+    Returns the snapshot record stored in the given bytes-like object, without copying it.\\
+    The record is read-only if the data is, e.g. for bytes.
+    """
+    if len(data) < 2:
+        raise ValueError("Truncated snapshot")
+    dtype = snapshot_dtype(data[0], data[1])
+    if len(data) != dtype.itemsize:
+        raise ValueError("Invalid snapshot size: {}, expected {}".format(len(data), dtype.itemsize))
+    return np.frombuffer(data, dtype, count=1)[0]
+
+class SnapshotArchive:
+    """
+    A file of snapshots of boards of the same size, memory-mapped, so snapshots are written and read in place without copies.\\
+    The file consists of a header (see ARCHIVE_HEADER) followed by the records, see snapshot_dtype().
+    Use create() or open() instead of the constructor.
+
+    Analysis jobs can use records directly, e.g. archive.records["points"].mean().
+    """
+    def __init__(self, path: str, width: int, height: int, count: int, writable: bool):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.dtype = snapshot_dtype(width, height)
+        """ The dtype of the archive's records """
+        self.count = count
+        """ The amount of snapshots in the archive """
+        self.writable = writable
+        self._records: np.ndarray = None
+        self._map(count)
+
+    @classmethod
+    def create(cls, path: str, width: int, height: int) -> 'SnapshotArchive':
+        """
+        Creates an empty archive for boards of the given size, replacing any existing file
+        """
+        validate_board_dimensions(width, height)
+        with open(path, "wb") as file:
+            file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, width, height, 0))
+        return cls(path, width, height, 0, True)
+
+    @classmethod
+    def open(cls, path: str, writable = False) -> 'SnapshotArchive':
+        """
+        Opens an existing archive. Raises a ValueError if the file is not a valid archive.
+
+        * writable: If True, snapshots can be appended. Default is False.
+        """
+        with open(path, "rb") as file:
+            header = file.read(ARCHIVE_HEADER.size)
+        if len(header) < ARCHIVE_HEADER.size:
+            raise ValueError("Truncated snapshot archive")
+        magic, version, width, height, count = ARCHIVE_HEADER.unpack(header)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError("Not a snapshot archive")
+        if version != ARCHIVE_VERSION:
+            raise ValueError("Unsupported snapshot archive version: {}".format(version))
+        if os.path.getsize(path) < ARCHIVE_HEADER.size + count * snapshot_dtype(width, height).itemsize:
+            raise ValueError("Truncated snapshot archive")
+        return cls(path, width, height, count, writable)
+
+    @property
+    def records(self) -> np.ndarray:
+        """ The archive's snapshot records, memory-mapped """
+        return self._records[:self.count]
+
+    def _map(self, capacity: int):
+        """
+        Memory-maps room for the given amount of records, growing the file if necessary
+        """
+        self._records = None    # unmaps the previous mapping
+        size = ARCHIVE_HEADER.size + capacity * self.dtype.itemsize
+        if self.writable and os.path.getsize(self.path) < size:
+            with open(self.path, "r+b") as file:
+                file.truncate(size)
+        if capacity == 0:
+            self._records = np.zeros(0, self.dtype)
+        else:
+            self._records = np.memmap(self.path, self.dtype, "r+" if self.writable else "r", ARCHIVE_HEADER.size, (capacity,))
+
+    def append(self, board: Board) -> np.void:
+        """
+        Writes a snapshot of the given board to the end of the archive
+
+        Returns the written record
+        """
+        if not self.writable:
+            raise ValueError("Snapshot archive is not writable")
+        if (board.width, board.height) != (self.width, self.height):
+            raise ValueError("Expected a {}x{} board, got {}x{}".format(self.width, self.height, board.width, board.height))
+        if self.count == len(self._records):
+            self._map(max(ARCHIVE_MIN_CAPACITY, self.count * 2))
+        record = take_snapshot(board, self._records[self.count])
+        self.count += 1
+        return record
+
+    def restore(self, idx: int, board_type: type[Board] = Board) -> Board:
+        """
+        Returns a new board in the state of the given snapshot, see restore_snapshot()
+        """
+        return restore_snapshot(self.records[idx], board_type)
+
+    def flush(self):
+        """
+        Writes the amount of snapshots to the file's header and flushes the written records to disk
+        """
+        if not self.writable:
+            return
+        if isinstance(self._records, np.memmap):
+            self._records.flush()
+        with open(self.path, "r+b") as file:
+            file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, self.width, self.height, self.count))
+
+    def close(self):
+        """
+        Flushes the archive and trims unused capacity from the file
+        """
+        self.flush()
+        self._records = None
+        if self.writable:
+            with open(self.path, "r+b") as file:
+                file.truncate(ARCHIVE_HEADER.size + self.count * self.dtype.itemsize)
+            self.writable = False
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, idx):
+        return self.records[idx]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
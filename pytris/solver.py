@@ -0,0 +1,272 @@
+import argparse
+import random
+import time
+from enum import Enum
+import numpy as np
+from .movegen import Placement, orientations, placement_path, search_placements
+from .pytris import Block_Type, Board
+
+ZOBRIST_SEED = 0x5EED
+""" Seed of the random keys hashing the boards, so hashes are the same in every run """
+
+class Goal(Enum):
+    """
+    The goal of a search, see Solver.solve()
+    """
+    PERFECT_CLEAR = 0
+    """ Clear the whole board """
+    LINES = 1
+    """ Clear at least the given amount of lines """
+    SURVIVE = 2
+    """ Place the given amount of pieces without a gameover """
+
+class Solution:
+    """
+    A sequence of placements reaching the goal of a search
+    """
+    def __init__(self, placements: list[Placement], lines: int):
+        self.placements = placements
+        """ The placement of every piece in order. The path of each placement starts at the piece's spawn position on the board left by the previous placements. """
+        self.lines = lines
+        """ The amount of lines cleared by the placements """
+
+    def __len__(self):
+        return len(self.placements)
+
+class Solver:
+    """
+    Searches placement sequences of a known piece sequence reaching a Goal, by depth-first search over the placements found by movegen.\\
+    Boards are encoded as a single integer bitmask, like in enumerate_placements(), and hashed with Zobrist keys updated incrementally with every placement.
+    Many move orders lead to the same board, so every board known not to reach the goal with the remaining pieces is stored in a transposition table and never searched again.
+
+    * width, height: The board size searched on
+    """
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._keys = random.Random(ZOBRIST_SEED)
+        self.field_keys = [self._keys.getrandbits(64) for _ in range(width * height)]
+        """ The Zobrist key of every field, indexed by its bit in the board bitmask """
+        self.depth_keys: list[int] = []
+        """ The Zobrist key of every amount of pieces placed, since equal boards are only equivalent with the same remaining pieces """
+        self.table: dict[int, int] = {}
+        """ Boards that do not reach the goal, keyed by hash and depth. The value is the board's bitmask, which resolves hash collisions. """
+        self.nodes = 0
+        """ The amount of boards searched by the last search """
+        self.probes = 0
+        """ The amount of transposition table lookups of the last search """
+        self.hits = 0
+        """ The amount of transposition table lookups of the last search that skipped an already searched board """
+        self.elapsed = 0.0
+        """ The duration of the last search in seconds """
+
+    @property
+    def nodes_per_second(self) -> float:
+        """ The amount of boards searched per second by the last search """
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """ The share of transposition table lookups that skipped an already searched board """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def summary(self) -> str:
+        """
+        Returns a human readable line of the last search's statistics
+        """
+        return "%d nodes in %.3f s (%.0f nodes/s), %d table entries, %.1f%% hit rate" % (
+            self.nodes, self.elapsed, self.nodes_per_second, len(self.table), self.hit_rate * 100)
+
+    def board_hash(self, bits: int) -> int:
+        """
+        Returns the Zobrist hash of the given board bitmask, the XOR of the keys of its fields written on
+        """
+        result = 0
+        while bits:
+            low = bits & -bits
+            result ^= self.field_keys[low.bit_length() - 1]
+            bits ^= low
+        return result
+
+    def clear_lines(self, bits: int, cells: int) -> tuple[int, int]:
+        """
+        Removes the completed rows touched by the given placed fields from the board bitmask
+
+        Returns the resulting board bitmask and the amount of rows removed
+        """
+        width = self.width
+        full = (1 << width) - 1
+        lines = 0
+        top = (cells & -cells).bit_length() - 1
+        for y in range(top // width, (cells.bit_length() - 1) // width + 1):
+            if bits >> (y * width) & full == full:
+                # rows above are shifted down by one row, they occupy the lower bits
+                bits = bits >> ((y + 1) * width) << ((y + 1) * width) | (bits & ((1 << (y * width)) - 1)) << width
+                lines += 1
+        return bits, lines
+
+    def solve(self, board: Board, pieces: list, goal = Goal.PERFECT_CLEAR, amount: int = None) -> Solution:
+        """
+        Searches placements of the given pieces in order on the given board that reach the goal.\\
+        Every piece spawns where a new Block would and may use any reachable placement, including placements under overhangs.
+
+        * pieces: The known piece sequence, as block arrays or names of Block_Type, e.g. "IOT"
+        * goal: The Goal of the search. Default is Goal.PERFECT_CLEAR.
+        * amount: The height of the perfect clear in rows for Goal.PERFECT_CLEAR, the amount of lines to clear for Goal.LINES or of pieces to place for Goal.SURVIVE.\\
+        Default is None, which tries every height of perfect clear from the lowest and places all pieces for Goal.SURVIVE.
+
+        Returns the first solution found, or None if the pieces cannot reach the goal
+        """
+        if (board.width, board.height) != (self.width, self.height):
+            raise ValueError("Expected a {}x{} board, got {}x{}".format(self.width, self.height, board.width, board.height))
+        arrays = [Block_Type[piece] if isinstance(piece, str) else np.asarray(piece) for piece in pieces]
+        if goal is Goal.SURVIVE:
+            amount = len(arrays) if amount is None else amount
+            if amount > len(arrays):
+                raise ValueError("Cannot survive {} pieces with {} known pieces".format(amount, len(arrays)))
+        elif goal is Goal.LINES and amount is None:
+            raise ValueError("Goal.LINES requires an amount of lines")
+        while len(self.depth_keys) < len(arrays):
+            self.depth_keys.append(self._keys.getrandbits(64))
+        spawns = [(self.width // 2 - array.shape[1] // 2, 0) for array in arrays]
+        # the fields every piece occupies when it spawns, a board overlapping them is a gameover
+        spawn_bits = [orientations(array, self.width, self.height)[1][0] << (y * self.width + x) for array, (x, y) in zip(arrays, spawns)]
+
+        width, height = self.width, self.height
+        bits = 0
+        for y, row in enumerate(board.bitmasks()):
+            bits |= row << (y * width)
+        full = (1 << (width * height)) - 1
+        left = sum(1 << (y * width) for y in range(height))
+        """ The fields of column 0 """
+        right = left << (width - 1)
+        limit = height
+        """ The height of the perfect clear searched for, every field is placed within the bottom rows of this height """
+        chosen: list[int] = []
+
+        def above(rows: int) -> int:
+            """ Returns the bitmask of the fields above the given amount of bottom rows """
+            return (1 << ((height - rows) * width)) - 1
+
+        def fillable(bits: int, rows: int) -> bool:
+            """ Returns True, if every connected area of empty fields within the bottom rows can be filled by whole pieces """
+            empty = full & ~bits & ~above(rows)
+            while empty:
+                area = empty & -empty
+                while True:
+                    grown = (area | (area << 1 & ~left) | (area >> 1 & ~right) | area << width | area >> width) & empty
+                    if grown == area:
+                        break
+                    area = grown
+                if area.bit_count() % 4:
+                    return False
+                empty ^= area
+            return True
+
+        def reached(bits: int, depth: int, lines: int) -> bool:
+            if depth < len(arrays) and bits & spawn_bits[depth]:
+                return False
+            match goal:
+                case Goal.PERFECT_CLEAR:
+                    return depth > 0 and bits == 0
+                case Goal.LINES:
+                    return lines >= amount
+                case Goal.SURVIVE:
+                    return depth >= amount
+
+        def feasible(bits: int, depth: int, lines: int) -> bool:
+            remaining = len(arrays) - depth
+            match goal:
+                case Goal.PERFECT_CLEAR:
+                    # every empty field of the remaining rows has to be filled, by pieces that fit into the empty areas
+                    rows = limit - lines
+                    return rows * width - bits.bit_count() <= 4 * remaining and fillable(bits, rows)
+                case Goal.LINES:
+                    return lines + (bits.bit_count() + 4 * remaining) // width >= amount
+                case Goal.SURVIVE:
+                    return depth + remaining >= amount
+
+        def search(bits: int, zobrist: int, depth: int, lines: int) -> bool:
+            self.nodes += 1
+            if reached(bits, depth, lines):
+                return True
+            if depth == len(arrays) or not feasible(bits, depth, lines):
+                return False
+            key = zobrist ^ self.depth_keys[depth]
+            self.probes += 1
+            if self.table.get(key) == bits:
+                self.hits += 1
+                return False
+            outside = above(limit - lines) if goal is Goal.PERFECT_CLEAR else 0
+            placements, _, _ = search_placements(bits, width, height, arrays[depth], *spawns[depth])
+            # lowest placements first, they are the most likely to complete rows
+            for cells in sorted(placements, key=int.bit_length, reverse=True):
+                if cells & outside:
+                    continue
+                cleared, removed = self.clear_lines(bits | cells, cells)
+                # rows moved by a line clear change the keys of all fields above, so the hash is only updated incrementally without one
+                child = self.board_hash(cleared) if removed else zobrist ^ self.board_hash(cells)
+                chosen.append(cells)
+                if search(cleared, child, depth + 1, lines + removed):
+                    return True
+                chosen.pop()
+            self.table[key] = bits
+            return False
+
+        if goal is Goal.PERFECT_CLEAR:
+            # a perfect clear of a given height places exactly the fields missing in its rows, so only heights with a multiple of 4 missing fields are searched
+            stack = height - ((bits & -bits).bit_length() - 1) // width if bits else 0
+            limits = [rows for rows in ([amount] if amount is not None else range(1, height + 1))
+                      if stack <= rows <= height and 0 < rows * width - bits.bit_count() <= 4 * len(arrays) and (rows * width - bits.bit_count()) % 4 == 0]
+        else:
+            limits = [height]
+        self.nodes = self.probes = self.hits = 0
+        found = False
+        start = time.perf_counter()
+        try:
+            zobrist = self.board_hash(bits)
+            for limit in limits:
+                self.table = {}
+                if search(bits, zobrist, 0, 0):
+                    found = True
+                    break
+        finally:
+            self.elapsed = time.perf_counter() - start
+        if not found:
+            return None
+
+        # rebuild the input paths of the chosen placements
+        placements = []
+        lines = 0
+        for depth, cells in enumerate(chosen):
+            states, parents, actions = search_placements(bits, width, height, arrays[depth], *spawns[depth])
+            placements.append(placement_path(states[cells], parents, actions, orientations(arrays[depth], width, height)[0], cells, width, list(spawns[depth])))
+            bits, removed = self.clear_lines(bits | cells, cells)
+            lines += removed
+        return Solution(placements, lines)
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(prog="python -m pytris.solver", description="Searches placements of a known piece sequence on an empty board reaching a goal")
+    parser.add_argument("pieces", help="piece sequence, e.g. ILJOTSZ")
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--height", type=int, default=4)
+    parser.add_argument("--goal", choices=[goal.name.lower() for goal in Goal], default="perfect_clear")
+    parser.add_argument("--amount", type=int, help="height of the perfect clear, lines to clear or pieces to survive")
+    args = parser.parse_args(args)
+    pieces = args.pieces.upper()
+    if any(piece not in Block_Type for piece in pieces):
+        parser.error("unknown piece in: {}".format(args.pieces))
+
+    board = Board(args.width, args.height, seed=0)
+    solver = Solver(board.width, board.height)
+    solution = solver.solve(board, pieces, Goal[args.goal.upper()], args.amount)
+    if solution is None:
+        print("No solution")
+    else:
+        for piece, placement in zip(pieces, solution.placements):
+            print("{}: x={} y={} rotation={}".format(piece, placement.x, placement.y, placement.rotation))
+        print("{} lines cleared".format(solution.lines))
+    print(solver.summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import argparse
+import os
+import struct
+import time
+import numpy as np
+from .pytris import Block, Board
+
+TELEMETRY_MAGIC = b"PTTL"
+TELEMETRY_VERSION = 1
+TELEMETRY_HEADER = struct.Struct("<4sBxH")
+""" magic, version, record size in bytes """
+DEFAULT_BUFFER_RECORDS = 4096
+""" Default amount of events buffered in memory before they are appended to the file """
+
+SPAWN = 0
+""" Event of a block becoming the current block """
+LOCK = 1
+""" Event of a block being written onto the board at its final position """
+CLEAR = 2
+""" Event of completed rows being removed, with the amount of rows and points rewarded """
+GAMEOVER = 3
+""" Event of a game ending """
+EVENT_NAMES = ("spawn", "lock", "clear", "gameover")
+""" The names of the event codes """
+
+TELEMETRY_DTYPE = np.dtype([
+    ("time", "<f8"),    # seconds since the log was opened, or as given by its clock
+    ("game", "<u4"),
+    ("event", "u1"),
+    ("piece", "u1"),    # piece id and rotation of the block, see snapshot_dtype()
+    ("rotation", "u1"),
+    ("lines", "u1"),    # rows removed by a CLEAR event
+    ("x", "<i4"),
+    ("y", "<i4"),
+    ("points", "<i4"),  # points rewarded by a CLEAR event
+    ("score", "<i8"),   # score points after the event
+])
+""" The numpy structured dtype of a telemetry record """
+
+class TelemetryLog:
+    """
+    An append-only file of fixed size telemetry records, see TELEMETRY_DTYPE. Assign the log to Board.telemetry via attach() to record a game's events.\\
+    Events are collected in a preallocated record buffer, which is appended to the file in a single write once full, so recording costs no allocation per event.
+    Logs are read back with read_telemetry() as memory-mapped structured arrays.
+
+    Games recorded to the same log are numbered, continuing after the games already in the file.
+    A partially written last record, e.g. of a crashed run, is removed from the file before appending.
+    A log records one game at a time, attaching a board starts the next game.
+
+    * path: The file to append to, created if it does not exist
+    * clock: Returns the current time in seconds, e.g. the virtual time of an Engine. Default is None, which uses time.perf_counter() since the log was opened.
+    """
+    def __init__(self, path: str, clock = None, buffer_records = DEFAULT_BUFFER_RECORDS):
+        self.path = path
+        if clock is None:
+            start = time.perf_counter()
+            clock = lambda: time.perf_counter() - start
+        self.clock = clock
+        self.game = 0
+        """ The number of the current game """
+        existing = read_telemetry(path) if os.path.exists(path) and os.path.getsize(path) > 0 else None
+        if existing is not None:
+            if len(existing):
+                self.game = int(existing["game"][-1]) + 1
+            end = TELEMETRY_HEADER.size + len(existing) * TELEMETRY_DTYPE.itemsize
+            del existing
+            if os.path.getsize(path) != end:
+                os.truncate(path, end) # drops a partially written last record, so appended records stay aligned
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(TELEMETRY_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_VERSION, TELEMETRY_DTYPE.itemsize))
+        self._buffer = np.zeros(buffer_records, TELEMETRY_DTYPE)
+        self._count = 0
+        self._started = False
+        self.events = 0
+        """ The amount of events recorded """
+
+    def attach(self, board: Board):
+        """
+        Starts recording the given board's events as the next game, beginning with the spawn of its current block
+        """
+        if self._started:
+            self.game += 1
+        self._started = True
+        board.telemetry = self
+        self.on_spawn(board, board.block)
+
+    def _record(self, event: int, board: Board, block: Block = None, lines = 0, points = 0):
+        if self._count == len(self._buffer):
+            self.flush()
+        record = self._buffer[self._count]
+        self._count += 1
+        self.events += 1
+        record["time"] = self.clock()
+        record["game"] = self.game
+        record["event"] = event
+        if block is not None:
+            record["piece"], record["rotation"] = block.piece.id, block.rotation
+            record["x"], record["y"] = block.pos
+        else:
+            record["piece"] = record["rotation"] = record["x"] = record["y"] = 0
+        record["lines"] = lines
+        record["points"] = points
+        record["score"] = board.score.points
+
+    def on_spawn(self, board: Board, block: Block):
+        """
+        Records a block becoming the board's current block
+        """
+        self._record(SPAWN, board, block)
+
+    def on_lock(self, board: Board, block: Block):
+        """
+        Records a block being written onto the board at its current position
+        """
+        self._record(LOCK, board, block)
+
+    def on_clear(self, board: Board, lines: int, points: int):
+        """
+        Records completed rows being removed from the board and the points rewarded
+        """
+        self._record(CLEAR, board, lines=lines, points=points)
+
+    def on_gameover(self, board: Board):
+        """
+        Records the end of the board's game
+        """
+        self._record(GAMEOVER, board)
+
+    def flush(self):
+        """
+        Appends the buffered events to the file
+        """
+        if self._count:
+            self._file.write(self._buffer[:self._count].tobytes())
+            self._count = 0
+        self._file.flush()
+
+    def close(self):
+        """
+        Appends the buffered events and closes the file
+        """
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_telemetry(path: str) -> np.ndarray:
+    """
+    Returns the records of a telemetry log as a read-only memory-mapped structured array, see TELEMETRY_DTYPE.\\
+    Columns, e.g. records["score"], are read straight from the file without loading it. A partially written last record is ignored.
+    """
+    with open(path, "rb") as file:
+        header = file.read(TELEMETRY_HEADER.size)
+    if len(header) < TELEMETRY_HEADER.size:
+        raise ValueError("Truncated telemetry log")
+    magic, version, record_size = TELEMETRY_HEADER.unpack(header)
+    if magic != TELEMETRY_MAGIC:
+        raise ValueError("Not a telemetry log")
+    if version != TELEMETRY_VERSION or record_size != TELEMETRY_DTYPE.itemsize:
+        raise ValueError("Unsupported telemetry log version: {}".format(version))
+    count = (os.path.getsize(path) - TELEMETRY_HEADER.size) // record_size
+    if count == 0:
+        return np.zeros(0, TELEMETRY_DTYPE)
+    return np.memmap(path, TELEMETRY_DTYPE, "r", TELEMETRY_HEADER.size, (count,))
+
+def final_scores(records: np.ndarray) -> np.ndarray:
+    """
+    Returns the final score of every game in the records, indexed by game number. Games without records score 0.
+    """
+    scores = np.zeros(int(records["game"].max()) + 1 if len(records) else 0, dtype=np.int64)
+    np.maximum.at(scores, records["game"], records["score"])
+    return scores
+
+def clear_counts(records: np.ndarray) -> np.ndarray:
+    """
+    Returns how often every amount of rows was cleared at once, indexed by the amount of rows
+    """
+    return np.bincount(records["lines"][records["event"] == CLEAR], minlength=5)
+
+def pieces_per_second(records: np.ndarray) -> float:
+    """
+    Returns the amount of locked pieces per second of play, summed over all games
+    """
+    if not len(records):
+        return 0.0
+    games = records["game"]
+    times = records["time"]
+    count = int(games.max()) + 1
+    start = np.full(count, np.inf)
+    end = np.full(count, -np.inf)
+    np.minimum.at(start, games, times)
+    np.maximum.at(end, games, times)
+    played = end > start
+    duration = float((end[played] - start[played]).sum())
+    return np.count_nonzero(records["event"] == LOCK) / duration if duration > 0 else 0.0
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(prog="python -m pytris.telemetry", description="Aggregates pytris telemetry logs")
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="telemetry log")
+    args = parser.parse_args(args)
+    for path in args.paths:
+        records = read_telemetry(path)
+        scores = final_scores(records)
+        counts = np.bincount(records["event"], minlength=len(EVENT_NAMES))
+        print(path)
+        print("  events: {}, {}".format(len(records), ", ".join("{} {}".format(name, count) for name, count in zip(EVENT_NAMES, counts))))
+        if len(scores):
+            print("  games: {}, score mean {:.1f} median {:.0f} p90 {:.0f} max {}".format(
+                len(scores), scores.mean(), np.median(scores), np.percentile(scores, 90), scores.max()))
+        print("  clears: " + ", ".join("{}x {}".format(lines, count) for lines, count in enumerate(clear_counts(records)) if lines and count))
+        print("  pieces/s: {:.2f}".format(pieces_per_second(records)))
+
+if __name__ == "__main__":
+    main()
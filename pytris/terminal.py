@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import sys
+from .cast import CastRecorder, cast_size
+from .chunked import ChunkedBoard
+from .engine import Action, Engine
+from .keyboard import DEFAULT_ARR, DEFAULT_DAS, open_keyboard
+from .loop import GameLoop
+from .metrics import Metrics
+from .pytris import Board, Direction, DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT, validate_board_dimensions, validate_seed
+from .renderer import DiffRenderer, console_clear
+from .replay import Replay
+from .runner import parse_size
+from .telemetry import TelemetryLog
+
+KEY_BINDINGS = {
+    'a': Direction.LEFT, 'left': Direction.LEFT,
+    'd': Direction.RIGHT, 'right': Direction.RIGHT,
+    's': Direction.DOWN, 'down': Direction.DOWN,
+    'r': Action.ROTATE, 'up': Action.ROTATE,
+    'space': Action.HARD_DROP
+}
+""" The player action of every key, see parse_keys() for the key names """
+REPEATING_KEYS = ('a', 'd', 's', 'left', 'right', 'down')
+""" The keys auto-repeating while held """
+QUIT_KEYS = ('escape', 'ctrl+c')
+""" The keys ending the game """
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(prog="pytris", description="A little terminal tetris game")
+    parser.add_argument("--size", type=parse_size, default=(DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT), metavar="WIDTHxHEIGHT", help="board size, default is {}x{}".format(DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT))
+    parser.add_argument("--chunked", action="store_true", help="play on a chunked board, which supports very large sizes and only displays the area around the block")
+    parser.add_argument("--seed", type=int, help="seed of the random block generator")
+    parser.add_argument("--record", metavar="PATH", help="record the game to a replay file")
+    parser.add_argument("--cast", metavar="PATH", help="record the game's frames to an asciicast file")
+    parser.add_argument("--telemetry", metavar="PATH", help="append the game's events to a telemetry log")
+    parser.add_argument("--das", type=float, default=DEFAULT_DAS * 1000, metavar="MS", help="delayed auto shift, how long a move key is held before it repeats, default is %(default).0f ms")
+    parser.add_argument("--arr", type=float, default=DEFAULT_ARR * 1000, metavar="MS", help="auto repeat rate, the time between repeated moves of a held key, default is %(default).0f ms")
+    parser.add_argument("--hud", action="store_true", help="display live performance metrics, toggle in game with h")
+    args = parser.parse_args(args)
+    board_type = ChunkedBoard if args.chunked else Board
+    try:
+        validate_board_dimensions(*args.size, board_type.max_width, board_type.max_height)
+        if args.seed is not None:
+            validate_seed(args.seed)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.das < 0 or args.arr <= 0:
+        parser.error("--das must not be negative and --arr must be positive")
+
+    #os.system('')      # any call to os.system() is necessary for the renderer to work correctly
+    console_clear()             # includes os.system() call
+
+    engine = Engine(*args.size, board_type=board_type, seed=args.seed)
+    replay = Replay.record(engine) if args.record else None
+    board = engine.board
+    cast = CastRecorder(args.cast, *cast_size(board), tee=sys.stdout) if args.cast else None
+    board.renderer = DiffRenderer(cast)
+    board.metrics = Metrics()
+    board.show_hud = args.hud
+    board.show_ghost = True
+    telemetry = TelemetryLog(args.telemetry, clock=lambda: engine.time) if args.telemetry else None
+    if telemetry is not None:
+        telemetry.attach(board)
+    game = GameLoop(engine)
+
+    def redraw():
+        console_clear()
+        board.renderer.invalidate()
+        board.render()
+
+    def toggle_hud():
+        board.show_hud = not board.show_hud
+        redraw()
+
+    def on_key(key: str, created: float):
+        match key:
+            case _ if key in QUIT_KEYS:
+                game.stop()
+            case 'c':
+                redraw()
+            case 'h':
+                toggle_hud()
+            case _ if key in KEY_BINDINGS:
+                game.send(KEY_BINDINGS[key], created)
+
+    async def play():
+        # Read keys while the game runs
+        with open_keyboard(on_key, REPEATING_KEYS, args.das / 1000, args.arr / 1000):
+            await game.run()
+
+    try:
+        asyncio.run(play())
+    finally:
+        # restore the terminal and keep the recordings, also if the game was interrupted
+        board.renderer.close()
+        if cast is not None:
+            cast.close()
+        if telemetry is not None:
+            telemetry.close()
+        if replay is not None:
+            replay.finish(engine)
+            replay.save(args.record)
+    print(game.latency.summary())
+    print(board.metrics.summary())
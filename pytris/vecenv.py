@@ -0,0 +1,233 @@
+import multiprocessing
+import os
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from .batch import BATCH_ACTIONS, BatchEngine
+from .pytris import validate_board_dimensions, DEFAULT_BOARD_WIDTH, DEFAULT_BOARD_HEIGHT
+
+def _layout(n: int, width: int, height: int) -> tuple[dict[str, tuple[np.dtype, tuple, int]], int]:
+    """
+    Returns the dtype, shape and byte offset of every shared buffer of n environments, and the total size in bytes
+    """
+    buffers = {
+        "board": (np.uint8, (n, height, width)),
+        "block": (np.int16, (n, 4)),   # piece id, rotation, column, row
+        "block_next": (np.uint8, (n,)),
+        "action": (np.uint8, (n,)),
+        "reward": (np.float32, (n,)),
+        "terminated": (np.bool_, (n,)),
+        "points": (np.int64, (n,)),
+    }
+    layout = {}
+    offset = 0
+    for name, (dtype, shape) in buffers.items():
+        offset = -(-offset // 8) * 8   # align every buffer to 8 bytes
+        layout[name] = (np.dtype(dtype), shape, offset)
+        offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+    return layout, offset
+
+def _buffers(buffer: memoryview, n: int, width: int, height: int) -> dict[str, np.ndarray]:
+    """
+    Returns numpy views of every shared buffer in the given shared memory
+    """
+    layout, _ = _layout(n, width, height)
+    return {name: np.ndarray(shape, dtype, buffer, offset) for name, (dtype, shape, offset) in layout.items()}
+
+def _worker(conn, name: str, n: int, start: int, stop: int, width: int, height: int, seed: int):
+    """
+    Runs the environments start to stop on a BatchEngine whose boards live in the shared memory, serving commands received over the connection.\\
+    The initial state is published before the first command. The first reset without a seed reseeds with the given seed,
+    so it starts the same games as a reset with that seed.
+    """
+    shm = SharedMemory(name)
+    buffers = engine = block = None
+    try:
+        buffers = _buffers(shm.buf, n, width, height)
+        envs = slice(start, stop)
+        engine = BatchEngine(stop - start, width, height, seed)
+        engine.boards = buffers["board"][envs]   # the engine writes its boards straight into the shared memory
+        block = buffers["block"][envs]
+
+        def publish():
+            block[:, 0] = engine.pieces
+            block[:, 1] = engine.rotations
+            block[:, 2] = engine.x
+            block[:, 3] = engine.y
+            buffers["block_next"][envs] = engine.pieces_next
+            buffers["points"][envs] = engine.points
+
+        publish()
+        conn.send(None)
+        while True:
+            command, argument = conn.recv()
+            try:
+                match command:
+                    case "reset":
+                        if argument is None:
+                            argument = seed
+                        seed = None
+                        if argument is not None:
+                            engine.rng = np.random.default_rng(argument)
+                        engine.reset()
+                        buffers["reward"][envs] = 0
+                        buffers["terminated"][envs] = False
+                    case "step":
+                        buffers["reward"][envs] = engine.step(buffers["action"][envs])
+                        terminated = buffers["terminated"][envs]
+                        terminated[:] = engine.gameover
+                        if terminated.any():
+                            engine.reset(terminated)
+                    case "close":
+                        break
+                publish()
+                conn.send(None)
+            except Exception as error:
+                conn.send(error)
+    finally:
+        buffers = engine = block = None     # views of the shared memory must be released before closing it
+        shm.close()
+        conn.close()
+
+class SharedMemoryVecEnv:
+    """
+    A Gym-style vectorized environment of n games, stepped by worker processes.\\
+    Observations, rewards and terminations are written by the workers into preallocated shared memory, so reading a batch requires neither pickling nor copying.
+    Only a command per worker travels over a pipe each step.
+
+    Observations are a dict of numpy arrays over all environments:
+    * board: The (n, height, width) boards. Fields written on are 1, higher values mark the fields causing a gameover.
+    * block: The (n, 4) current blocks as piece id, rotation, column and row, see BatchEngine
+    * block_next: The (n,) piece ids of the upcoming blocks
+
+    The returned arrays are views of the shared memory that are overwritten by the next step, copy them to keep them.
+    Terminated environments are reset automatically, so their observation is the first one of the new game.
+    The observations hold the initial state once the environment is constructed. Call reset() before the first step to start the episodes;
+    with a seed, the first reset() starts the same games as reset(seed).
+
+    * n: The amount of environments
+    * workers: The amount of worker processes. Default is None, which uses one per core.
+    * seed: Seed of the piece generators, worker i uses seed + i. Default is None.
+    """
+    def __init__(self, n: int, workers: int = None, width = DEFAULT_BOARD_WIDTH, height = DEFAULT_BOARD_HEIGHT, seed: int = None):
+        validate_board_dimensions(width, height)
+        if not n > 0:
+            raise ValueError("Invalid amount of environments: {}".format(n))
+        self.n = n
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.action_count = len(BATCH_ACTIONS)
+        """ The amount of distinct actions, see BATCH_ACTIONS """
+
+        _, size = _layout(n, width, height)
+        self._shm = SharedMemory(create=True, size=size)
+        buffers = _buffers(self._shm.buf, n, width, height)
+        self.observations = {name: buffers[name] for name in ("board", "block", "block_next")}
+        """ The observations of every environment, written by the workers """
+        self.rewards = buffers["reward"]
+        """ The points rewarded to every environment during the most recent step """
+        self.terminated = buffers["terminated"]
+        """ True for every environment whose game ended during the most recent step """
+        self.truncated = np.zeros(n, dtype=bool)
+        """ Games are never truncated """
+        self.points = buffers["points"]
+        """ The score of every environment's current game """
+        self._actions = buffers["action"]
+
+        workers = min(n, workers or os.cpu_count() or 1)
+        bounds = np.linspace(0, n, workers + 1).astype(int).tolist()
+        self._connections = []
+        self._processes = []
+        for i in range(workers):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, name="SharedMemoryVecEnv-{}".format(i), daemon=True,
+                                              args=(child, self._shm.name, n, bounds[i], bounds[i + 1], width, height, None if seed is None else seed + i))
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        self._waiting = False
+        self._closed = False
+        self._wait()    # every worker published its initial state
+
+    def _send(self, command: str, arguments: list = None):
+        for i, connection in enumerate(self._connections):
+            connection.send((command, None if arguments is None else arguments[i]))
+        self._waiting = True
+
+    def _wait(self):
+        self._waiting = False
+        errors = [error for error in (connection.recv() for connection in self._connections) if error is not None]
+        if errors:
+            raise RuntimeError("Environment worker failed") from errors[0]
+
+    def _info(self) -> dict:
+        return {"points": self.points}
+
+    def reset(self, seed: int = None) -> tuple[dict[str, np.ndarray], dict]:
+        """
+        Starts new games in every environment
+
+        * seed: If given, reseeds the piece generators, worker i uses seed + i. Default is None.
+
+        Returns the observations and an info dict holding the current "points"
+        """
+        if self._waiting:
+            self._wait()
+        self._send("reset", None if seed is None else [seed + i for i in range(len(self._connections))])
+        self._wait()
+        return self.observations, self._info()
+
+    def step_async(self, actions: np.ndarray):
+        """
+        Starts stepping every environment with the given actions and returns immediately. Call step_wait() for the results.
+
+        * actions: An action code for every environment, as indexed by BATCH_ACTIONS
+        """
+        if self._waiting:
+            raise RuntimeError("step_wait() must be called before stepping again")
+        self._actions[:] = actions
+        self._send("step")
+
+    def step_wait(self) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Waits for the step started by step_async()
+
+        Returns the observations, rewards, terminated and truncated flags of every environment and an info dict holding the current "points"
+        """
+        if not self._waiting:
+            raise RuntimeError("step_async() must be called first")
+        self._wait()
+        return self.observations, self.rewards, self.terminated, self.truncated, self._info()
+
+    def step(self, actions: np.ndarray) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Steps every environment with the given actions, see step_async() and step_wait()
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        """
+        Stops the workers and releases the shared memory. The observations must not be used afterwards.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._waiting:
+            self._wait()
+        for connection in self._connections:
+            connection.send(("close", None))
+        for process in self._processes:
+            process.join()
+        for connection in self._connections:
+            connection.close()
+        self.observations = self.rewards = self.terminated = self.points = self._actions = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
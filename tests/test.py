@@ -1,4 +1,5 @@
 import copy
+import random
 import unittest
 import pytris
 import numpy as np
@@ -26,6 +27,15 @@ class TestBoard(unittest.TestCase):
         self.assertRaises(TypeError, pytris.Board, 10, 'test')
         self.assertRaises(TypeError, pytris.Board, 10, True)
         self.assertRaises(TypeError, pytris.Board, 10, 10.5)
+
+    def test_constructor_seed(self):
+        """
+        Test seeds outside of the range stored by replays and snapshots
+        """
+        self.assertRaises(ValueError, pytris.Board, 10, 20, -1)
+        self.assertRaises(ValueError, pytris.Board, 10, 20, 1 << pytris.SEED_BITS)
+        self.assertRaises(TypeError, pytris.Board, 10, 20, 1.5)
+        self.assertEqual(pytris.Board(10, 20, (1 << pytris.SEED_BITS) - 1).seed, (1 << pytris.SEED_BITS) - 1)
     
     def test_constructor(self):
         """
@@ -36,7 +46,7 @@ class TestBoard(unittest.TestCase):
             self.assertIsInstance(board.height, int)
             self.assertIsInstance(board.array, pytris.np.ndarray)
             self.assertIsInstance(board.block_next, pytris.Block)
-            self.assertIsInstance(board.block.gravity, pytris.RepeatedTimer)
+            self.assertIsInstance(board.block.gravity, float)
             self.assertIsInstance(board.score, pytris.Score)
 
         # empty width
@@ -75,16 +85,15 @@ class TestBoard(unittest.TestCase):
         board.start()
         self.assertFalse(board.pause_renderer)
         self.assertFalse(board.gameover)
-        self.assertTrue(board.block.gravity.state is pytris.RepeatedTimer.State.RUNNING)
+        self.assertFalse(board.block.frozen)
         board.pause()
         self.assertTrue(board.pause_renderer)
         self.assertFalse(board.gameover)
-        self.assertTrue(board.block.gravity.state is pytris.RepeatedTimer.State.STOPPED)
+        self.assertTrue(board.block.frozen)
         board.resume()
         self.assertFalse(board.pause_renderer)
         self.assertFalse(board.gameover)
-        self.assertTrue(board.block.gravity.state is pytris.RepeatedTimer.State.RUNNING)
-        board.pause() # so gravity doesn't hang the test
+        self.assertFalse(board.block.frozen)
 
     def test_drop_row_dimension(self):
         """
@@ -129,6 +138,100 @@ class TestBoard(unittest.TestCase):
         for i in range(1, board.height-1):
             self.assertTrue(np.array_equal(board.array[i], array_initial[i-1]))   # every row after the first must be equal to the one previously above it
 
+    def test_finish_completed_rows(self):
+        """
+        Test if completed rows that are not adjacent are removed at once and the rows above are "pulled down"
+        """
+        board = pytris.Board(4, 6)
+        array = generate_random_board(board.width, board.height)
+        array[:, 0] = 0
+        array[2] = 1
+        array[4] = 1
+        board.array = array
+
+        self.assertEqual(board.finish_completed_rows(1, 5), 2)
+        self.assertEqual(board.score.points, 100)
+        self.assertTrue(np.all(board.array[:2] == 0))
+        self.assertTrue(np.array_equal(board.array[2:], array[[0, 1, 3, 5]]))
+        board.place(pytris.Block_Type["O"], 0, 0)
+        self.assertTrue(np.array_equal(board.array[:2, :2], np.ones((2, 2))))
+
+    def test_array_read_only(self):
+        """
+        Test if writes to the board's array raise instead of being lost, and the array is only rebuilt after the board changed
+        """
+        for board_type in (pytris.Board, pytris.BitBoard, pytris.ChunkedBoard):
+            board = board_type(10, 20)
+            array = board.array
+            with self.assertRaises(ValueError):
+                array[19, 0] = 1
+            board.place(np.ones((1, 2)), 0, 19)
+            self.assertEqual(board.array[19, :3].tolist(), [1, 1, 0])
+            self.assertEqual(array[19, 0], 0)
+        board = pytris.Board(10, 20)
+        array = board.array
+        self.assertIs(board.array, array)
+        board.drop_row(-1)
+        self.assertIsNot(board.array, array)
+        self.assertFalse(board.array.flags.writeable)
+
+    def test_heights_row_fill(self):
+        """
+        Test if the column heights and row fill counts match the board's contents throughout games with hard drops on both board types
+        """
+        actions = [pytris.Direction.LEFT, pytris.Direction.RIGHT, pytris.Direction.DOWN, pytris.Action.ROTATE, pytris.Action.HARD_DROP, None]
+        rows = 0
+        for board_type in (pytris.Board, pytris.BitBoard):
+            for seed in range(8):
+                rng = random.Random(seed)
+                engine = pytris.Engine(4, 12, board_type = board_type, seed = seed)
+                board = engine.board
+                while not engine.gameover:
+                    engine.step(rng.choice(actions))
+                    array = board.array
+                    filled = array != 0
+                    heights = [board.height - int(np.argmax(column)) if column.any() else 0 for column in filled.T]
+                    self.assertEqual(board.heights, heights)
+                    for y in range(board.height):
+                        self.assertEqual(board.is_row_complete(y), bool(np.all(array[y] == 1)))
+                rows += board.score.rows
+        self.assertGreater(rows, 0)
+
+    def test_drop_distance(self):
+        """
+        Test if the drop distance equals moving the block down row by row, including blocks under overhangs
+        """
+        board = pytris.Board(10, 12)
+        for _ in range(20):
+            array = generate_random_board(10, 12)
+            array[:3] = 0
+            array[5:7] = 0
+            board.array = array
+            for block_array in pytris.Block_Type.values():
+                for x in range(10 - block_array.shape[1] + 1):
+                    for y in (0, 5):
+                        if board.collides(block_array, x, y):
+                            continue
+                        distance = 0
+                        while not board.collides(block_array, x, y + distance + 1):
+                            distance += 1
+                        self.assertEqual(board.drop_distance(block_array, x, y), distance)
+
+    def test_hard_drop_ghost(self):
+        """
+        Test if a hard drop finalizes the block at its ghost position and the ghost is displayed
+        """
+        board = pytris.Board(6, 10, seed = 1)
+        board.block.unfreeze()
+        block = board.block
+        x, y = block.ghost_position()
+        self.assertEqual(y, board.height - block.height)
+        board.show_ghost = True
+        self.assertIn(".", "".join(board.frame()[-board.height:]))
+        block.hard_drop()
+        self.assertIsNot(board.block, block)
+        self.assertTrue(np.array_equal(board.array[y:y + block.height, x:x + block.width], block.array))
+
 class TestBlock(unittest.TestCase):
     pytris.Board.render = lambda self: None  # disable renderer
     def test_constructor(self):
@@ -137,5 +240,32 @@ class TestBlock(unittest.TestCase):
         """
         pass
 
+    def test_piece_catalogue(self):
+        """
+        Test if every orientation of the piece catalogue matches the rotated block type and blocks share its arrays
+        """
+        for piece, (name, array) in zip(pytris.PIECES, pytris.Block_Type.items()):
+            for rotation in range(4):
+                rotated = np.rot90(array, rotation)
+                self.assertTrue(np.array_equal(piece.arrays[rotation], rotated))
+                self.assertEqual((piece.heights[rotation], piece.widths[rotation]), rotated.shape)
+                self.assertEqual(piece.row_masks[rotation], tuple(int(row @ (1 << np.arange(rotated.shape[1]))) for row in rotated))
+                self.assertEqual(piece.skirts[rotation], tuple(rotated.shape[0] - 1 - np.argmax(rotated[::-1] != 0, axis=0)))
+                self.assertEqual(pytris.find_orientation(piece.arrays[rotation]), (piece, rotation))
+            self.assertEqual(pytris.find_orientation(array), (piece, 0))
+        self.assertIsNone(pytris.find_orientation(np.ones((2, 3))))
+
+        board = pytris.Board(10, 20, seed = 0)
+        block = pytris.Block(pytris.Block_Type["T"], board)
+        self.assertEqual((block.piece.name, block.rotation, block.pos), ("T", 0, [4, 0]))
+        block.rotate()
+        self.assertEqual(block.rotation, 1)
+        self.assertIs(block.array, pytris.PIECES[block.piece.id].arrays[1])
+        self.assertFalse(block.array.flags.writeable)
+        with self.assertRaises(AttributeError):
+            block.shape = None # blocks are records of fixed fields
+        with self.assertRaises(ValueError):
+            block.array = np.ones((2, 3))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,66 @@
+import itertools
+import random
+import unittest
+from unittest import mock
+import pytris
+import numpy as np
+
+class TestBatchEngine(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_constructor(self):
+        """
+        Test BatchEngine constructor
+        """
+        self.assertRaises(ValueError, pytris.BatchEngine, 0)
+        self.assertRaises(ValueError, pytris.BatchEngine, 4, 2, 10)
+        self.assertRaises(TypeError, pytris.BatchEngine, 4, 10.5, 10)
+        batch = pytris.BatchEngine(4, 12, 16, seed = 0)
+        self.assertEqual(batch.boards.shape, (4, 16, 12))
+        self.assertEqual(batch.width, 12)
+        self.assertEqual(batch.height, 16)
+        self.assertFalse(np.any(batch.gameover))
+
+    def test_line_clear(self):
+        """
+        Test if completed rows are removed and scored on every board independently
+        """
+        batch = pytris.BatchEngine(2, seed = 0)
+        batch.boards[0, -1, :-1] = 1
+        batch.boards[1, -2:, :-1] = 1
+        batch.boards[1, -3, 0] = 1
+        I = pytris.PIECE_NAMES.index("I")
+        batch.pieces[:] = I
+        batch.rotations[:] = 1  # vertical
+        batch.x[:] = batch.width - 1
+        batch.y[:] = batch.height - 4
+        points = batch.step([pytris.DOWN, pytris.DOWN])
+        self.assertEqual(list(points), [40, 100])
+        self.assertEqual(list(batch.lines), [1, 2])
+        self.assertTrue(np.all(batch.boards[0, -1] == [0] * (batch.width - 1) + [1]))
+        self.assertTrue(np.all(batch.boards[1, -1] == [1] + [0] * (batch.width - 2) + [1]))
+
+    def test_matches_engine(self):
+        """
+        Test if a batch of one board plays like an Engine given the same pieces and actions
+        """
+        names = "IJLOSTZ"
+        batch = pytris.BatchEngine(1, seed = 0)
+        pieces = itertools.cycle(pytris.PIECE_NAMES.index(name) for name in names)
+        batch._random_pieces = lambda n: np.array([next(pieces) for _ in range(n)])
+        batch.reset()
+
+        block_types = itertools.cycle(pytris.Block_Type[name] for name in names)
+        with mock.patch("pytris.pytris.get_random_block_type", lambda random_generator = None: next(block_types)):
+            engine = pytris.Engine()
+
+            random.seed(2)
+            while not engine.gameover:
+                code = random.choice(range(len(pytris.BATCH_ACTIONS)))
+                engine.apply(pytris.BATCH_ACTIONS[code])
+                batch.step([code], gravity = False)
+                self.assertTrue(np.array_equal(engine.board.array, batch.boards[0]))
+                self.assertEqual(engine.board.score.points, batch.points[0])
+            self.assertTrue(batch.gameover[0])
+
+if __name__ == '__main__':
+    unittest.main()
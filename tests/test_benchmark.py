@@ -0,0 +1,43 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import pytris
+from pytris import benchmark
+
+class TestBenchmark(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_run_benchmarks(self):
+        """
+        Test if every benchmark runs on every given board size
+        """
+        results = benchmark.run_benchmarks(sizes=[(6, 12), (10, 20)], repeat=1, min_time=0)
+        self.assertEqual(len(results), 2 * len(benchmark.BENCHMARKS))
+        self.assertIn("finish_completed_rows[6x12]", results)
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+        self.assertRaises(ValueError, benchmark.run_benchmarks, ["unknown"])
+
+    def test_compare(self):
+        """
+        Test if only slowdowns beyond the threshold are flagged as regressions
+        """
+        baseline = {"a": 1.0, "b": 1.0, "c": 1.0}
+        results = {"a": 1.05, "b": 1.2, "d": 5.0}
+        self.assertEqual(benchmark.compare(results, baseline, 0.1), [("a", 1.0, 1.05, False), ("b", 1.0, 1.2, True)])
+
+    def test_baseline(self):
+        """
+        Test if a saved baseline is loaded unchanged and a comparison against a faster baseline fails
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            results = {"move[10x20]": 1e-9}
+            benchmark.save_baseline(path, results)
+            self.assertEqual(benchmark.load_baseline(path), results)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(benchmark.main(["move", "--size", "10x20", "--repeat", "1", "--min-time", "0", "--compare", path]), 1)
+            self.assertIn("REGRESSION", output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
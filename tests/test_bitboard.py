@@ -0,0 +1,88 @@
+import random
+import unittest
+import pytris
+import numpy as np
+
+def generate_random_board(width, height):
+    return np.random.randint(0,2,(height,width))
+
+class TestBitBoard(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_array_roundtrip(self):
+        """
+        Test if assigning an array to a BitBoard and reading it back keeps the board's contents
+        """
+        board = pytris.BitBoard(10, 12)
+        array = generate_random_board(10, 12)
+        board.array = array
+        self.assertEqual(board.width, 10)
+        self.assertEqual(board.height, 12)
+        self.assertTrue(np.array_equal(board.array, array))
+
+    def test_collides_place(self):
+        """
+        Test collision and placement against the numpy based Board
+        """
+        board = pytris.Board(10, 12)
+        bitboard = pytris.BitBoard(10, 12)
+        array = generate_random_board(10, 12)
+        array[:4] = 0
+        board.array = array.astype(float)
+        bitboard.array = array
+        for block_array in pytris.Block_Type.values():
+            for rotation in range(4):
+                block_array = np.rot90(block_array)
+                for y in range(-1, 13):
+                    for x in range(-1, 11):
+                        self.assertEqual(bitboard.collides(block_array, x, y), board.collides(block_array, x, y))
+        block_array = pytris.Block_Type["T"]
+        board.place(block_array, 3, 1)
+        bitboard.place(block_array, 3, 1)
+        self.assertTrue(np.array_equal(bitboard.array, board.array))
+
+    def test_drop_row(self):
+        """
+        Test if dropping a row removes the row and "pulls down" the rows above
+        """
+        board = pytris.BitBoard()
+        board.array = generate_random_board(board.width, board.height)
+        array_initial = board.array
+
+        board.drop_row(-1)  # drop bottom row
+
+        self.assertEqual(board.height, array_initial.shape[0])
+        self.assertTrue(np.all(board.array[0] == 0))
+        self.assertTrue(np.array_equal(board.array[1:], array_initial[:-1]))
+        self.assertRaises(IndexError, board.drop_row, board.height)
+
+    def test_clear_rows(self):
+        """
+        Test if clearing several rows at once matches the numpy based Board
+        """
+        board = pytris.Board(10, 12)
+        bitboard = pytris.BitBoard(10, 12)
+        array = generate_random_board(10, 12)
+        board.array = array
+        bitboard.array = array
+        for indices in ([3, 7, -1], [0], [11, 10, 9, 8]):
+            board.clear_rows(indices)
+            bitboard.clear_rows(indices)
+            self.assertTrue(np.array_equal(bitboard.array, board.array))
+
+    def test_identical_games(self):
+        """
+        Test if the same game played on a Board and a BitBoard ends in the same state
+        """
+        actions = [pytris.Direction.LEFT, pytris.Direction.RIGHT, pytris.Direction.DOWN, pytris.Action.ROTATE, None]
+        results = []
+        for board_type in (pytris.Board, pytris.BitBoard):
+            random.seed(1)
+            engine = pytris.Engine(board_type = board_type, seed = 1)
+            while not engine.gameover:
+                engine.step(random.choice(actions))
+            results.append((engine.ticks, engine.board.score.points, engine.board.array))
+        self.assertEqual(results[0][:2], results[1][:2])
+        self.assertTrue(np.array_equal(results[0][2], results[1][2]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+import pytris
+from pytris.cast import CAST_VERSION, CastRecorder, record_replay
+
+def record_game(seed: int) -> tuple[pytris.Engine, pytris.Replay]:
+    engine = pytris.Engine(seed = seed)
+    replay = pytris.Replay.record(engine)
+    actions = random.Random(seed)
+    while not engine.gameover:
+        engine.step(actions.choice([pytris.Direction.LEFT, pytris.Direction.RIGHT, pytris.Action.ROTATE, None, None]))
+    replay.finish(engine)
+    return engine, replay
+
+class TestCast(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.cast")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_cast(self) -> tuple[dict, list]:
+        with open(self.path, encoding="utf-8") as file:
+            header, *events = [json.loads(line) for line in file]
+        return header, events
+
+    def test_recorder(self):
+        """
+        Test if writes are recorded with their time and passed on to the tee stream
+        """
+        now = 5.0
+        tee = io.StringIO()
+        with CastRecorder(self.path, 80, 24, clock=lambda: now, tee=tee, title="test") as recorder:
+            recorder.write("a")
+            now = 5.5
+            recorder.write("")
+            recorder.write("b\n")
+            recorder.flush()
+        self.assertEqual(tee.getvalue(), "ab\n")
+        self.assertEqual(recorder.events, 2)
+        self.assertRaises(ValueError, recorder.write, "c")
+        header, events = self.read_cast()
+        self.assertEqual((header["version"], header["width"], header["height"], header["title"]), (CAST_VERSION, 80, 24, "test"))
+        self.assertEqual(events, [[0, "o", "a"], [0.5, "o", "b\n"]])
+
+    def test_record_replay(self):
+        """
+        Test if a replay is recorded headless on its virtual clock, ending with the gameover frame
+        """
+        engine, replay = record_game(3)
+        replayed = record_replay(replay, self.path)
+        self.assertTrue(replayed.gameover)
+        header, events = self.read_cast()
+        self.assertEqual(header["height"], engine.board.height + 10)
+        times = [event[0] for event in events]
+        self.assertEqual(times, sorted(times))
+        self.assertLessEqual(times[-1], engine.time)
+        self.assertGreater(len(events), 10)
+        self.assertLess(len(events), engine.ticks + len(replay.events) + 2)
+        self.assertTrue(events[0][2].startswith("\x1B[?25l\x1B[2J"))  # the first frame is drawn completely
+        self.assertIn("GAME OVER", "".join(event[2] for event in events))
+
+if __name__ == '__main__':
+    unittest.main()
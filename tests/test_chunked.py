@@ -0,0 +1,81 @@
+import random
+import unittest
+import pytris
+import numpy as np
+
+class TestChunkedBoard(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_storage(self):
+        """
+        Test collision, placement, row clearing and bitmasks across chunk borders
+        """
+        width = pytris.CHUNK_SIZE + 6
+        chunked = pytris.ChunkedBoard(width, 12)
+        array = np.random.default_rng(0).integers(0, 2, (12, width))
+        array[:4] = 0
+        array[-2:] = 1
+        chunked.array = array
+        self.assertTrue(np.array_equal(chunked.array, array))
+        self.assertEqual(chunked.bitmasks(), [int("".join(map(str, row[::-1])), 2) for row in array])
+        self.assertEqual(chunked.heights, [chunked.column_height(x) for x in range(width)])
+        for x in range(pytris.CHUNK_SIZE - 4, pytris.CHUNK_SIZE + 2):
+            for y in range(-1, 10):
+                expected = not (0 <= y <= 9 and 0 <= x <= width - 2) or bool(np.any(array[y:y + 2, x:x + 2] + 1 > 1))
+                self.assertEqual(chunked.collides(np.ones((2, 2)), x, y), expected)
+        chunked.place(np.ones((2, 2)), pytris.CHUNK_SIZE - 1, 0)
+        array[0:2, pytris.CHUNK_SIZE - 1:pytris.CHUNK_SIZE + 1] += 1
+        self.assertTrue(np.array_equal(chunked.region(pytris.CHUNK_SIZE - 3, 0, 5, 3), array[0:3, pytris.CHUNK_SIZE - 3:pytris.CHUNK_SIZE + 2]))
+        self.assertTrue(chunked.is_row_complete(-1))
+        chunked.clear_rows([-1, -2])
+        self.assertTrue(np.array_equal(chunked.array, np.vstack([np.zeros((2, width)), array[:-2]])))
+        self.assertEqual(chunked.heights, [chunked.column_height(x) for x in range(width)])
+
+    def test_sparse(self):
+        """
+        Test if a very large board only stores the chunks written on
+        """
+        board = pytris.ChunkedBoard(pytris.MAX_CHUNKED_BOARD_DIMENSION, pytris.MAX_CHUNKED_BOARD_DIMENSION)
+        self.assertEqual(board.chunk_count, 0)
+        self.assertRaises(ValueError, pytris.ChunkedBoard, pytris.MAX_CHUNKED_BOARD_DIMENSION + 1, 10)
+        block = board.block
+        x = block.pos[0]
+        block.hard_drop()
+        self.assertIsNot(board.block, block)
+        self.assertEqual(max(board.heights[x:x + block.width]), block.height)
+        self.assertLessEqual(board.chunk_count, 8)
+        self.assertRaises(ValueError, pytris.take_snapshot, board)
+
+    def test_identical_games(self):
+        """
+        Test if the same game played on a Board and a ChunkedBoard ends in the same state
+        """
+        actions = [pytris.Direction.LEFT, pytris.Direction.RIGHT, pytris.Direction.DOWN, pytris.Action.ROTATE, pytris.Action.HARD_DROP, None]
+        results = []
+        for board_type in (pytris.Board, pytris.ChunkedBoard):
+            rng = random.Random(1)
+            engine = pytris.Engine(board_type = board_type, seed = 1)
+            while not engine.gameover:
+                engine.step(rng.choice(actions))
+            results.append((engine.ticks, engine.board.score.points, pytris.state_checksum(engine), engine.board.array))
+        self.assertEqual(results[0][:3], results[1][:3])
+        self.assertTrue(np.array_equal(results[0][3], results[1][3]))
+
+    def test_viewport(self):
+        """
+        Test if only the viewport around the current block is displayed
+        """
+        board = pytris.ChunkedBoard(1000, 1000)
+        board.viewport = (20, 10)
+        board.show_ghost = True
+        lines = board.frame()
+        self.assertEqual(len(lines), 2 + 6 + 10)
+        for line in lines[-10:]:
+            self.assertEqual(len(line), 20 + 2)
+        self.assertIn("X", lines[-10])  # the block at the top row is displayed
+        self.assertEqual(board.viewport_area(), (490, 0, 20, 10))
+        board.block.pos[1] = 500
+        self.assertEqual(board.viewport_area()[1], 500 + board.block.height // 2 - 5)
+        self.assertEqual(len(board.frame()), 2 + 6 + 10)
+
+if __name__ == '__main__':
+    unittest.main()
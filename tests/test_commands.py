@@ -0,0 +1,70 @@
+import asyncio
+import io
+import unittest
+import pytris
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_percentile(self):
+        """
+        Test nearest-rank percentiles
+        """
+        values = list(range(1, 101))
+        self.assertEqual(pytris.percentile(values, 50), 50)
+        self.assertEqual(pytris.percentile(values, 99), 99)
+        self.assertEqual(pytris.percentile(values, 100), 100)
+        self.assertEqual(pytris.percentile(values, 0), 1)
+        self.assertEqual(pytris.percentile([7], 90), 7)
+
+    def test_percentiles(self):
+        """
+        Test if applied and rendered latencies are measured from the command's creation
+        """
+        tracker = pytris.LatencyTracker()
+        self.assertEqual(tracker.percentiles(), {"applied": {}, "rendered": {}})
+        commands = [pytris.Command(pytris.Direction.LEFT, created = 0.0) for _ in range(4)]
+        for command in commands:
+            tracker.applied(command)
+        tracker.rendered(commands)
+        for command in commands:
+            self.assertGreaterEqual(command.rendered, command.applied)
+        percentiles = tracker.percentiles((50,))
+        self.assertGreater(percentiles["rendered"][50], 0)
+        self.assertGreaterEqual(percentiles["rendered"][50], percentiles["applied"][50])
+        self.assertIn("p50", tracker.summary())
+
+    def test_capacity(self):
+        """
+        Test if only the most recent latencies are kept
+        """
+        tracker = pytris.LatencyTracker(capacity = 3)
+        for _ in range(5):
+            tracker.applied(pytris.Command(None))
+        self.assertEqual(len(tracker.applied_latencies), 3)
+
+class TestGameLoopLatency(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_game_loop_latency(self):
+        """
+        Test if commands sent to a game loop are applied in order and measured until rendered
+        """
+        engine = pytris.Engine()
+        engine.board.renderer = pytris.TerminalRenderer(io.StringIO())
+        game = pytris.GameLoop(engine)
+        x = engine.board.block.pos[0]
+
+        async def play():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.01, game.send, pytris.Direction.LEFT)
+            loop.call_later(0.01, game.send, pytris.Direction.LEFT)
+            loop.call_later(0.01, game.send, pytris.Direction.RIGHT)
+            loop.call_later(0.02, game.render_scheduler.request)
+            loop.call_later(0.1, game.stop)
+            await game.run()
+
+        asyncio.run(play())
+        self.assertEqual(engine.board.block.pos[0], x - 1)
+        self.assertEqual(len(game.latency.applied_latencies), 3)
+        self.assertEqual(len(game.latency.rendered_latencies), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import subprocess
+import sys
+import threading
+import unittest
+import pytris
+
+class TestEngine(unittest.TestCase):
+    def test_constructor_tick_rate(self):
+        """
+        Test invalid tick rates for Engine
+        """
+        self.assertRaises(ValueError, pytris.Engine, tick_rate = 0)
+        self.assertRaises(ValueError, pytris.Engine, tick_rate = -60)
+
+    def test_gravity(self):
+        """
+        Test if gravity moves the block down one row per (tick rate / gravity) ticks of virtual time
+        """
+        engine = pytris.Engine(tick_rate = 10)
+        block = engine.board.block
+        y = block.pos[1]
+        for _ in range(9):
+            engine.step()
+        self.assertEqual(block.pos[1], y)
+        engine.step()
+        self.assertEqual(block.pos[1], y + 1)
+        self.assertAlmostEqual(engine.time, 1)
+
+    def test_frozen(self):
+        """
+        Test if gravity is not applied to a frozen block
+        """
+        engine = pytris.Engine(tick_rate = 1)
+        engine.board.block.freeze()
+        y = engine.board.block.pos[1]
+        for _ in range(5):
+            engine.step()
+        self.assertEqual(engine.board.block.pos[1], y)
+
+    def test_step_actions(self):
+        """
+        Test if step() applies moves and rotations to the current block
+        """
+        engine = pytris.Engine(tick_rate = 1000)
+        block = engine.board.block
+        x = block.pos[0]
+        engine.step(pytris.Direction.LEFT)
+        self.assertEqual(block.pos[0], x - 1)
+        engine.step(pytris.Direction.RIGHT)
+        self.assertEqual(block.pos[0], x)
+        shape = block.array.shape
+        engine.step(pytris.Action.ROTATE)
+        self.assertEqual(block.array.shape, shape[::-1])
+        engine.step(pytris.Action.NOOP)
+        self.assertRaises(ValueError, engine.step, "left")
+
+    def test_headless_game(self):
+        """
+        Test if a full game can be simulated headless without spawning threads
+        """
+        threads = threading.active_count()
+        engine = pytris.Engine()
+        pieces = 0
+        block = engine.board.block
+        while not engine.gameover:
+            engine.step(pytris.Direction.DOWN)
+            if engine.board.block is not block:
+                block = engine.board.block
+                pieces += 1
+        self.assertGreater(pieces, 0)
+        self.assertEqual(threading.active_count(), threads)
+        self.assertTrue(engine.board.pause_renderer)
+
+    def test_lazy_import(self):
+        """
+        Test if the engine can be imported without loading the terminal frontend, pynput or asyncio
+        """
+        code = "import sys, pytris; pytris.Engine(4, 6).step(pytris.Action.ROTATE); print(sorted({'pynput', 'asyncio', 'pytris.terminal'} & set(sys.modules)))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+        self.assertIn("Engine", dir(pytris))
+        self.assertIsInstance(pytris.RepeatedTimer, type)
+        self.assertRaises(AttributeError, getattr, pytris, "missing")
+
+if __name__ == '__main__':
+    unittest.main()
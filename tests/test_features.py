@@ -0,0 +1,50 @@
+import unittest
+import pytris
+import numpy as np
+from pytris.runner import board_features
+
+class TestFeatures(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_evaluate_drops(self):
+        """
+        Test if every candidate lands on the stack and its features match the features of the board after placing it
+        """
+        rng = np.random.default_rng(0)
+        for seed in range(20):
+            board = pytris.Board(10, 20, seed = seed)
+            array = np.zeros((20, 10))
+            array[14:] = rng.integers(0, 2, (6, 10))
+            array[19, :9] = 1
+            board.array = array
+            for name in pytris.Block_Type:
+                candidates, features = pytris.evaluate_drops(board, name)
+                self.assertEqual(features.shape, (len(candidates), len(pytris.PLACEMENT_FEATURES)))
+                self.assertEqual(len({tuple(candidate) for candidate in candidates}), len(candidates))
+                for (rotation, x, y), row in zip(candidates, features):
+                    block = np.rot90(pytris.Block_Type[name], rotation)
+                    self.assertFalse(board.collides(block, x, y))
+                    self.assertTrue(board.collides(block, x, y + 1))
+                    placed = board.array.copy()
+                    placed[y:y + block.shape[0], x:x + block.shape[1]] += block.astype(np.uint8)
+                    rows = ((placed != 0) @ (1 << np.arange(10))).tolist()
+                    self.assertEqual(board_features(rows, 10), tuple(row[[0, 1, 2, 4]]))
+
+    def test_wells_distinct_orientations(self):
+        """
+        Test the wells feature and that equal orientations are only evaluated once
+        """
+        stack = np.zeros((1, 6, 4))
+        stack[0, 2:, 0] = 1
+        stack[0, 4:, 2] = 1
+        # column 1 is 2 deep between columns 0 and 2, column 3 is 2 deep next to the wall
+        self.assertEqual(pytris.stack_features(stack).tolist(), [[6, 0, 8, 4, 0]])
+        board = pytris.Board(10, 20)
+        self.assertEqual(len(pytris.evaluate_drops(board, "O")[0]), 9)
+        self.assertEqual(len(pytris.evaluate_drops(board, "I")[0]), 7 + 10)
+        self.assertEqual(len(pytris.evaluate_drops(board, np.rot90(pytris.Block_Type["S"]))[0]), 8 + 9)
+        self.assertRaises(ValueError, pytris.evaluate_drops, board, np.ones((2, 3)))
+        board.array = np.ones((20, 10)) - np.eye(20, 10)
+        self.assertEqual(len(pytris.evaluate_drops(board, "T")[0]), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import io
+import os
+import time
+import unittest
+from pytris.keyboard import ESCAPE_TIMEOUT, PRESS, RELEASE, REPEAT, KeyRepeat, TerminalKeyboard, parse_keys, split_incomplete
+
+class TestKeyboard(unittest.TestCase):
+    def test_parse_keys(self):
+        """
+        Test if plain characters, arrow keys and kitty keyboard protocol escape codes are decoded
+        """
+        self.assertEqual(parse_keys("aD \x03\x1b"), ([("a", PRESS), ("d", PRESS), ("space", PRESS), ("ctrl+c", PRESS), ("escape", PRESS)], False))
+        self.assertEqual(parse_keys("\x1b[D\x1bOC"), ([("left", PRESS), ("right", PRESS)], False))
+        self.assertEqual(parse_keys("\x1b[?11u\x1b[97u\x1b[97;1:2u\x1b[97;1:3u\x1b[1;1:3D\x1b[99;5u\x1b[27u"), (
+            [("a", PRESS), ("a", REPEAT), ("a", RELEASE), ("left", RELEASE), ("ctrl+c", PRESS), ("escape", PRESS)], True))
+        self.assertEqual(split_incomplete("a\x1b[D\x1b[1;1:"), ("a\x1b[D", "\x1b[1;1:"))
+        self.assertEqual(split_incomplete("a\x1b"), ("a", "\x1b"))
+        self.assertEqual(split_incomplete("\x1bO"), ("", "\x1bO"))
+        self.assertEqual(split_incomplete("\x1b[D"), ("\x1b[D", ""))
+
+    def test_repeat_releases(self):
+        """
+        Test if a held key auto-repeats after the delayed auto shift at the auto repeat rate until it is released
+        """
+        keys = KeyRepeat(["left", "right"], das=0.1, arr=0.02)
+        keys.releases = True
+        self.assertTrue(keys.press("left", 0.0))
+        self.assertFalse(keys.press("left", 0.05)) # repeated press events of a held key
+        self.assertEqual(keys.deadline(), 0.1)
+        self.assertEqual(keys.poll(0.09), [])
+        self.assertEqual(keys.poll(0.1), ["left"])
+        self.assertAlmostEqual(keys.deadline(), 0.12)
+        # the most recently pressed key repeats
+        self.assertTrue(keys.press("right", 0.13))
+        self.assertAlmostEqual(keys.deadline(), 0.23)
+        keys.release("right", 0.15)
+        self.assertEqual(keys.poll(0.15), ["left"])
+        keys.release("left", 0.16)
+        self.assertIsNone(keys.deadline())
+        self.assertTrue(keys.press("r", 0.2))
+        self.assertIsNone(keys.deadline()) # not a repeating key
+
+    def test_repeat_timeout(self):
+        """
+        Test if held keys are detected by the terminal's key repeat, if releases are not reported
+        """
+        keys = KeyRepeat(["left"], das=0.1, arr=0.02, release_timeout=0.05)
+        self.assertTrue(keys.press("left", 0.0))
+        self.assertEqual(keys.poll(0.06), []) # tapped
+        self.assertNotIn("left", keys.held)
+        # the terminal's first repeat after its repeat delay, then its repeat interval
+        self.assertTrue(keys.press("left", 0.3))
+        self.assertFalse(keys.press("left", 0.33))
+        self.assertEqual(keys.poll(0.33), ["left"])
+        self.assertFalse(keys.press("left", 0.36))
+        self.assertEqual(keys.poll(0.36), ["left"])
+        # input stops once the key is released
+        self.assertEqual(keys.poll(0.42), [])
+        self.assertNotIn("left", keys.held)
+        # input of another key ends the repetition
+        self.assertTrue(keys.press("left", 0.5))
+        self.assertTrue(keys.press("r", 0.51))
+        self.assertTrue(keys.press("left", 0.52))
+        self.assertEqual(list(keys.held), ["left"])
+
+    def test_terminal(self):
+        """
+        Test if keys typed into a terminal are read on press, auto-repeat and restore the terminal afterwards
+        """
+        import termios
+        master, slave = os.openpty()
+        keys = []
+
+        async def type_keys():
+            output = io.StringIO()
+            attributes = termios.tcgetattr(slave)
+            with TerminalKeyboard(lambda key, created: keys.append((key, time.perf_counter() - created)), ["left"], das=0.05, arr=0.01, fd=slave, output=output):
+                self.assertFalse(termios.tcgetattr(slave)[3] & termios.ICANON)
+                os.write(master, b"\x1b[?11u\x1b[D")
+                await asyncio.sleep(0.1)
+                os.write(master, b"\x1b[1;1:3Dr")
+                await asyncio.sleep(0.05)
+            self.assertEqual(termios.tcgetattr(slave), attributes)
+            self.assertTrue(output.getvalue().startswith("\x1b[>11u"))
+
+        try:
+            asyncio.run(type_keys())
+        finally:
+            os.close(master)
+            os.close(slave)
+        names = [key for key, _ in keys]
+        self.assertEqual(names[0], "left")
+        self.assertEqual(names[-1], "r")
+        self.assertGreaterEqual(names.count("left"), 3)
+        # the press was delivered on input, not on a polling interval
+        self.assertLess(keys[0][1], 0.01)
+
+    def test_terminal_split_sequence(self):
+        """
+        Test if an escape sequence split across reads is decoded as one key, and a lone ESC is the escape key once no rest follows
+        """
+        master, slave = os.openpty()
+        keys = []
+
+        async def type_keys():
+            with TerminalKeyboard(lambda key, created: keys.append(key), fd=slave, output=io.StringIO()):
+                os.write(master, b"\x1b[")
+                await asyncio.sleep(ESCAPE_TIMEOUT / 5)
+                os.write(master, b"D")
+                await asyncio.sleep(ESCAPE_TIMEOUT / 5)
+                self.assertEqual(keys, ["left"])
+                os.write(master, b"\x1b")
+                await asyncio.sleep(ESCAPE_TIMEOUT / 5)
+                self.assertEqual(keys, ["left"])
+                await asyncio.sleep(ESCAPE_TIMEOUT * 2)
+
+        try:
+            asyncio.run(type_keys())
+        finally:
+            os.close(master)
+            os.close(slave)
+        self.assertEqual(keys, ["left", "escape"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import io
+import threading
+import unittest
+import pytris
+
+class TestGameLoop(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_20g(self):
+        """
+        Test if 20G gravity drops a block onto the floor within a single tick
+        """
+        engine = pytris.Engine(tick_rate = 60, gravity = 20 * 60)
+        self.assertEqual(engine.board.block.gravity, 20 * 60)
+        block = engine.board.block
+        engine.tick()
+        self.assertIsNot(engine.board.block, block)
+        self.assertGreater(engine.board.array[-1].sum(), 0)
+
+    def test_run(self):
+        """
+        Test if the loop ticks the engine in real time, applies actions sent from other threads and does not spawn threads
+        """
+        engine = pytris.Engine(tick_rate = 200)
+        engine.board.renderer = pytris.TerminalRenderer(io.StringIO())
+        game = pytris.GameLoop(engine)
+        block = engine.board.block
+        x = block.pos[0]
+        threads = []
+
+        async def play():
+            loop = asyncio.get_running_loop()
+            sender = threading.Thread(target=game.send, args=(pytris.Direction.LEFT,))
+            loop.call_later(0.05, sender.start)
+            loop.call_later(0.1, lambda: threads.append(threading.active_count()))
+            loop.call_later(0.25, game.stop)
+            await game.run()
+
+        threads.append(threading.active_count())
+        asyncio.run(play())
+        self.assertEqual(block.pos[0], x - 1)
+        self.assertGreaterEqual(engine.ticks, 40)
+        self.assertLessEqual(engine.ticks, 55)
+        self.assertLessEqual(threads[1], threads[0] + 1) # the sender thread
+        self.assertTrue(engine.board.pause_renderer)
+
+    def test_send_before_run(self):
+        """
+        Test if actions sent before the loop runs are dropped
+        """
+        engine = pytris.Engine()
+        game = pytris.GameLoop(engine)
+        x = engine.board.block.pos[0]
+        game.send(pytris.Direction.LEFT)
+        game.stop()
+        self.assertEqual(engine.board.block.pos[0], x)
+
+class TestAsyncRenderScheduler(unittest.TestCase):
+    def test_coalescing(self):
+        """
+        Test if requests made on the event loop are coalesced into frames
+        """
+        frames = []
+        scheduler = pytris.AsyncRenderScheduler(lambda: frames.append(None), max_fps = 20)
+        self.assertRaises(RuntimeError, scheduler.start)
+
+        async def render():
+            task = asyncio.create_task(scheduler.run())
+            for _ in range(100):
+                scheduler.request()
+                await asyncio.sleep(0.001)
+            task.cancel()
+
+        asyncio.run(render())
+        scheduler.stop()
+        self.assertEqual(scheduler.frames_requested, 100)
+        self.assertEqual(scheduler.frames_rendered, len(frames))
+        self.assertEqual(scheduler.frames_rendered + scheduler.frames_coalesced, 100)
+        self.assertLessEqual(len(frames), 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import unittest
+import numpy as np
+import pytris
+
+class TestMetrics(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_counters_timers_hooks(self):
+        """
+        Test if counters and timers aggregate their samples and pass them to the hooks
+        """
+        metrics = pytris.Metrics()
+        samples = []
+        metrics.add_hook(lambda name, value: samples.append((name, value)))
+        metrics.count("a")
+        metrics.count("a", 2)
+        metrics.record("b", 0.5)
+        metrics.record("b", 1.5)
+        with metrics.time("c"):
+            pass
+        self.assertEqual(metrics.counters["a"], 3)
+        self.assertEqual(metrics.total("b"), 2)
+        self.assertEqual(metrics.timers["b"].mean, 1.0)
+        self.assertEqual(metrics.timers["b"].max, 1.5)
+        self.assertEqual(samples[:4], [("a", 1), ("a", 2), ("b", 0.5), ("b", 1.5)])
+        self.assertEqual(samples[4][0], "c")
+        self.assertGreater(metrics.rate("a"), 0)
+        self.assertEqual(metrics.snapshot()["counters"], {"a": 3})
+        self.assertIn("b: 2 samples", metrics.summary())
+
+    def test_board_instrumentation(self):
+        """
+        Test if an instrumented game records collision checks, cleared lines and drawn frames and displays the HUD
+        """
+        engine = pytris.Engine(4, 6, seed = 1)
+        board = engine.board
+        board.metrics = pytris.Metrics()
+        board.renderer = pytris.TerminalRenderer(io.StringIO())
+        array = np.zeros((6, 4))
+        array[-1, 1:] = 1
+        board.array = array
+        board.block = pytris.Block(pytris.Block_Type["I"], board)
+        board.block.array = np.rot90(board.block.array)
+        board.block.pos = [0, 0]
+        while board.metrics.counters.get(pytris.LINES, 0) == 0:
+            engine.step(pytris.Direction.DOWN)
+        self.assertEqual(board.metrics.counters[pytris.LINES], 1)
+        self.assertGreater(board.metrics.counters[pytris.COLLISIONS], 0)
+
+        board.draw()
+        self.assertEqual(board.metrics.total(pytris.RENDER), 1)
+        self.assertFalse(any(line.startswith("FPS") for line in board.frame()))
+        board.show_hud = True
+        self.assertTrue(board.frame()[2].startswith("FPS"))
+
+if __name__ == '__main__':
+    unittest.main()
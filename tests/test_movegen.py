@@ -0,0 +1,71 @@
+import unittest
+import pytris
+import numpy as np
+
+def spawn(board: pytris.Board, name: str):
+    board.block = pytris.Block(pytris.Block_Type[name], board)
+
+class TestEnumeratePlacements(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_empty_board(self):
+        """
+        Test if every column is reported once on an empty board
+        """
+        board = pytris.Board(10, 20, seed = 0)
+        spawn(board, "O")
+        placements = pytris.enumerate_placements(board)
+        self.assertEqual(sorted(p.x for p in placements), list(range(9)))
+        for placement in placements:
+            self.assertEqual(placement.y, 18)
+        spawn(board, "I")
+        self.assertEqual(len(pytris.enumerate_placements(board)), 7 + 10)
+        spawn(board, "T")
+        self.assertEqual(len(pytris.enumerate_placements(board)), 8 + 9 + 8 + 9)
+
+    def test_paths(self):
+        """
+        Test if applying a placement's path locks the block exactly at the placement
+        """
+        for board_type in (pytris.Board, pytris.BitBoard):
+            engine = pytris.Engine(board_type = board_type, seed = 4)
+            board = engine.board
+            board.place(np.ones((1, 4)), 0, 19)
+            board.place(np.ones((2, 3)), 6, 15)
+            for placement in pytris.enumerate_placements(board):
+                replay = pytris.Engine(board_type = board_type, seed = 4)
+                replay.board.place(np.ones((1, 4)), 0, 19)
+                replay.board.place(np.ones((2, 3)), 6, 15)
+                before = np.copy(replay.board.array)
+                block = replay.board.block
+                for action in placement.path:
+                    self.assertIs(replay.board.block, block)
+                    replay.apply(action)
+                self.assertIsNot(replay.board.block, block)
+                placed = replay.board.array - before
+                expected = np.zeros_like(placed)
+                expected[placement.y:placement.y + placement.array.shape[0], placement.x:placement.x + placement.array.shape[1]] = placement.array
+                self.assertTrue(np.array_equal(placed, expected))
+
+    def test_overhang(self):
+        """
+        Test if placements only reachable by moving under an overhang are found
+        """
+        board = pytris.Board(10, 20, seed = 0)
+        board.place(np.ones((1, 8)), 2, 17)  # roof over columns 2 to 9, two rows above the floor
+        spawn(board, "O")
+        placements = {(p.x, p.y): p for p in pytris.enumerate_placements(board)}
+        self.assertIn((5, 18), placements)
+        path = placements[(5, 18)].path
+        self.assertEqual(path.count(pytris.Direction.RIGHT) - path.count(pytris.Direction.LEFT), 5 - board.block.pos[0])
+        self.assertIn((5, 15), placements)  # on top of the roof
+
+    def test_stuck(self):
+        """
+        Test if a block that is stuck already has no placements
+        """
+        board = pytris.Board(10, 20, seed = 0)
+        board.place(np.ones((2, 10)), 0, 0)
+        self.assertEqual(pytris.enumerate_placements(board), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import unittest
+import pytris
+
+class TestFrame(unittest.TestCase):
+    def test_frame(self):
+        """
+        Test if a frame displays the game info, the upcoming block and the board including the current block
+        """
+        board = pytris.Board(10, 12)
+        lines = board.frame()
+        self.assertEqual(lines[0], "Score: 0")
+        self.assertTrue(lines[1].startswith("Speed: "))
+        self.assertEqual(len(lines), 2 + 6 + board.height)
+        for line in lines[-board.height:]:
+            self.assertEqual(len(line), board.width + 2)
+            self.assertTrue(line.startswith("|") and line.endswith("|"))
+        self.assertIn("X", lines[-board.height])  # current block is displayed at the top row
+
+class TestDiffRenderer(unittest.TestCase):
+    def test_first_frame(self):
+        """
+        Test if the first frame is drawn completely
+        """
+        stream = io.StringIO()
+        renderer = pytris.DiffRenderer(stream)
+        renderer.draw(["Score: 0", "|  X  |"])
+        self.assertTrue(stream.getvalue().endswith("Score: 0\n|  X  |"))
+
+    def test_changed_cells_only(self):
+        """
+        Test if only changed characters are written after the first frame
+        """
+        stream = io.StringIO()
+        renderer = pytris.DiffRenderer(stream)
+        renderer.draw(["Score: 0", "|  X       |", "|XXXX      |"])
+        stream.truncate(0)
+        stream.seek(0)
+        renderer.draw(["Score: 0", "|   X      |", "|XXXX      |"])
+        self.assertEqual(stream.getvalue(), "\x1B[2;4H X")
+        stream.truncate(0)
+        stream.seek(0)
+        renderer.draw(["Score: 0", "|   X      |", "|XXXX      |"])
+        self.assertEqual(stream.getvalue(), "")
+
+    def test_distant_changes(self):
+        """
+        Test if changes far apart within a line are written as separate runs
+        """
+        stream = io.StringIO()
+        renderer = pytris.DiffRenderer(stream)
+        renderer.draw(["|X                  X|"])
+        stream.truncate(0)
+        stream.seek(0)
+        renderer.draw(["| X                X |"])
+        self.assertEqual(stream.getvalue(), "\x1B[1;2H X\x1B[1;20HX ")
+
+    def test_shrinking_frame(self):
+        """
+        Test if lines not covered by a shorter frame are erased
+        """
+        stream = io.StringIO()
+        renderer = pytris.DiffRenderer(stream)
+        renderer.draw(["### GAME OVER ###", "Score: 40"])
+        stream.truncate(0)
+        stream.seek(0)
+        renderer.draw(["Score: 40"])
+        self.assertIn("\x1B[2;1H\x1B[2K", stream.getvalue())
+
+    def test_invalidate(self):
+        """
+        Test if the complete frame is drawn again after invalidating the renderer
+        """
+        stream = io.StringIO()
+        renderer = pytris.DiffRenderer(stream)
+        renderer.draw(["Score: 0"])
+        renderer.invalidate()
+        stream.truncate(0)
+        stream.seek(0)
+        renderer.draw(["Score: 0"])
+        self.assertTrue(stream.getvalue().endswith("Score: 0"))
+
+    def test_bytes_per_frame(self):
+        """
+        Test if a block move costs far fewer characters than a complete frame
+        """
+        stream = io.StringIO()
+        board = pytris.Board()
+        renderer = pytris.DiffRenderer(stream)
+        renderer.draw(board.frame())
+        full = renderer.bytes_written
+        board.block.pos[1] += 1
+        renderer.draw(board.frame())
+        self.assertLess((renderer.bytes_written - full) * 10, full)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import random
+import unittest
+import pytris
+import numpy as np
+
+ACTIONS = [pytris.Direction.LEFT, pytris.Direction.RIGHT, pytris.Direction.DOWN, pytris.Action.ROTATE, None, None, None]
+
+def record_game(seed: int, actions_seed: int) -> tuple[pytris.Engine, pytris.Replay]:
+    engine = pytris.Engine(seed = seed)
+    replay = pytris.Replay.record(engine)
+    actions = random.Random(actions_seed)
+    while not engine.gameover:
+        engine.step(actions.choice(ACTIONS))
+    for _ in range(10):
+        engine.tick()
+    replay.finish(engine)
+    return engine, replay
+
+class TestSeed(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_seeded_boards(self):
+        """
+        Test if boards with the same seed receive the same blocks
+        """
+        boards = [pytris.Board(seed = 42) for _ in range(2)]
+        for board in boards:
+            self.assertEqual(board.seed, 42)
+        for _ in range(20):
+            self.assertTrue(np.array_equal(boards[0].block_next.array, boards[1].block_next.array))
+            for board in boards:
+                board.block_next = pytris.Block(pytris.get_random_block_type(board.random), board)
+        self.assertIsInstance(pytris.Board().seed, int)
+
+class TestReplay(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_varint(self):
+        """
+        Test varint encoding and decoding
+        """
+        for value in (0, 1, 127, 128, 300, 2**40):
+            data = pytris.encode_varint(value)
+            self.assertEqual(pytris.decode_varint(data, 0), (value, len(data)))
+        self.assertEqual(len(pytris.encode_varint(127)), 1)
+        self.assertRaises(ValueError, pytris.decode_varint, b"\x80", 0)
+
+    def test_roundtrip(self):
+        """
+        Test if a replay survives encoding and decoding and replays into the recorded final state
+        """
+        engine, replay = record_game(7, 8)
+        data = replay.to_bytes()
+        decoded = pytris.Replay.from_bytes(data)
+        self.assertEqual(decoded.events, replay.events)
+        self.assertEqual((decoded.seed, decoded.ticks, decoded.checksum), (replay.seed, replay.ticks, replay.checksum))
+        self.assertIsNone(decoded.gravity)
+
+        replayed = decoded.play()
+        self.assertEqual(replayed.ticks, engine.ticks)
+        self.assertEqual(replayed.board.score.points, engine.board.score.points)
+        self.assertTrue(np.array_equal(replayed.board.array, engine.board.array))
+        decoded.play(pytris.BitBoard)
+
+    def test_compact(self):
+        """
+        Test if actions applied within a few ticks of each other take a single byte
+        """
+        engine, replay = record_game(1, 2)
+        log_size = len(replay.to_bytes()) - pytris.REPLAY_HEADER.size - pytris.REPLAY_FOOTER.size
+        self.assertLess(log_size, len(replay.events) * 1.5)
+
+    def test_fixed_gravity(self):
+        """
+        Test if a game with fixed gravity replays with the same gravity
+        """
+        engine = pytris.Engine(gravity = 30, seed = 3)
+        replay = pytris.Replay.record(engine)
+        while not engine.gameover:
+            engine.step(pytris.Direction.LEFT if engine.ticks % 7 else pytris.Action.ROTATE)
+        replay.finish(engine)
+        decoded = pytris.Replay.from_bytes(replay.to_bytes())
+        self.assertEqual(decoded.gravity, 30)
+        decoded.play()
+
+    def test_invalid(self):
+        """
+        Test if invalid or tampered replays are rejected
+        """
+        engine, replay = record_game(5, 6)
+        data = replay.to_bytes()
+        self.assertRaises(ValueError, pytris.Replay.from_bytes, b"XXXX" + data[4:])
+        self.assertRaises(ValueError, pytris.Replay.from_bytes, data[:len(data) // 2])
+        replay.checksum ^= 1
+        self.assertRaises(ValueError, replay.play)
+        self.assertRaises(ValueError, pytris.Replay.record, engine)
+        self.assertRaises(ValueError, pytris.Replay(10, 20, 60, 0).to_bytes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import contextlib
+import io
+import unittest
+import pytris
+from pytris import runner
+
+class TestRunner(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_board_features(self):
+        """
+        Test the features of a known board with a hole and one completed row
+        """
+        rows = [
+            0b0000,
+            0b1001,
+            0b1000,
+            0b1111,
+        ]
+        # the completed bottom row is removed, leaving column heights 2, 0, 0, 2 and a hole in column 0
+        self.assertEqual(runner.board_features(rows, 4), (4, 1, 4, 1))
+
+    def test_play_game(self):
+        """
+        Test if a game played with the same seed always has the same result and places pieces
+        """
+        result = runner.play_game(3, max_pieces=30)
+        self.assertEqual(result, runner.play_game(3, max_pieces=30))
+        seed, points, rows, pieces = result
+        self.assertEqual(seed, 3)
+        self.assertEqual(pieces, 30)
+        self.assertGreater(rows, 0)
+
+    def test_run_games(self):
+        """
+        Test if games run over a process pool on different board sizes are aggregated
+        """
+        reports = []
+        statistics = runner.run_games(4, 2, 0, [(10, 20), (8, 16)], max_pieces=10, progress=lambda statistics: reports.append(statistics.games))
+        self.assertEqual(statistics.games, 4)
+        self.assertEqual(statistics.pieces, 40)
+        self.assertEqual(reports, [1, 2, 3, 4])
+        self.assertRaises(ValueError, runner.run_games, 1, 1, 0, [(2, 20)])
+        self.assertRaises(ValueError, runner.run_games, 1, 1, -5)
+        self.assertRaises(ValueError, runner.run_games, 1, 1, 0, weights=(1.0,))
+
+    def test_main_arguments(self):
+        """
+        Test if invalid seeds and weights are reported as usage errors before any game is played
+        """
+        for args in (["--seed", "-5"], ["--seed", str((1 << 64) - 2), "--games", "3"], ["--weights", "1,2"]):
+            with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+                runner.main(args)
+            self.assertIn("error:", stderr.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+import pytris
+
+class TestRenderScheduler(unittest.TestCase):
+    def test_constructor_max_fps(self):
+        """
+        Test invalid frame rates for RenderScheduler
+        """
+        self.assertRaises(ValueError, pytris.RenderScheduler, lambda: None, 0)
+        self.assertRaises(ValueError, pytris.RenderScheduler, lambda: None, -30)
+
+    def test_coalescing(self):
+        """
+        Test if a burst of requests results in only a few frames and every request is accounted for
+        """
+        frames = []
+        scheduler = pytris.RenderScheduler(lambda: frames.append(time.monotonic()), max_fps = 20)
+        scheduler.start()
+        for _ in range(1000):
+            scheduler.request()
+        time.sleep(0.2)
+        scheduler.stop()
+        self.assertEqual(scheduler.frames_requested, 1000)
+        self.assertEqual(scheduler.frames_rendered, len(frames))
+        self.assertEqual(scheduler.frames_rendered + scheduler.frames_coalesced, 1000)
+        self.assertLessEqual(len(frames), 3)
+
+    def test_fps_cap(self):
+        """
+        Test if consecutive frames are at least one frame interval apart
+        """
+        frames = []
+        scheduler = pytris.RenderScheduler(lambda: frames.append(time.monotonic()), max_fps = 50)
+        scheduler.start()
+        end = time.monotonic() + 0.3
+        while time.monotonic() < end:
+            scheduler.request()
+            time.sleep(0.001)
+        scheduler.stop(flush = False)
+        self.assertGreater(len(frames), 1)
+        for previous, current in zip(frames, frames[1:]):
+            self.assertGreaterEqual(current - previous, 1 / 50 - 0.002)
+
+    def test_stop_flush(self):
+        """
+        Test if stopping the scheduler draws a pending frame
+        """
+        frames = []
+        scheduler = pytris.RenderScheduler(lambda: frames.append(None))
+        scheduler.request()
+        scheduler.stop()
+        self.assertEqual(len(frames), 1)
+        scheduler.stop()
+        self.assertEqual(len(frames), 1)
+
+    def test_lock(self):
+        """
+        Test if the given lock is held while drawing
+        """
+        lock = threading.Lock()
+        held = []
+        scheduler = pytris.RenderScheduler(lambda: held.append(lock.locked()), lock = lock)
+        scheduler.request()
+        scheduler.stop()
+        self.assertEqual(held, [True])
+
+if __name__ == '__main__':
+    unittest.main()
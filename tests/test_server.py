@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+import numpy as np
+import pytris
+from pytris.client import MatchClient
+from pytris.server import FRAME, MatchServer, StateUpdate
+
+class TestServer(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_update_encoding(self):
+        """
+        Test if an update survives encoding and only holds the rows changed since the previous one
+        """
+        engine = pytris.Engine(seed = 1)
+        keyframe, rows = StateUpdate.capture(engine)
+        self.assertEqual(len(keyframe.rows), engine.board.height)
+        engine.board.block.hard_drop()
+        update, _ = StateUpdate.capture(engine, rows)
+        self.assertTrue(0 < len(update.rows) <= 4)
+
+        board = pytris.Board()
+        for data in (keyframe.encode(), update.encode()):
+            decoded = StateUpdate.decode(data[FRAME.size:])
+            decoded.apply(board)
+        self.assertTrue(np.array_equal(board.array, engine.board.array))
+        self.assertTrue(np.array_equal(board.block.array, engine.board.block.array))
+        self.assertEqual(board.block.pos, engine.board.block.pos)
+
+    def test_match(self):
+        """
+        Test if a player and a spectator connected over localhost both mirror the match, and updates are encoded once for all clients
+        """
+        async def play():
+            server = MatchServer(tick_rate = 100)
+            listener = await server.start(port = 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                player = MatchClient()
+                match = await player.connect(port = port)
+                spectators = [MatchClient() for _ in range(3)]
+                for spectator in spectators:
+                    await spectator.connect(port = port, command = "WATCH", match = match)
+                refused = MatchClient()
+                with self.assertRaises(ConnectionError):
+                    await refused.connect(port = port, command = "WATCH", match = 99)
+
+                await player.receive()
+                for _ in range(3):
+                    player.send(pytris.Action.HARD_DROP)
+                    await asyncio.sleep(0.05)
+                engine = server.matches[match].engine
+                def mirrors(client):
+                    return (client.board is not None and np.array_equal(client.board.array, engine.board.array) and client.board.block.pos == engine.board.block.pos
+                            and client.board.score.points == engine.board.score.points)
+                clients = [player] + spectators
+                for client in clients:
+                    while not mirrors(client):
+                        await asyncio.wait_for(client.receive(), 2)
+                self.assertGreater(engine.board.array.sum(), 0)
+                self.assertLess(server.matches[match].updates_sent, engine.ticks + 1)
+                for client in clients:
+                    await client.close()
+            finally:
+                await server.close()
+        asyncio.run(play())
+
+    def test_match_removed(self):
+        """
+        Test if a match is removed once its last client disconnects, and a match without clients once it is over
+        """
+        async def play():
+            server = MatchServer(tick_rate = 100)
+            listener = await server.start(port = 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                player = MatchClient()
+                match = await player.connect(port = port)
+                spectator = MatchClient()
+                await spectator.connect(port = port, command = "WATCH", match = match)
+                await player.close()
+                await asyncio.sleep(0.05)
+                self.assertIn(match, server.matches) # still watched
+                await spectator.close()
+                await asyncio.sleep(0.05)
+                self.assertNotIn(match, server.matches)
+
+                abandoned = server.create_match()
+                abandoned.engine.board.gameover = True
+                await asyncio.sleep(0.05)
+                self.assertNotIn(abandoned.id, server.matches)
+            finally:
+                await server.close()
+        asyncio.run(play())
+
+if __name__ == '__main__':
+    unittest.main()
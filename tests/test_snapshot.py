@@ -0,0 +1,80 @@
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+import pytris
+from pytris import runner
+
+def play(engine, steps, seed = 0):
+    rng = random.Random(seed)
+    actions = [pytris.Direction.LEFT, pytris.Direction.RIGHT, pytris.Direction.DOWN, pytris.Action.ROTATE, None]
+    for _ in range(steps):
+        if engine.gameover:
+            break
+        engine.step(rng.choice(actions))
+
+class TestSnapshot(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def assertSameState(self, board, restored):
+        self.assertTrue(np.array_equal(board.array != 0, restored.array))  # overlapping fields on gameover are restored as written on once
+        self.assertTrue(np.array_equal(board.block.array, restored.block.array))
+        self.assertTrue(np.array_equal(board.block_next.array, restored.block_next.array))
+        self.assertEqual(board.block.pos, restored.block.pos)
+        self.assertEqual((board.score.points, board.score.rows, board.gameover), (restored.score.points, restored.score.rows, restored.gameover))
+        self.assertEqual(board.random.getstate(), restored.random.getstate())
+        self.assertEqual(board.heights, restored.heights)
+
+    def test_roundtrip(self):
+        """
+        Test if a board restored from a snapshot's bytes is in the same state and continues with the same blocks
+        """
+        engine = pytris.Engine(10, 20, seed = 5, gravity = 120)
+        player = runner.HeuristicPlayer()
+        for _ in range(30):
+            for action in player.choose(engine.board).path:
+                engine.apply(action)
+        play(engine, 5)
+        board = engine.board
+        self.assertGreater(board.score.rows, 0)
+        record = pytris.take_snapshot(board)
+        self.assertEqual(record.dtype.itemsize, 66)
+        data = record.tobytes()
+        for board_type in (pytris.Board, pytris.BitBoard):
+            restored = pytris.restore_snapshot(pytris.snapshot_from_bytes(data), board_type)
+            self.assertSameState(board, restored)
+            self.assertEqual(restored.fixed_gravity, 120)
+            expected = random.Random()
+            expected.setstate(board.random.getstate())
+            self.assertEqual([restored.next_block().array.tolist() for _ in range(5)],
+                             [pytris.get_random_block_type(expected).tolist() for _ in range(5)])
+        self.assertRaises(ValueError, pytris.snapshot_from_bytes, data[:-1])
+
+    def test_archive(self):
+        """
+        Test if snapshots appended to an archive beyond its initial capacity are read back from the memory-mapped file
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshots.bin")
+            engine = pytris.Engine(8, 16, seed = 3)
+            points = []
+            with pytris.SnapshotArchive.create(path, 8, 16) as archive:
+                while len(archive) < pytris.ARCHIVE_MIN_CAPACITY + 10:
+                    if engine.gameover:
+                        engine = pytris.Engine(8, 16, seed = len(archive))
+                    play(engine, 3, len(archive))
+                    archive.append(engine.board)
+                    points.append(engine.board.score.points)
+                self.assertRaises(ValueError, archive.append, pytris.Board(10, 16))
+            self.assertEqual(os.path.getsize(path), pytris.ARCHIVE_HEADER.size + len(points) * archive.dtype.itemsize)
+
+            archive = pytris.SnapshotArchive.open(path)
+            self.assertEqual(len(archive), len(points))
+            self.assertIsInstance(archive.records, np.memmap)
+            self.assertEqual(archive.records["points"].tolist(), points)
+            self.assertSameState(engine.board, archive.restore(-1))
+            self.assertRaises(ValueError, archive.append, engine.board)
+            archive.close()
+
+if __name__ == '__main__':
+    unittest.main()
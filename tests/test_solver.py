@@ -0,0 +1,69 @@
+import unittest
+import pytris
+from pytris.solver import Goal, Solver
+
+def play(board: pytris.Board, pieces: str, solution):
+    """
+    Plays the placements of a solution on the board, spawning the given pieces in order
+    """
+    for i, placement in enumerate(solution.placements):
+        board.block = pytris.Block(pytris.Block_Type[pieces[i]], board)
+        if i + 1 < len(pieces):
+            board.block_next = pytris.Block(pytris.Block_Type[pieces[i + 1]], board)
+        block = board.block
+        for action in placement.path:
+            if action is pytris.Action.ROTATE:
+                block.rotate()
+            else:
+                block.move(action)
+        assert board.block is not block
+
+class TestSolver(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_perfect_clear(self):
+        """
+        Test if the placements of a found perfect clear clear the board when played
+        """
+        pieces = "IOLJTSZIOT"
+        board = pytris.Board(10, 4, seed = 0)
+        solver = Solver(10, 4)
+        solution = solver.solve(board, pieces)
+        self.assertEqual(len(solution), len(pieces))
+        self.assertEqual(solution.lines, 4)
+        play(board, pieces, solution)
+        self.assertFalse(board.array.any())
+        self.assertEqual(board.score.rows, 4)
+        self.assertGreater(solver.nodes, len(pieces))
+        self.assertGreater(solver.nodes_per_second, 0)
+        self.assertTrue(0 <= solver.hit_rate <= 1)
+
+    def test_goals(self):
+        """
+        Test the line and survival goals and searches without a solution
+        """
+        board = pytris.Board(4, 6, seed = 0)
+        solver = Solver(4, 6)
+        self.assertIsNone(solver.solve(board, "SZ"))
+        self.assertEqual(len(solver.solve(board, "OO", Goal.PERFECT_CLEAR, 2)), 2)
+        solution = solver.solve(board, "TTTT", Goal.LINES, 2)
+        self.assertGreaterEqual(solution.lines, 2)
+        play(board, "TTTT", solution)
+        self.assertEqual(board.score.rows, solution.lines)
+        self.assertEqual(len(solver.solve(pytris.Board(4, 6), "SSSS", Goal.SURVIVE)), 4)
+        self.assertIsNone(Solver(5, 4).solve(pytris.Board(5, 4), "OOOOO", Goal.SURVIVE))  # O blocks never complete a row of odd width
+        self.assertRaises(ValueError, solver.solve, board, "T", Goal.LINES)
+        self.assertRaises(ValueError, solver.solve, pytris.Board(5, 6), "T")
+
+    def test_zobrist(self):
+        """
+        Test if hashes of boards combine like their fields, so they can be updated incrementally
+        """
+        solver = Solver(10, 4)
+        self.assertEqual(solver.board_hash(0b1010 | 1 << 30), solver.board_hash(0b1010) ^ solver.board_hash(1 << 30))
+        self.assertNotEqual(solver.board_hash(1), solver.board_hash(2))
+        # the bottom row is completed and removed, the row above moves down
+        bits, lines = solver.clear_lines((1 << 40) - (1 << 30) | 1 << 25, 0b1111 << 30)
+        self.assertEqual((bits, lines), (1 << 35, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+import pytris
+from pytris.runner import HeuristicPlayer
+from pytris.telemetry import CLEAR, GAMEOVER, LOCK, SPAWN, TELEMETRY_HEADER, TelemetryLog, clear_counts, final_scores, pieces_per_second, read_telemetry
+
+def play_game(log: TelemetryLog, seed: int) -> pytris.Engine:
+    engine = pytris.Engine(seed = seed)
+    log.clock = lambda: engine.time
+    log.attach(engine.board)
+    actions = random.Random(seed)
+    while not engine.gameover:
+        engine.step(actions.choice([pytris.Direction.LEFT, pytris.Direction.RIGHT, pytris.Action.ROTATE, pytris.Action.HARD_DROP, None]))
+    return engine
+
+class TestTelemetry(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.tlm")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_events(self):
+        """
+        Test if a game's spawns, locks, clears and gameover are recorded in order with the game's score
+        """
+        engine = pytris.Engine(seed = 3)
+        player = HeuristicPlayer()
+        with TelemetryLog(self.path, clock=lambda: engine.time, buffer_records=16) as log:
+            log.attach(engine.board)
+            for _ in range(60):
+                for action in player.choose(engine.board).path:
+                    engine.apply(action)
+            while not engine.gameover:
+                engine.apply(pytris.Action.HARD_DROP)
+        records = read_telemetry(self.path)
+        events = records["event"]
+        self.assertEqual(events[0], SPAWN)
+        self.assertEqual(events[-1], GAMEOVER)
+        self.assertEqual(np.count_nonzero(events == GAMEOVER), 1)
+        # every locked piece spawned before, the game ends with a piece that cannot spawn or be placed
+        self.assertIn(np.count_nonzero(events == SPAWN) - np.count_nonzero(events == LOCK), (0, 1))
+        clears = records[events == CLEAR]
+        self.assertGreater(len(clears), 0)
+        self.assertEqual(clears["lines"].sum(), engine.board.score.rows)
+        self.assertEqual(clears["points"].sum(), engine.board.score.points)
+        self.assertEqual(records["score"][-1], engine.board.score.points)
+        self.assertTrue(np.all(np.diff(records["time"]) >= 0))
+        self.assertTrue(np.all(records["game"] == 0))
+
+    def test_append(self):
+        """
+        Test if games appended to an existing log continue its game numbers and the aggregates cover every game
+        """
+        scores = []
+        with TelemetryLog(self.path) as log:
+            for seed in range(2):
+                scores.append(play_game(log, seed).board.score.points)
+        with TelemetryLog(self.path) as log:
+            self.assertEqual(log.game, 2)
+            scores.append(play_game(log, 2).board.score.points)
+        records = read_telemetry(self.path)
+        self.assertEqual(final_scores(records).tolist(), scores)
+        self.assertEqual(clear_counts(records)[1:].sum(), np.count_nonzero(records["event"] == CLEAR))
+        self.assertGreater(pieces_per_second(records), 0)
+
+    def test_partial_record(self):
+        """
+        Test if a partially written last record is ignored and dropped before appending, and rejected files are reported
+        """
+        with TelemetryLog(self.path) as log:
+            play_game(log, 0)
+        count = len(read_telemetry(self.path))
+        with open(self.path, "ab") as file:
+            file.write(b"\x11" * 7)
+        self.assertEqual(len(read_telemetry(self.path)), count)
+        # games appended after the partial record are aligned
+        with TelemetryLog(self.path) as log:
+            play_game(log, 1)
+        records = read_telemetry(self.path)
+        self.assertGreater(len(records), count)
+        self.assertEqual(set(records["game"].tolist()), {0, 1})
+        self.assertTrue(np.all(records["event"] <= GAMEOVER))
+        self.assertEqual((os.path.getsize(self.path) - TELEMETRY_HEADER.size) % records.dtype.itemsize, 0)
+        with open(self.path, "r+b") as file:
+            file.write(b"XXXX")
+        with self.assertRaises(ValueError):
+            read_telemetry(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
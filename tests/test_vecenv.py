@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+import pytris
+from pytris.vecenv import SharedMemoryVecEnv
+
+class TestSharedMemoryVecEnv(unittest.TestCase):
+    pytris.Board.render = lambda self: None  # disable renderer
+    def test_step(self):
+        """
+        Test if environments stepped by workers match a BatchEngine played in this process, including automatic resets
+        """
+        rng = np.random.default_rng(0)
+        with SharedMemoryVecEnv(6, 2, 6, 12, seed = 0) as env:
+            observations, info = env.reset(seed = 5)
+            engine = pytris.BatchEngine(3, 6, 12)
+            engine.rng = np.random.default_rng(5)
+            engine.reset()
+            self.assertTrue(np.array_equal(observations["board"][:3], engine.boards))
+            self.assertTrue(np.array_equal(observations["block_next"][:3], engine.pieces_next))
+
+            terminated_total = 0
+            for _ in range(300):
+                actions = rng.integers(0, env.action_count, 6)
+                observations, rewards, terminated, truncated, info = env.step(actions)
+                points = engine.step(actions[:3])
+                self.assertTrue(np.array_equal(rewards[:3], points))
+                self.assertTrue(np.array_equal(terminated[:3], engine.gameover))
+                if engine.gameover.any():
+                    engine.reset(engine.gameover)
+                self.assertTrue(np.array_equal(observations["board"][:3], engine.boards))
+                self.assertTrue(np.array_equal(observations["block"][:3], np.stack((engine.pieces, engine.rotations, engine.x, engine.y), axis=1)))
+                self.assertTrue(np.array_equal(info["points"][:3], engine.points))
+                terminated_total += terminated.sum()
+            self.assertGreater(terminated_total, 0)
+            self.assertFalse(truncated.any())
+
+    def test_seeding(self):
+        """
+        Test if the initial observations are published before the first reset, and seeding at construction or on reset starts the same games
+        """
+        with SharedMemoryVecEnv(4, 2, seed = 3) as constructed, SharedMemoryVecEnv(4, 2) as reseeded:
+            initial = {name: array.copy() for name, array in constructed.observations.items()}
+            self.assertTrue(np.all(initial["block"][:, 2] > 0)) # spawned blocks, not zeroed memory
+            observations, _ = constructed.reset()
+            for name in initial:
+                self.assertTrue(np.array_equal(observations[name], initial[name]))
+            expected = {name: array.copy() for name, array in observations.items()}
+            observations, _ = reseeded.reset(seed = 3)
+            for name in expected:
+                self.assertTrue(np.array_equal(observations[name], expected[name]))
+
+    def test_async(self):
+        """
+        Test if stepping asynchronously requires waiting for the previous step
+        """
+        env = SharedMemoryVecEnv(4, 2, seed = 1)
+        env.reset()
+        self.assertRaises(RuntimeError, env.step_wait)
+        env.step_async(np.zeros(4, dtype=np.uint8))
+        self.assertRaises(RuntimeError, env.step_async, np.zeros(4, dtype=np.uint8))
+        observations, rewards, terminated, truncated, info = env.step_wait()
+        self.assertEqual(observations["board"].shape, (4, 20, 10))
+        env.close()
+        env.close()
+
+if __name__ == '__main__':
+    unittest.main()